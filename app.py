@@ -15,7 +15,6 @@ import time
 from pathlib import Path
 from utils.logger import setup_logger, logger
 from utils.argument_parser import ArgumentParser
-from tests.run_tests import run_tests
 from utils.config_loader import ConfigLoader
 from utils.directory_initializer import initialize_directories
 from modules.company_verification_processor import CompanyProfileValidator
@@ -30,6 +29,7 @@ def main() -> None:
 
     # Check if the user specified 'all' as the unit to run tests
     if args.unit == 'all':
+        from tests.run_tests import run_tests
         run_tests()
         return
 
@@ -38,6 +38,14 @@ def main() -> None:
     config_loader = ConfigLoader(config_path)
     config = config_loader.load_config()
 
+    # Read the companies from the input file (or stdin) given on the command line
+    if args.input:
+        config['input_file'] = str(args.input)
+
+    # Continue an interrupted run if requested on the command line
+    if args.resume:
+        config['resume'] = True
+
     # Setup logger based on the configuration settings
     setup_logger(config.get('logging', {}))
 
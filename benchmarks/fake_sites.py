@@ -0,0 +1,213 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: benchmarks/fake_sites.py
+
+Description:
+This module defines the FakeSites class, a local HTTP stand-in for the sites the
+validator talks to. It serves canned search and result pages on the paths of the NJ,
+FL and NC *_PORTAL_CONFIG URLs, the Namecheap results page and an RDAP server, with
+configurable latency and failure rates. Whether a name or domain is taken is derived
+from its hash, so every run gives the same answers.
+"""
+
+import json
+import random
+import threading
+import time
+import zlib
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from modules.portals.portal_configs import NJ_PORTAL_CONFIG, FL_PORTAL_CONFIG, NC_PORTAL_CONFIG
+
+# Portals served by the stand-in: the ones whose HTTP backend accepts a URL override
+PORTAL_PATHS = {
+    "NJ": urlsplit(NJ_PORTAL_CONFIG["url"]).path,
+    "FL": urlsplit(FL_PORTAL_CONFIG["url"]).path,
+    "NC": urlsplit(NC_PORTAL_CONFIG["url"]).path
+}
+NAMECHEAP_PATH = "/namecheap/domains/registration/results/"
+RDAP_PATH = "/rdap/"
+PAGE = "<!DOCTYPE html><html><head><title>{title}</title></head><body>{body}</body></html>"
+
+
+# Define a function to decide from the hash of a name whether it is taken
+def is_taken(name: str, taken_rate: float) -> bool:
+    return zlib.crc32(name.strip().upper().encode('utf-8')) % 1000 < taken_rate * 1000
+
+
+# Canned pages of the portals, with the elements the portal classes look for
+def _nj_page(fields, taken_rate):
+    if fields is None:
+        return ('<form method="post"><input id="BusinessName" name="BusinessName" type="text">'
+                '<input type="hidden" name="__RequestVerificationToken" value="benchmark">'
+                '<input type="submit" class="btn btn-warning" value="Search"></form>')
+    name = fields.get("BusinessName", "")
+    if is_taken(name, taken_rate):
+        return f'<div class="alert alert-error">{escape(name)} is not available.</div>'
+    return f'<div class="alert alert-success">{escape(name)} is available.</div>'
+
+
+def _fl_page(fields, taken_rate):
+    if fields is None:
+        return ('<form method="post"><input id="SearchTerm" name="SearchTerm" type="text">'
+                '<input type="submit" value="Search Now"></form>')
+    name = fields.get("SearchTerm", "").upper()
+    status = "Active" if is_taken(name, taken_rate) else "INACT"
+    return ('<table><tr><td class="large-width"><a href="#">{}</a></td><td class="small-width">{}</td></tr>'
+            '<tr><td class="large-width"><a href="#">{} HOLDINGS</a></td><td class="small-width">Active</td></tr>'
+            '</table>').format(escape(name), status, escape(name))
+
+
+def _nc_page(fields, taken_rate):
+    if fields is None:
+        return ('<form method="post"><select id="CorpSearchType" name="CorpSearchType">'
+                '<option value="CORPORATION">Company</option></select>'
+                '<select id="Words" name="Words"><option value="STARTING">Starting With</option>'
+                '<option value="EXACT">Exact Match</option></select>'
+                '<input id="SearchCriteria" name="SearchCriteria" type="text">'
+                '<button id="SubmitButton" type="submit">Search</button></form>')
+    records = 1 if is_taken(fields.get("SearchCriteria", ""), taken_rate) else 0
+    return f'<article id="results-article"><span>Records Found: {records}</span></article>'
+
+
+PORTAL_PAGES = {"NJ": _nj_page, "FL": _fl_page, "NC": _nc_page}
+
+
+def _namecheap_page(domain, taken_rate):
+    # Results page with the searched domain and one suggestion in the same zone
+    form = (f'<form method="get" action="{NAMECHEAP_PATH}"><input id="search-query" name="domain" '
+            f'type="text" value="{escape(domain)}"><input type="submit" value="Search"></form>')
+    if not domain:
+        return form
+    label, _, zone = domain.lower().partition('.')
+    articles = []
+    for candidate in (domain.lower(), f"get{label}.{zone}"):
+        extension = candidate.split('.')[-1]
+        if is_taken(candidate, taken_rate):
+            articles.append(f'<article class="domain-{extension} unavailable"><h2>{candidate}</h2></article>')
+        else:
+            articles.append(f'<article class="domain-{extension} available"><h2>{candidate}</h2>'
+                            f'<div class="price"><strong>$9.98/yr</strong></div></article>')
+    return form + "".join(articles)
+
+
+class FakeSites:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 taken_rate: float = 0.5, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency  # Seconds added to every response.
+        self.jitter = jitter  # Random extra seconds, up to this much.
+        self.failure_rate = failure_rate  # Share of requests answered with HTTP 503.
+        self.taken_rate = taken_rate  # Share of names and domains reported as taken.
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def portal_urls(self):
+        # URL overrides for the portal_urls setting
+        return {state: self.base_url + path for state, path in PORTAL_PATHS.items()}
+
+    @property
+    def namecheap_url(self) -> str:
+        # Value for the namecheap_search_url setting
+        return f"{self.base_url}{NAMECHEAP_PATH}?domain="
+
+    @property
+    def rdap_url(self) -> str:
+        return self.base_url + RDAP_PATH
+
+    def _count(self, failed: bool):
+        with self._lock:
+            self.requests += 1
+            if failed:
+                self.failures += 1
+
+    def _handler_class(self):
+        sites = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real sites.
+            disable_nagle_algorithm = True  # Headers and body are written separately.
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body, content_type="text/html; charset=utf-8"):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _respond(self, fields):
+                # Simulate the latency of the remote site, and its occasional failures
+                delay = sites.latency + (random.uniform(0, sites.jitter) if sites.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                failed = random.random() < sites.failure_rate
+                sites._count(failed)
+                if failed:
+                    self._send(503, PAGE.format(title="Service Unavailable", body="<h1>Try again later</h1>"))
+                    return
+
+                url = urlsplit(self.path)
+                for state, path in PORTAL_PATHS.items():
+                    if url.path == path:
+                        self._send(200, PAGE.format(title=f"{state} Business Search",
+                                                    body=PORTAL_PAGES[state](fields, sites.taken_rate)))
+                        return
+                if url.path == NAMECHEAP_PATH:
+                    domain = parse_qs(url.query).get("domain", [""])[0]
+                    self._send(200, PAGE.format(title="Namecheap", body=_namecheap_page(domain, sites.taken_rate)))
+                elif url.path.startswith(RDAP_PATH + "domain/"):
+                    # RDAP answers 404 for names that are not registered
+                    domain = url.path.rsplit('/', 1)[-1]
+                    if is_taken(domain, sites.taken_rate):
+                        self._send(200, json.dumps({"objectClassName": "domain", "ldhName": domain}),
+                                   "application/rdap+json")
+                    else:
+                        self._send(404, json.dumps({"errorCode": 404}), "application/rdap+json")
+                else:
+                    self._send(404, PAGE.format(title="Not Found", body="<h1>Not Found</h1>"))
+
+            def do_GET(self):
+                query = parse_qs(urlsplit(self.path).query)
+                # A portal search page without search fields is the empty form
+                fields = {key: values[0] for key, values in query.items()} or None
+                self._respond(fields)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode('utf-8')
+                self._respond({key: values[0] for key, values in parse_qs(body).items()})
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-sites", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -0,0 +1,199 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: benchmarks/run_benchmarks.py
+
+Description:
+This module runs the offline benchmark suite. It starts the FakeSites stand-in, writes
+input files of the requested sizes and drives the real CompanyProfileValidator pipeline
+against the stand-in, one fresh process per size. For each size it reports companies per
+minute, peak memory, report-writing time and the share of failed checks, so throughput
+regressions show up without touching the live sites.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 100,10000,100000 --latency 0.05 --failure-rate 0.01
+"""
+
+import argparse
+import copy
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+from benchmarks.fake_sites import FakeSites, PORTAL_PATHS
+
+DEFAULT_SIZES = "100,10000,100000"
+FAILURE_STATUSES = ("Status Unknown", "Timeout/Error", "Error")
+
+
+# Define a function to write an input file with the given number of companies
+def write_input(path: Path, rows: int) -> Path:
+    with path.open('w', encoding='utf-8') as file:
+        for index in range(rows):
+            file.write(f"Benchmark Company {index} LLC\n")
+    return path
+
+
+# Define a function to build the run configuration pointing at the stand-in
+def benchmark_config(base_config: Dict[str, any], sites: FakeSites, args, work_dir: Path,
+                     rows: int) -> Dict[str, any]:
+    config = copy.deepcopy(base_config)
+    config.update({
+        'input_file': str(write_input(work_dir / f"companies_{rows}.txt", rows)),
+        'input_format': 'txt',
+        'company_check_limit': rows,
+        'reports_directory': str(work_dir / f"reports_{rows}"),
+        'report_filename': 'benchmark',
+        'output_format': args.output_format,
+        'state_portal_abbr': args.states,
+        'portal_backend': 'http',
+        'portal_urls': sites.portal_urls(),
+        'company_name_check_enabled': True,
+        'domain_check_enabled': not args.no_domains,
+        'domain_backend': args.domain_backend,
+        'namecheap_search_url': sites.namecheap_url,
+        'engine': args.engine,
+        'workers': args.workers,
+        'max_workers': max(args.workers, config.get('max_workers', 1)),
+        'resume': False,
+        # Every run measures the full pipeline, without the cache or the rate limits
+        'cache': {'enabled': False},
+        'rate_limits': {'enabled': False},
+        'dns_prefilter': {'enabled': False},
+        'metrics': {'enabled': True, 'export_format': 'json',
+                    'export_path': str(work_dir / f"metrics_{rows}.json")}
+    })
+    zones = config['domain_zones'][:config.get('domain_check_limit', 1)]
+    config['domain_backends'] = dict(config.get('domain_backends') or {})
+    config['domain_backends']['rdap'] = dict(config['domain_backends'].get('rdap') or {},
+                                             servers={zone: sites.rdap_url for zone in zones})
+    return config
+
+
+# Define a function to run the pipeline once; it runs in its own process
+def _run_pipeline(config: Dict[str, any], log_level: str, results) -> None:
+    from utils.logger import logger
+    from modules.company_verification_processor import CompanyProfileValidator
+    from modules.metrics import METRICS
+
+    # Per-company log lines would dominate the timings, so only warnings are shown by default
+    logger.remove()
+    logger.add(sys.stderr, level=log_level)
+    Path(config['reports_directory']).mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    validator = CompanyProfileValidator(config)
+    validator.run()
+    elapsed = time.perf_counter() - start
+
+    summary = METRICS.summary()
+    spans = {}
+    for span in summary["spans"]:
+        if not span["labels"]:
+            spans[span["name"]] = span
+    checks = failures = 0
+    for counter in summary["counters"]:
+        if counter["name"] in ("bns_status", "domain_status"):
+            checks += counter["value"]
+            if counter["labels"].get("status") in FAILURE_STATUSES:
+                failures += counter["value"]
+    rows = validator.report.rows_written if validator.report else 0
+    report_seconds = sum(spans[name]["sum"] for name in ("report_write", "report_close") if name in spans)
+    results.put({
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "companies_per_minute": round(rows / elapsed * 60, 1) if elapsed else 0.0,
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                             / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1),
+        "report_seconds": round(report_seconds, 3),
+        "checks": checks,
+        "failed_checks": failures
+    })
+
+
+# Define a function to run one benchmark size in a fresh process
+def run_size(config: Dict[str, any], log_level: str) -> Dict[str, any]:
+    # A fresh process per size keeps the peak memory of the sizes apart
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_run_pipeline, args=(config, log_level, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+# Define a function to print the results as a table
+def print_results(results: List[Dict[str, any]]) -> None:
+    columns = [("rows", "Rows"), ("seconds", "Seconds"), ("companies_per_minute", "Companies/min"),
+               ("peak_rss_mb", "Peak RSS MB"), ("report_seconds", "Report s"),
+               ("checks", "Checks"), ("failed_checks", "Failed")]
+    print(" | ".join(f"{title:>13}" for _, title in columns))
+    for result in results:
+        print(" | ".join(f"{result[key]:>13}" for key, _ in columns))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Offline throughput benchmarks against local fake sites')
+    parser.add_argument('--config', default='configs/config.yml', help='Base configuration file')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help='Comma-separated numbers of input rows to benchmark')
+    parser.add_argument('--states', type=lambda value: [state.upper() for state in value.split(',')],
+                        default=['NJ'], help=f"Comma-separated states to check ({', '.join(PORTAL_PATHS)})")
+    parser.add_argument('--domain-backend', choices=['rdap', 'namecheap'], default='rdap',
+                        help='Domain backend; namecheap needs Chrome')
+    parser.add_argument('--no-domains', action='store_true', help='Skip the domain checks')
+    parser.add_argument('--engine', choices=['threaded', 'async'], default='threaded', help='Processing engine')
+    parser.add_argument('--workers', type=int, default=4, help='Number of workers')
+    parser.add_argument('--output-format', default='csv', help='Report format')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every fake response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra latency in seconds, up to this much')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Share of fake responses that fail (HTTP 503)')
+    parser.add_argument('--taken-rate', type=float, default=0.5, help='Share of names and domains reported as taken')
+    parser.add_argument('--log-level', default='WARNING', help='Log level of the pipeline')
+    parser.add_argument('--save', help='Write the results as JSON to this file')
+    return parser.parse_args(argv)
+
+
+# Define a function to run the benchmarks
+def run_benchmarks(argv=None) -> List[Dict[str, any]]:
+    from utils.config_loader import ConfigLoader
+
+    args = parse_args(argv)
+    unknown_states = [state for state in args.states if state not in PORTAL_PATHS]
+    if unknown_states:
+        raise SystemExit(f"No fake portal for {', '.join(unknown_states)}; use {', '.join(PORTAL_PATHS)}.")
+    base_config = ConfigLoader(Path(args.config)).load_config()
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    results = []
+    with FakeSites(args.latency, args.jitter, args.failure_rate, args.taken_rate) as sites, \
+            tempfile.TemporaryDirectory(prefix="benchmark_") as work_dir:
+        print(f"Fake sites at {sites.base_url}; states {', '.join(args.states)}, "
+              f"domain backend {'none' if args.no_domains else args.domain_backend}, "
+              f"{args.workers} workers ({args.engine})")
+        for rows in sizes:
+            config = benchmark_config(base_config, sites, args, Path(work_dir), rows)
+            requests_before = sites.requests
+            result = run_size(config, args.log_level)
+            result.update({"size": rows, "requests": sites.requests - requests_before})
+            results.append(result)
+            print(f"{rows} rows: {result['companies_per_minute']} companies/min, "
+                  f"{result['peak_rss_mb']} MB peak RSS")
+    print_results(results)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps({"arguments": vars(args), "results": results}, indent=4))
+    return results
+
+
+# This script allows running the benchmarks when executed directly
+if __name__ == "__main__":
+    run_benchmarks()
@@ -10,3 +10,8 @@ DEFAULT_REPORTS_DIRECTORY = 'data/reports'
 DEFAULT_REPORT_FILENAME = 'report'
 DEFAULT_OUTPUT_FORMAT = 'xls'
 DEFAULT_ENABLE_LOGGING_TO_FILE = False
+DEFAULT_WORKERS = 1
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PORTAL_BACKEND = 'browser'
+DEFAULT_DOMAIN_BACKEND = 'namecheap'
+DEFAULT_ENGINE = 'threaded'
@@ -0,0 +1,147 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/async_engine.py
+
+Description:
+This module defines the AsyncVerificationEngine class, an asyncio alternative to the
+threaded worker pool. The BNS check and the domain checks of a company run at the same
+time, and several companies are in flight at once. Each backend has its own semaphore
+bounded pool of workers, and the blocking Selenium and HTTP calls run in an executor.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Iterable, List
+from utils.logger import logger
+
+# Marks the end of the company input
+_END = object()
+
+
+class _BackendPool:
+    # Semaphore bounded pool of workers for one backend, created on first use
+    def __init__(self, name: str, factory: Callable[[], Any], size: int):
+        self.name = name
+        self.factory = factory
+        self.semaphore = asyncio.Semaphore(max(1, size))
+        self.idle = []
+        self.created = []
+
+    @asynccontextmanager
+    async def acquire(self, loop, executor):
+        async with self.semaphore:
+            if self.idle:
+                worker = self.idle.pop()
+            else:
+                # Launching a browser blocks, so it runs in the executor as well
+                worker = await loop.run_in_executor(executor, self.factory)
+                self.created.append(worker)
+                logger.info(f"Started {self.name} worker {len(self.created)}.")
+            try:
+                yield worker
+            finally:
+                self.idle.append(worker)
+
+    def close(self):
+        for worker in self.created:
+            worker.close()
+        self.created, self.idle = [], []
+
+
+class AsyncVerificationEngine:
+    def __init__(self, check_bns: Callable, check_domains: Callable, build_result: Callable,
+                 portal_worker_factory: Callable = None, domain_worker_factory: Callable = None,
+                 portal_concurrency: int = 2, domain_concurrency: int = 4, max_in_flight: int = 20):
+        self.check_bns = check_bns  # Blocking call: (worker, company_name) -> BNS status per state.
+        self.check_domains = check_domains  # Blocking call: (worker, company_name) -> domain statuses.
+        self.build_result = build_result  # Combines (company_name, bns_status, domain_statuses).
+        self.portal_worker_factory = portal_worker_factory
+        self.domain_worker_factory = domain_worker_factory
+        self.portal_concurrency = portal_concurrency
+        self.domain_concurrency = domain_concurrency
+        self.max_in_flight = max(1, max_in_flight)
+        self._pools = []
+
+    async def _run_on(self, pool, check, company, loop, executor):
+        # Run one blocking check on a worker borrowed from the backend pool
+        async with pool.acquire(loop, executor) as worker:
+            return await loop.run_in_executor(executor, check, worker, company)
+
+    async def _process(self, company, portal_pool, domain_pool, loop, executor):
+        logger.info("Starting processing for company: {}", company)
+        bns_task = self._run_on(portal_pool, self.check_bns, company, loop, executor) if portal_pool else None
+        domain_task = self._run_on(domain_pool, self.check_domains, company, loop, executor) if domain_pool else None
+
+        # The BNS check and the domain checks of the company run concurrently
+        bns_status, domain_statuses = await asyncio.gather(
+            bns_task or asyncio.sleep(0), domain_task or asyncio.sleep(0))
+        logger.info("Finished processing for company: {}", company)
+        return self.build_result(company, bns_status, domain_statuses)
+
+    async def _run(self, companies, on_result):
+        loop = asyncio.get_running_loop()
+        portal_pool = _BackendPool("portal", self.portal_worker_factory,
+                                   self.portal_concurrency) if self.portal_worker_factory else None
+        domain_pool = _BackendPool("domain", self.domain_worker_factory,
+                                   self.domain_concurrency) if self.domain_worker_factory else None
+        self._pools = [pool for pool in (portal_pool, domain_pool) if pool]
+
+        results = {}
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        tasks = []
+
+        async def process_one(index, company):
+            result = None
+            try:
+                result = await self._process(company, portal_pool, domain_pool, loop, executor)
+            except Exception as e:
+                logger.error(f"Error processing company '{company}': {e}")
+            try:
+                if on_result is None:
+                    results[index] = result
+                else:
+                    # Let the caller record the finished company right away (None if it failed)
+                    on_result(index, company, result)
+            except Exception as e:
+                logger.error(f"Error recording result of company '{company}': {e}")
+            finally:
+                in_flight.release()
+
+        executor = ThreadPoolExecutor(max_workers=self.portal_concurrency + self.domain_concurrency,
+                                      thread_name_prefix="engine")
+        try:
+            company_iter = iter(companies)
+            index = 0
+            while True:
+                # Limit the number of companies in flight at the same time
+                await in_flight.acquire()
+                # Reading the input may block, so the next company is read in a thread
+                company = await loop.run_in_executor(None, next, company_iter, _END)
+                if company is _END:
+                    in_flight.release()
+                    break
+                tasks.append(asyncio.ensure_future(process_one(index, company)))
+                # Drop the finished tasks so long inputs don't pile them up
+                tasks = [task for task in tasks if not task.done()]
+                index += 1
+            await asyncio.gather(*tasks)
+        finally:
+            await loop.run_in_executor(executor, self.close)
+            executor.shutdown(wait=True)
+        return results
+
+    def map(self, companies: Iterable[str], on_result: Callable[[int, str, Any], None] = None) -> List[Any]:
+        # Process every company and return the results in input order.
+        # With on_result, each result is passed to it as soon as it is ready instead of being kept.
+        results = asyncio.run(self._run(companies, on_result))
+        return [results[index] for index in sorted(results) if results[index] is not None]
+
+    def close(self):
+        # Close the workers of every backend pool
+        for pool in self._pools:
+            pool.close()
+        self._pools = []
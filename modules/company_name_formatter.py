@@ -29,18 +29,32 @@ def format_company_name_to_domain(name: str) -> str:
         raise
 
 
+# Define a function to strip a company name for the portals without logging, for bulk use
+def strip_company_name(name: str, remove_suffix: bool = True) -> str:
+    if remove_suffix:
+        # Removing common legal suffixes from the company name if 'remove_suffix' is True.
+        name = re.sub(r'\b(LLC|L\.L\.C\.|INC|I\.N\.C\.)\b', '', name, flags=re.IGNORECASE)
+    # Removing all non-word characters (anything other than letter, digit, underscore) and spaces.
+    name = re.sub(r'[^\w\s]', '', name)
+    return name.strip()  # Stripping leading and trailing whitespace from the name.
+
+
 # Define a function to format a company name for a specific portal's naming conventions
 def format_company_name_for_portal(name: str, remove_suffix: bool = True) -> str:
     try:
         logger.info(f"format_company_name_for_portal: input: {name}, remove_suffix: {remove_suffix}")
-        if remove_suffix:
-            # Removing common legal suffixes from the company name if 'remove_suffix' is True.
-            name = re.sub(r'\b(LLC|L\.L\.C\.|INC|I\.N\.C\.)\b', '', name, flags=re.IGNORECASE)
-        # Removing all non-word characters (anything other than letter, digit, underscore) and spaces.
-        name = re.sub(r'[^\w\s]', '', name)
-        formatted_name = name.strip()  # Stripping leading and trailing whitespace from the name.
+        formatted_name = strip_company_name(name, remove_suffix)
         logger.info(f"format_company_name_for_portal: output: {formatted_name}")
         return formatted_name  # Returning the formatted name.
     except Exception as e:
         logger.error(f"Error formatting name for portal: {e}")
         raise
+
+
+# Define a function to format a company name for the Florida Sunbiz search
+def format_company_name_for_fl(name: str) -> str:
+    name = name.upper()  # Converts the name to uppercase.
+    # Adds " LLC" to the name if it doesn't already end with "LLC" or "INC".
+    if "LLC" not in name and "INC" not in name:
+        return name + " LLC"
+    return name
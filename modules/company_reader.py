@@ -0,0 +1,114 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/company_reader.py
+
+Description:
+This module defines the CompanyReader class, which streams company names from the
+input file instead of loading the whole list. It reads plain text, CSV and JSON Lines
+files, optionally gzip compressed, or standard input, and stops reading as soon as
+the company check limit is reached.
+"""
+
+import csv
+import gzip
+import io
+import json
+import sys
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from utils.logger import logger
+
+from configs.constants import DEFAULT_INPUT_DIRECTORY, DEFAULT_COMPANY_CHECK_LIMIT
+
+# Input formats by file extension
+INPUT_FORMATS = {".txt": "txt", ".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+STDIN_PATH = "-"
+
+
+class CompanyReader:
+    def __init__(self, input_path: str, input_format: str = "auto", column: str = "company",
+                 limit: Optional[int] = None):
+        self.input_path = input_path  # File path, or '-' for standard input.
+        self.input_format = self._detect_format(input_path) if input_format == "auto" else input_format
+        self.column = column  # CSV column or JSON field holding the company name.
+        self.limit = limit
+        self.count = 0  # Companies read so far.
+        self._file = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, any]):
+        # Use the configured input file, or company.txt in the input directory
+        input_path = config.get('input_file') or str(
+            Path(config.get('input_directory', DEFAULT_INPUT_DIRECTORY)) / 'company.txt')
+        return cls(input_path,
+                   config.get('input_format', 'auto'),
+                   config.get('input_column', 'company'),
+                   config.get('company_check_limit', DEFAULT_COMPANY_CHECK_LIMIT))
+
+    @staticmethod
+    def _detect_format(input_path: str) -> str:
+        # The format is taken from the extension, ignoring a trailing .gz
+        suffixes = [suffix.lower() for suffix in Path(input_path).suffixes if suffix.lower() != ".gz"]
+        return INPUT_FORMATS.get(suffixes[-1] if suffixes else "", "txt")
+
+    def open(self):
+        # Open the input now, so a missing file is reported before any processing starts
+        if self.input_path == STDIN_PATH:
+            self._file = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+        elif str(self.input_path).lower().endswith(".gz"):
+            self._file = gzip.open(self.input_path, 'rt', encoding='utf-8-sig', newline='')
+        else:
+            self._file = open(self.input_path, 'r', encoding='utf-8-sig', newline='')
+        logger.info(f"Reading companies from {self.input_path} ({self.input_format}).")
+
+    def __iter__(self) -> Iterator[str]:
+        if self._file is None:
+            self.open()
+        readers = {"txt": self._read_txt, "csv": self._read_csv, "jsonl": self._read_jsonl}
+        names = (name.strip() for name in readers[self.input_format]())
+        # Stop reading the input once the limit is reached
+        for name in islice((name for name in names if name), self.limit):
+            self.count += 1
+            yield name
+
+    def _read_txt(self):
+        for line in self._file:
+            yield line
+
+    def _read_csv(self):
+        rows = csv.reader(self._file)
+        if str(self.column).isdigit():
+            # A column number means the file has no header row
+            column_index = int(self.column)
+        else:
+            header = [name.strip().lower() for name in next(rows, [])]
+            if self.column.lower() not in header:
+                raise ValueError(f"Column '{self.column}' not found in the header of {self.input_path}")
+            column_index = header.index(self.column.lower())
+        for row in rows:
+            if len(row) > column_index:
+                yield row[column_index]
+
+    def _read_jsonl(self):
+        for line_num, line in enumerate(self._file, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping unreadable line {line_num} in {self.input_path}")
+                continue
+            # A line holds either the name itself or an object with the name field
+            if isinstance(entry, dict):
+                yield str(entry.get(self.column) or "")
+            elif isinstance(entry, str):
+                yield entry
+
+    def close(self):
+        if self._file is not None and self.input_path != STDIN_PATH:
+            self._file.close()
+        self._file = None
@@ -7,18 +7,36 @@ Module: modules/company_verification_processor.py
 
 Description:
 This module defines the CompanyProfileValidator class, which handles the
-validation of company profiles. It processes company names, checks domain
-availability, and generates reports based on configuration settings.
+validation of company profiles. It processes company names against one or more
+state portals, checks domain availability, and generates reports based on
+configuration settings.
 """
 
+import threading
+import time
+from collections import deque
 from pathlib import Path
 from datetime import datetime
-from .webdriver_setup import setup_webdriver
 from modules.reporting.report_generator import ReportGenerator
+from modules.reporting.ordered_emitter import OrderedEmitter
 from .company_name_formatter import format_company_name_to_domain, format_company_name_for_portal
 from .portal_factory import get_portal_class
+from .domain_backend_factory import get_domain_backend_class
+from .worker_pool import BrowserWorker, BrowserWorkerPool
+from .async_engine import AsyncVerificationEngine
+from .result_cache import ResultCache
+from .run_journal import RunJournal
+from .result_record import CheckStatus, BnsResult, DomainResult, CompanyResult
+from .company_reader import CompanyReader
+from .name_index import NameIndex
+from .rate_limiter import RateLimiterRegistry
+from .page_waits import configure_waits
+from .driver_manager import log_driver_stats
+from .metrics import METRICS
+from .resource_blocker import ResourceBlocker
+from .proxy_pool import ProxyPool
+from .retry_policy import RetryPolicy
 from utils.logger import logger
-from .namecheap_domain_checker import DomainAvailabilityChecker
 
 from configs.constants import (
     DEFAULT_STATE_PORTAL_ABBR,
@@ -29,7 +47,12 @@ from configs.constants import (
     DEFAULT_INPUT_DIRECTORY,
     DEFAULT_REPORTS_DIRECTORY,
     DEFAULT_OUTPUT_FORMAT,
-    DEFAULT_REPORT_FILENAME
+    DEFAULT_REPORT_FILENAME,
+    DEFAULT_WORKERS,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PORTAL_BACKEND,
+    DEFAULT_DOMAIN_BACKEND,
+    DEFAULT_ENGINE
 )
 
 
@@ -39,6 +62,11 @@ class CompanyProfileValidator:
         # Initialize the validator with configuration settings
         self.config = config
         self.state_portal_abbr = self.config.get('state_portal_abbr', DEFAULT_STATE_PORTAL_ABBR)
+        # One state abbreviation or a list of them, checked in the same run
+        if isinstance(self.state_portal_abbr, str):
+            self.state_portal_abbrs = [self.state_portal_abbr.upper()]
+        else:
+            self.state_portal_abbrs = list(dict.fromkeys(abbr.upper() for abbr in self.state_portal_abbr))
         self.company_name_check_enabled = self.config.get('company_name_check_enabled', DEFAULT_COMPANY_NAME_CHECK_ENABLED)
         self.domain_check_enabled = self.config.get('domain_check_enabled', DEFAULT_DOMAIN_CHECK_ENABLED)
         self.namecheap_search_url = self.config.get('namecheap_search_url')
@@ -46,78 +74,379 @@ class CompanyProfileValidator:
         self.company_check_limit = self.config.get('company_check_limit', DEFAULT_COMPANY_CHECK_LIMIT)
         self.domain_zones = self.config['domain_zones'][:self.domain_search_limit]
         self.input_directory = self.config.get('input_directory', DEFAULT_INPUT_DIRECTORY)
+        # Streaming reader of the input file (company.txt in the input directory by default)
+        self.company_reader = CompanyReader.from_config(self.config)
+        # Index of canonical names, so each unique name and domain is checked only once
+        self.name_index = NameIndex(self.config.get('deduplicate', True))
         self.reports_directory = self.config.get('reports_directory', DEFAULT_REPORTS_DIRECTORY)
         self.report_filename = Path(
             self.reports_directory) / f"{self.config.get('report_filename', DEFAULT_REPORT_FILENAME)}_{datetime.now().strftime('%d_%m_%Y')}"
         self.output_format = self.config.get('output_format', DEFAULT_OUTPUT_FORMAT)
+        self.portal_backend = self.config.get('portal_backend', DEFAULT_PORTAL_BACKEND)
+        portal_urls = self.config.get('portal_urls') or {}
+        self.portal_urls = {state: portal_urls.get(state) for state in self.state_portal_abbrs}
 
-        # Initialize a WebDriver instance using the setup_webdriver function
-        self.driver = setup_webdriver(config)
-        self.results = []
-        self.domain_checker = DomainAvailabilityChecker(self.driver, self.namecheap_search_url)
+        # Apply the wait ceilings and typing mode used by the portal classes
+        configure_waits(self.config.get('waits', {}))
+        # Timing spans and outcome counters of the run
+        METRICS.configure(self.config.get('metrics', {}), self.reports_directory)
 
-    def run(self):
-        # Define the path to the input file containing company names
-        company_file_path = Path(self.input_directory) / 'company.txt'
-        portal_class = get_portal_class(self.state_portal_abbr)
-        # Get the portal class based on the state abbreviation
-        portal = portal_class(self.driver)
+        # Get the portal class of every state based on the state abbreviation and backend;
+        # the portal and backend modules (and Selenium) are only imported for enabled checks
+        self.portal_classes = {state: get_portal_class(state, self.portal_backend)
+                               for state in self.state_portal_abbrs} if self.company_name_check_enabled else {}
+        # Get the domain backend class (namecheap, rdap or whois)
+        self.domain_backend_name = self.config.get('domain_backend', DEFAULT_DOMAIN_BACKEND)
+        self.domain_backend_class = get_domain_backend_class(self.domain_backend_name) \
+            if self.domain_check_enabled else None
+
+        # Shared rate limiters for every state portal and the domain backend
+        self.rate_limiters = RateLimiterRegistry(self.config.get('rate_limits', {}))
+        self.portal_limiters = {state: self.rate_limiters.get('portals', state)
+                                for state in self.state_portal_abbrs}
+        self.domain_limiter = self.rate_limiters.get('domain_backends', self.domain_backend_name)
+
+        # Number of parallel browser workers, capped by the per-host limit
+        max_workers = self.config.get('max_workers', DEFAULT_MAX_WORKERS)
+        self.workers = max(1, self.config.get('workers', DEFAULT_WORKERS))
+        if self.workers > max_workers:
+            logger.warning(f"Requested {self.workers} workers, limiting to {max_workers}.")
+            self.workers = max_workers
+
+        # Blocking of images, media, fonts and third-party hosts in the browser
+        self.resource_blocker = ResourceBlocker(self.config.get('resource_blocking', {}))
+
+        # Pool of proxies shared by the workers, each worker rotating through it
+        self.proxy_pool = ProxyPool.from_config(self.config)
+
+        # Classified retries of failed checks, and the re-queue pass for the unresolved companies
+        self.retry_policy = RetryPolicy(self.config.get('retry', {}))
+        self._requeued = deque()  # (time the company may be rechecked, company, input position).
+        self._in_flight = 0  # Companies handed to the workers and not recorded yet.
+        self._requeue_condition = threading.Condition()
+
+        # Persistent result cache consulted before any portal or domain check
+        self.cache = ResultCache.from_config(self.config.get('cache', {}))
+
+        # Journal of finished companies, used to resume interrupted runs
+        self.resume = self.config.get('resume', False)
+        self.journal = RunJournal(self.config.get('journal_file') or Path(
+            self.reports_directory) / f"{self.config.get('report_filename', DEFAULT_REPORT_FILENAME)}.journal.jsonl")
+        self.finished = {}
+
+        # Streaming report and the emitter keeping its rows in input order
+        self.report = None
+        self.emitter = None
+        self._positions = {}  # Position among the pending companies -> (input position, requeued).
+        self._pending_count = 0
+        # Select the threaded worker pool or the asyncio engine
+        self.engine = self.config.get('engine', DEFAULT_ENGINE)
+        self.worker_pool = BrowserWorkerPool(self._create_worker, self.workers)
+        self.async_engine = None
+        if self.engine == 'async':
+            async_config = self.config.get('async_engine', {})
+            self.async_engine = AsyncVerificationEngine(
+                self._check_all_bns, self._check_company_domains, self._build_result,
+                self._create_portal_worker if self.company_name_check_enabled else None,
+                self._create_domain_worker if self.domain_check_enabled else None,
+                async_config.get('portal_concurrency', self.workers),
+                async_config.get('domain_concurrency', self.workers),
+                async_config.get('max_in_flight', 20))
+
+    def _create_worker(self):
+        # Create the WebDrivers, portals and domain backend used by one worker
+        return BrowserWorker(self.config,
+                             self.portal_classes if self.company_name_check_enabled else None,
+                             self.domain_backend_class if self.domain_check_enabled else None,
+                             self.portal_urls, self.proxy_pool)
+
+    def _create_portal_worker(self):
+        # Worker that only runs BNS checks, used by the asyncio engine
+        return BrowserWorker(self.config, self.portal_classes, None, self.portal_urls, self.proxy_pool)
+
+    def _create_domain_worker(self):
+        # Worker that only runs domain checks, used by the asyncio engine
+        return BrowserWorker(self.config, None, self.domain_backend_class, proxy_pool=self.proxy_pool)
 
+    def run(self):
         try:
-            with open(company_file_path, 'r') as file:
-                # Read company names from the file (up to the specified limit)
-                companies = [line.strip() for line in file if line.strip()][:self.company_check_limit]
-            lines_count = len(companies)
-            logger.info("The number of companies to be processed from the file is: {}", lines_count)
-
-            for company in companies:
-                company_name = company.strip()
-                logger.info("Starting processing for company: {}", company_name)
-
-                # Format the company name for domain and portal
-                formatted_name = format_company_name_to_domain(company_name)
-                portal_formatted_name = format_company_name_for_portal(company_name)
-                result_lines = [f"Company: {company_name}"]
-
-                if self.company_name_check_enabled:
-                    # Check BNS availability for the formatted company name
-                    bns_status = portal.check_availability(company_name)
-                    #bns_status = portal.check_availability(portal_formatted_name)
-
-                    result_lines.append(f"BNS status: {bns_status}")
-
-                if self.domain_check_enabled:
-                    for domain_extension in self.domain_zones:
-                        full_domain = formatted_name + domain_extension
-                        # Check domain availability using DomainAvailabilityChecker
-                        domain_status = self.domain_checker.check_domain_status(full_domain)
-                        result_lines.append(f"{full_domain}: {domain_status}")
-
-                self.results.append(result_lines)
-                logger.info("Finished processing for company: {}", company_name)
-
-            # Save the generated report
-            self.save_report()
+            # Open the input file (or stdin); the company names are read as they are needed
+            self.company_reader.open()
+
+            # Skip the companies that are already in the journal of an interrupted run
+            if self.resume:
+                self.finished = self.journal.load()
+            self.journal.open(resume=self.resume)
+
+            # Open the report; each company is written in input order as soon as it is finished
+            self.report = ReportGenerator(self.config, [], self.state_portal_abbrs)
+            self.report.open()
+            self.emitter = OrderedEmitter(self.report.write_row,
+                                          self.config.get('report_buffer_rows', 1000))
+
+            # Process the companies through the worker pool or engine
+            if self.async_engine:
+                self.async_engine.map(self._pending_companies(), on_result=self._record_result)
+            else:
+                self.worker_pool.map(self._process_company, self._pending_companies(),
+                                     on_result=self._record_result)
+            logger.info("The number of companies processed from the input is: {}", self.company_reader.count)
+
+            self.name_index.log_stats()
+            if self.cache:
+                self.cache.log_stats()
+            self.rate_limiters.log_rates()
+            log_driver_stats()
+            if self.proxy_pool:
+                self.proxy_pool.log_stats()
+            METRICS.log_summary()
         except FileNotFoundError:
-            logger.error(f"File {company_file_path} not found.")
+            logger.error(f"File {self.company_reader.input_path} not found.")
         except Exception as e:
             logger.error("Unexpected error during processing: {}", e)
             logger.exception("Detailed exception information:")
         finally:
-            # Close the WebDriver
+            # Finish the report (partial after an error) and close the WebDrivers
             self.close()
 
-    def save_report(self):
-        # Get the state abbreviation for the report
-        state_abbr = self.config.get('state_portal_abbr', 'Unknown')
-        # Generate and save the report using ReportGenerator
-        report_generator = ReportGenerator(self.config, self.results, state_abbr)
-        report_generator.generate_report()
+    def _pending_companies(self):
+        # Yield the companies still to check; journaled ones go straight to the report
+        skipped = 0
+        for company in self.company_reader:
+            # Waits here while too many finished rows are buffered for the report; the row
+            # holding them back may be a requeued company, so those are rechecked meanwhile
+            index = self.emitter.reserve(timeout=1)
+            while index is None:
+                yield from self._due_requeued()
+                index = self.emitter.reserve(timeout=1)
+            self.name_index.add(company)
+            if company in self.finished:
+                skipped += 1
+                self.emitter.add(index, self.finished[company])
+                continue
+            yield self._hand_out(company, index, False)
+        if skipped:
+            logger.info(f"Resuming: {skipped} companies already finished.")
+
+        # Re-queue pass: recheck the unresolved companies once the input is read
+        while True:
+            with self._requeue_condition:
+                while not self._requeued or self._requeued[0][0] > time.monotonic():
+                    if not self._requeued and not self._in_flight:
+                        return
+                    # Wait for a result, or until the next requeued company is due
+                    self._requeue_condition.wait(
+                        self._requeued[0][0] - time.monotonic() if self._requeued else None)
+            yield from self._due_requeued()
+
+    def _due_requeued(self):
+        # Yield the requeued companies whose delay has passed
+        while True:
+            with self._requeue_condition:
+                if not self._requeued or self._requeued[0][0] > time.monotonic():
+                    return
+                _, company, index = self._requeued.popleft()
+            logger.info(f"Rechecking unresolved company: {company}")
+            yield self._hand_out(company, index, True)
+
+    def _hand_out(self, company, index, requeued):
+        # Map the next pending position to the input position of the company
+        with self._requeue_condition:
+            self._in_flight += 1
+        self._positions[self._pending_count] = (index, requeued)
+        self._pending_count += 1
+        return company
+
+    def _process_company(self, worker, company):
+        company_name = company.strip()
+        logger.info("Starting processing for company: {}", company_name)
+        bns_status = None
+        domain_statuses = None
+
+        if self.company_name_check_enabled:
+            # Check BNS availability for the company name in every state
+            bns_status = self._check_all_bns(worker, company_name)
+
+        if self.domain_check_enabled:
+            # Check all domain zones of the company using the worker's domain backend
+            domain_statuses = self._check_company_domains(worker, company_name)
+
+        logger.info("Finished processing for company: {}", company_name)
+        return self._build_result(company_name, bns_status, domain_statuses)
+
+    def _build_result(self, company_name, bns_status, domain_statuses):
+        # Combine the checks into the result record of the company
+        checked_at = time.time()
+        bns = {}
+        domains = {}
+
+        if self.company_name_check_enabled:
+            for state in self.state_portal_abbrs:
+                bns[state] = BnsResult(state, CheckStatus.parse(bns_status[state])[0], checked_at)
+
+        if self.domain_check_enabled:
+            # Format the company name for the domain columns
+            formatted_name = format_company_name_to_domain(company_name)
+            for domain_extension in self.domain_zones:
+                domains[domain_extension] = DomainResult.from_text(
+                    formatted_name + domain_extension, domain_extension,
+                    domain_statuses[domain_extension], checked_at)
+
+        return CompanyResult(company_name, bns, domains, checked_at)
+
+    def _record_result(self, pending_index, company, result):
+        # Append the finished company to the journal and pass it on to the report
+        index, requeued = self._positions.pop(pending_index)
+        if not requeued and self.retry_policy.requeue and (result is None or result.has_failures):
+            # Unresolved companies are rechecked once at the end of the batch; that result is final
+            logger.info(f"Company '{company}' is unresolved, requeued for a recheck.")
+            METRICS.count("company_requeued")
+            with self._requeue_condition:
+                self._requeued.append((time.monotonic() + self.retry_policy.requeue_delay, company, index))
+                self._in_flight -= 1
+                self._requeue_condition.notify_all()
+            return
+        if result is not None:
+            self.journal.append(company, result)
+        self.emitter.add(index, result)
+        with self._requeue_condition:
+            self._in_flight -= 1
+            self._requeue_condition.notify_all()
+
+    def _check_all_bns(self, worker, company_name):
+        # Check the company in every state, returning the BNS status per state
+        if worker.executor is None:
+            return {state: self._check_bns(worker, company_name, state) for state in self.state_portal_abbrs}
+
+        # Each state portal has its own session, so the states are checked concurrently
+        futures = {state: worker.executor.submit(self._check_bns, worker, company_name, state)
+                   for state in self.state_portal_abbrs}
+        return {state: future.result() for state, future in futures.items()}
+
+    def _check_bns(self, worker, company_name, state):
+        # Rows with the same canonical name share one BNS check per state
+        return self.name_index.run_once(self.name_index.bns_key(state, company_name),
+                                        lambda: self._lookup_bns(worker, company_name, state))
+
+    def _lookup_bns(self, worker, company_name, state):
+        portal = worker.portals[state]
+        # Portals whose answers can't be told from failures opt out of the cache
+        cache = self.cache if getattr(portal, 'cache_results', True) else None
+
+        # Use the cached BNS status if there is a fresh one
+        if cache:
+            cached_status = cache.get_bns(state, company_name)
+            if cached_status is not None:
+                logger.info(f"Using cached {state} BNS status for '{company_name}': {cached_status}")
+                METRICS.count("cache_hit", portal=state)
+                return cached_status
+
+        portal_limiter = self.portal_limiters[state]
+        driver = worker.portal_drivers[state] if portal.requires_browser else None
+
+        def attempt():
+            if portal_limiter:
+                with METRICS.span("rate_limit_wait"):
+                    portal_limiter.acquire()
+            if driver is not None:
+                self.resource_blocker.apply(driver, state)
+            check_start = time.perf_counter()
+            with METRICS.span("bns_check"):
+                status = portal.check_availability(company_name)
+            #status = portal.check_availability(format_company_name_for_portal(company_name))
+            worker.record_proxy(time.perf_counter() - check_start, status)
+            if portal_limiter:
+                portal_limiter.record_status(status)
+            return status
+
+        # Spans recorded during the check (page loads, waits, requests) are labeled with the portal
+        with METRICS.context(portal=state):
+            bns_status = self.retry_policy.run(attempt, f"{state} BNS check of '{company_name}'", driver,
+                                               lambda failure: worker.recover(driver, failure))
+            METRICS.count("bns_status", status=CheckStatus.parse(bns_status)[0].value)
+        if driver is not None:
+            worker.record_check(driver, bns_status)
+        if cache:
+            cache.set_bns(state, company_name, bns_status)
+        return bns_status
+
+    def _check_company_domains(self, worker, company_name):
+        # Check the domain zones of the name formatted for domains, once per unique label
+        formatted_name = format_company_name_to_domain(company_name)
+        return self.name_index.run_once(self.name_index.domain_key(formatted_name),
+                                        lambda: self._check_domains(worker, formatted_name))
+
+    def _check_domains(self, worker, formatted_name):
+        statuses = {}
+        # Use the cached domain statuses where there are fresh ones
+        if self.cache:
+            for zone in self.domain_zones:
+                cached_status = self.cache.get_domain(formatted_name + zone)
+                if cached_status is not None:
+                    logger.info(f"Using cached status for domain '{formatted_name + zone}': {cached_status}")
+                    METRICS.count("cache_hit", backend=self.domain_backend_name)
+                    statuses[zone] = cached_status
+
+        # Check the remaining zones with one batched lookup
+        remaining_zones = [zone for zone in self.domain_zones if zone not in statuses]
+        if remaining_zones:
+            driver = worker.domain_driver if worker.domain_checker.requires_browser else None
+
+            def attempt(zones):
+                if self.domain_limiter:
+                    # A browser backend loads one page per batch, the others send one request per zone
+                    with METRICS.span("rate_limit_wait"):
+                        self.domain_limiter.acquire(1 if driver is not None else len(zones))
+                if driver is not None:
+                    self.resource_blocker.apply(driver, self.domain_backend_name)
+                check_start = time.perf_counter()
+                with METRICS.span("domain_check"):
+                    zone_statuses = worker.domain_checker.check_domain_statuses(formatted_name, zones)
+                if driver is not None:
+                    # Only the browser backend goes through the worker's proxy
+                    worker.record_proxy(time.perf_counter() - check_start, *zone_statuses.values())
+                if self.domain_limiter:
+                    for zone_status in zone_statuses.values():
+                        self.domain_limiter.record_status(zone_status)
+                return zone_statuses
+
+            with METRICS.context(backend=self.domain_backend_name):
+                # Zones that failed are retried without repeating the ones that were answered
+                checked = self.retry_policy.run_many(attempt, remaining_zones, f"Domain check of '{formatted_name}'",
+                                                     driver, lambda failure: worker.recover(driver, failure))
+                for domain_status in checked.values():
+                    METRICS.count("domain_status", status=CheckStatus.parse(domain_status)[0].value)
+            if driver is not None:
+                worker.record_check(driver, *checked.values())
+            for zone, domain_status in checked.items():
+                statuses[zone] = domain_status
+                if self.cache:
+                    self.cache.set_domain(formatted_name + zone, domain_status)
+        return statuses
 
     def close(self):
         try:
-            # Quit the WebDriver
-            self.driver.quit()
-            logger.info("Web driver closed successfully.")
+            # Write the rows still buffered and complete the report
+            if self.emitter:
+                self.emitter.close()
+            if self.report:
+                self.report.close()
+        except Exception as e:
+            logger.error(f"Error finishing the report: {e}")
+        try:
+            # Quit the WebDrivers of all workers
+            self.worker_pool.close()
+            if self.async_engine:
+                self.async_engine.close()
+            logger.info("Web drivers closed successfully.")
+            self.company_reader.close()
+            self.journal.close()
+            if self.cache:
+                self.cache.close()
+        except Exception as e:
+            logger.error(f"Error closing web drivers: {e}")
+        try:
+            # Export the metrics, also for a run that ended early
+            METRICS.export()
         except Exception as e:
-            logger.error(f"Error closing web driver: {e}")
+            logger.error(f"Error exporting metrics: {e}")
@@ -0,0 +1,31 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/domain_backend_factory.py
+
+Description:
+This module provides a function to dynamically retrieve a domain availability backend
+class by name. It uses Python's importlib to load the module of the selected backend,
+so only the dependencies of the backend in use are imported.
+"""
+
+import importlib
+
+# Module and class name of every selectable domain backend
+DOMAIN_BACKENDS = {
+    "namecheap": ("modules.namecheap_domain_checker", "DomainAvailabilityChecker"),
+    "rdap": ("modules.domain_backends.rdap_backend", "RDAPDomainBackend"),
+    "whois": ("modules.domain_backends.whois_backend", "WhoisDomainBackend")
+}
+
+
+# Define a function to dynamically get a domain backend class based on its name
+def get_domain_backend_class(backend_name):
+    try:
+        module_name, class_name = DOMAIN_BACKENDS[backend_name.lower()]
+        return getattr(importlib.import_module(module_name), class_name)
+    except KeyError:
+        # Handle unknown backend names
+        raise ValueError(f"No domain backend found with name: {backend_name}")
@@ -0,0 +1,35 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/domain_backends/base.py
+
+Description:
+This module defines the DomainBackend base class, the interface shared by all domain
+availability backends. A backend checks single domains and can check every zone of
+one label at once; the default batch implementation checks the zones one by one.
+"""
+
+from typing import Dict, List
+
+
+class DomainBackend:
+    requires_browser = False  # Class variable to indicate if a WebDriver instance is required.
+
+    @classmethod
+    def from_config(cls, config, driver=None):
+        # Create the backend from the application configuration
+        raise NotImplementedError
+
+    def check_domain_status(self, domain: str) -> str:
+        # Return "Taken", "Available" (optionally with a price) or "Status Unknown"
+        raise NotImplementedError
+
+    def check_domain_statuses(self, label: str, zones: List[str]) -> Dict[str, str]:
+        # Check every zone of one label and return a dict of zone to status
+        return {zone: self.check_domain_status(label + zone) for zone in zones}
+
+    def close(self):
+        # Release the resources held by the backend
+        pass
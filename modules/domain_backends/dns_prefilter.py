@@ -0,0 +1,138 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/domain_backends/dns_prefilter.py
+
+Description:
+This module defines the DNSPreFilter class and the PrefilteredDomainBackend wrapper.
+The pre-filter sends NS and SOA queries over UDP with asyncio and marks domains with a
+live delegation as "Taken" right away. Only the domains the DNS reports as missing are
+passed on to the slower availability backend.
+"""
+
+import asyncio
+import random
+import struct
+from typing import Dict, List, Optional
+from utils.logger import logger
+from modules.domain_backends.base import DomainBackend
+
+# DNS record types and response codes used by the pre-filter
+QTYPE_NS = 2
+QTYPE_SOA = 6
+RCODE_NOERROR = 0
+RCODE_NXDOMAIN = 3
+
+
+class _DNSQueryProtocol(asyncio.DatagramProtocol):
+    # Sends one DNS query and resolves the future with the first answer
+    def __init__(self, query: bytes, future: asyncio.Future):
+        self.query = query
+        self.future = future
+
+    def connection_made(self, transport):
+        transport.sendto(self.query)
+
+    def datagram_received(self, data, addr):
+        if not self.future.done() and data[:2] == self.query[:2]:
+            self.future.set_result(data)
+
+    def error_received(self, exc):
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+class DNSPreFilter:
+    def __init__(self, nameserver: str = "1.1.1.1", port: int = 53, timeout: float = 2,
+                 concurrency: int = 50):
+        self.nameserver = nameserver
+        self.port = port
+        self.timeout = timeout
+        self.concurrency = concurrency
+
+    @classmethod
+    def from_config(cls, prefilter_config: Dict[str, any]) -> Optional["DNSPreFilter"]:
+        # Create the pre-filter from the 'dns_prefilter' section of the configuration, if enabled
+        if not prefilter_config or not prefilter_config.get('enabled'):
+            return None
+        return cls(prefilter_config.get('nameserver', "1.1.1.1"),
+                   prefilter_config.get('port', 53),
+                   prefilter_config.get('timeout', 2),
+                   prefilter_config.get('concurrency', 50))
+
+    @staticmethod
+    def _build_query(domain: str, qtype: int) -> bytes:
+        # Header: random id, recursion desired, one question
+        header = struct.pack(">HHHHHH", random.getrandbits(16), 0x0100, 1, 0, 0, 0)
+        qname = b"".join(bytes([len(part)]) + part.encode('idna')
+                         for part in domain.strip('.').split('.')) + b"\x00"
+        return header + qname + struct.pack(">HH", qtype, 1)
+
+    async def _query(self, domain: str, qtype: int):
+        # Return (response code, number of answers) for one query
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DNSQueryProtocol(self._build_query(domain, qtype), future),
+            remote_addr=(self.nameserver, self.port))
+        try:
+            data = await asyncio.wait_for(future, self.timeout)
+        finally:
+            transport.close()
+        _, flags, _, answer_count, _, _ = struct.unpack(">HHHHHH", data[:12])
+        return flags & 0x000F, answer_count
+
+    async def _is_delegated(self, domain: str, semaphore) -> Optional[bool]:
+        # True for a live delegation, False for NXDOMAIN, None when the DNS can't tell
+        async with semaphore:
+            try:
+                rcode, answer_count = await self._query(domain, QTYPE_NS)
+                if rcode == RCODE_NOERROR and answer_count == 0:
+                    # Some zones only answer the SOA query at the apex
+                    rcode, answer_count = await self._query(domain, QTYPE_SOA)
+            except (OSError, asyncio.TimeoutError, struct.error) as e:
+                logger.error(f"DNS query failed for domain '{domain}': {e}")
+                return None
+        if rcode == RCODE_NOERROR and answer_count > 0:
+            return True
+        if rcode == RCODE_NXDOMAIN:
+            return False
+        return None
+
+    async def _check_all(self, domains: List[str]):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*[self._is_delegated(domain, semaphore) for domain in domains])
+
+    def find_delegated(self, domains: List[str]) -> List[str]:
+        # Return the domains that have a live delegation
+        results = asyncio.run(self._check_all(domains))
+        return [domain for domain, delegated in zip(domains, results) if delegated]
+
+
+class PrefilteredDomainBackend(DomainBackend):
+    def __init__(self, backend: DomainBackend, prefilter: DNSPreFilter):
+        self.backend = backend  # Slow availability backend for the remaining domains.
+        self.prefilter = prefilter
+        self.requires_browser = backend.requires_browser
+
+    def check_domain_status(self, domain: str) -> str:
+        label, zone = domain.split('.', 1)
+        return self.check_domain_statuses(label, ['.' + zone])['.' + zone]
+
+    def check_domain_statuses(self, label: str, zones: List[str]) -> Dict[str, str]:
+        # Mark delegated domains as taken and check only the others with the backend
+        delegated = set(self.prefilter.find_delegated([label + zone for zone in zones]))
+        statuses = {}
+        for zone in zones:
+            if label + zone in delegated:
+                logger.info(f"Domain '{label + zone}' has a live delegation, marking as taken.")
+                statuses[zone] = "Taken"
+        remaining_zones = [zone for zone in zones if zone not in statuses]
+        if remaining_zones:
+            statuses.update(self.backend.check_domain_statuses(label, remaining_zones))
+        return {zone: statuses[zone] for zone in zones}
+
+    def close(self):
+        self.backend.close()
@@ -0,0 +1,127 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/domain_backends/rdap_backend.py
+
+Description:
+This module defines the RDAPDomainBackend class, which checks domain availability with
+the Registration Data Access Protocol. The RDAP server of each zone is taken from the
+configuration or from the IANA bootstrap file, requests go through a pooled keep-alive
+session, and all zones of one label are queried concurrently on a thread pool. Failed
+requests are classified for the retry policy.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import requests
+from requests.adapters import HTTPAdapter
+from utils.logger import logger
+from modules.domain_backends.base import DomainBackend
+from modules.retry_policy import FailureClass, note_failure, run_with_failure
+
+IANA_RDAP_BOOTSTRAP_URL = "https://data.iana.org/rdap/dns.json"
+
+
+class RDAPDomainBackend(DomainBackend):
+    def __init__(self, rdap_servers: Dict[str, str] = None, timeout: float = 5,
+                 concurrency: int = 10, bootstrap_url: str = IANA_RDAP_BOOTSTRAP_URL):
+        # RDAP base URLs per zone, e.g. {".com": "https://rdap.verisign.com/com/v1/"}
+        self.rdap_servers = {zone.lstrip('.').lower(): url for zone, url in (rdap_servers or {}).items()}
+        self.timeout = timeout
+        self.bootstrap_url = bootstrap_url
+        self._bootstrap = None  # Zone -> RDAP base URL from the IANA bootstrap file, once loaded.
+        self._bootstrap_lock = threading.Lock()
+
+        # Keep connections to the RDAP servers alive and share them between the zones
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Accept': 'application/rdap+json'})
+        self.executor = ThreadPoolExecutor(max_workers=concurrency,
+                                           thread_name_prefix="rdap")
+
+    @classmethod
+    def from_config(cls, config, driver=None):
+        backend_config = config.get('domain_backends', {})
+        rdap_config = backend_config.get('rdap', {})
+        return cls(rdap_config.get('servers'), backend_config.get('timeout', 5),
+                   backend_config.get('concurrency', 10),
+                   rdap_config.get('bootstrap_url', IANA_RDAP_BOOTSTRAP_URL))
+
+    def _server_for(self, zone: str):
+        # Find the RDAP base URL of a zone, loading the IANA bootstrap file once
+        if zone in self.rdap_servers:
+            return self.rdap_servers[zone]
+        bootstrap = self._bootstrap
+        if bootstrap is None:
+            # The zones of a label are checked concurrently, so only one thread loads the file
+            with self._bootstrap_lock:
+                if self._bootstrap is None:
+                    self._bootstrap = self._load_bootstrap()
+                bootstrap = self._bootstrap
+        return (bootstrap or {}).get(zone)
+
+    def _load_bootstrap(self):
+        # Read the IANA bootstrap file; None after an error, so the next check tries again
+        try:
+            response = self.session.get(self.bootstrap_url, timeout=self.timeout)
+            response.raise_for_status()
+            bootstrap = {}
+            for zones, urls in response.json().get("services", []):
+                for bootstrap_zone in zones:
+                    bootstrap[bootstrap_zone.lower()] = urls[0]
+            return bootstrap
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Error loading RDAP bootstrap file: {e}")
+            note_failure(FailureClass.TRANSIENT)
+            return None
+
+    def check_domain_status(self, domain: str) -> str:
+        zone = domain.split('.', 1)[-1].lower()
+        server = self._server_for(zone)
+        if server is None and '.' in zone:
+            # Second-level zones such as "co.uk" may only be listed under their top-level zone
+            server = self._server_for(zone.split('.')[-1])
+        if server is None:
+            logger.info(f"No RDAP server known for domain '{domain}'.")
+            return "Status Unknown"
+
+        try:
+            response = self.session.get(f"{server.rstrip('/')}/domain/{domain}",
+                                        timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.error(f"RDAP request failed for domain '{domain}': {e}")
+            note_failure(e)
+            return "Status Unknown"
+
+        # RDAP answers 404 for names that are not registered
+        if response.status_code == 404:
+            logger.info(f"Domain '{domain}' is available.")
+            return "Available"
+        if response.status_code == 200:
+            logger.info(f"Domain '{domain}' is not available.")
+            return "Taken"
+        logger.info(f"Status of domain '{domain}' is unknown (HTTP {response.status_code}).")
+        # Rate limits and refusals are blocks, other answers are worth retrying
+        note_failure(FailureClass.BLOCKED if response.status_code in (401, 403, 407, 429)
+                     else FailureClass.TRANSIENT)
+        return "Status Unknown"
+
+    def check_domain_statuses(self, label: str, zones: List[str]) -> Dict[str, str]:
+        # Query all zones of the label concurrently on the pool
+        futures = [self.executor.submit(run_with_failure, self.check_domain_status, label + zone)
+                   for zone in zones]
+        statuses = {}
+        for zone, future in zip(zones, futures):
+            statuses[zone], failure = future.result()
+            if failure is not None:
+                note_failure(failure)
+        return statuses
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
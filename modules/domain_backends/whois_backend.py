@@ -0,0 +1,121 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/domain_backends/whois_backend.py
+
+Description:
+This module defines the WhoisDomainBackend class, which checks domain availability with
+the WHOIS protocol over TCP port 43. The WHOIS server of each zone is taken from the
+configuration or looked up once through whois.iana.org, and all zones of one label are
+queried concurrently with asyncio streams.
+"""
+
+import asyncio
+from typing import Dict, List
+from utils.logger import logger
+from modules.domain_backends.base import DomainBackend
+from modules.retry_policy import FailureClass, note_failure
+
+IANA_WHOIS_SERVER = "whois.iana.org"
+
+# Phrases WHOIS servers use to say that a domain is not registered
+NOT_FOUND_MARKERS = (
+    "no match for",
+    "not found",
+    "no data found",
+    "no entries found",
+    "no object found",
+    "status: free",
+    "status: available",
+    "is available for registration"
+)
+
+
+class WhoisDomainBackend(DomainBackend):
+    def __init__(self, whois_servers: Dict[str, str] = None, timeout: float = 5,
+                 concurrency: int = 10, port: int = 43, iana_server: str = IANA_WHOIS_SERVER):
+        # WHOIS servers per zone, e.g. {".com": "whois.verisign-grs.com"}
+        self.whois_servers = {zone.lstrip('.').lower(): server for zone, server in (whois_servers or {}).items()}
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.port = port
+        self.iana_server = iana_server  # Server asked for the WHOIS server of unknown zones.
+
+    @classmethod
+    def from_config(cls, config, driver=None):
+        backend_config = config.get('domain_backends', {})
+        whois_config = backend_config.get('whois', {})
+        return cls(whois_config.get('servers'), backend_config.get('timeout', 5),
+                   backend_config.get('concurrency', 10), whois_config.get('port', 43),
+                   whois_config.get('iana_server') or IANA_WHOIS_SERVER)
+
+    def _address(self, server: str):
+        # Servers may be given as "host" or "host:port"
+        host, _, port = server.partition(':')
+        return host, int(port) if port else self.port
+
+    async def _query(self, server: str, query: str) -> str:
+        host, port = self._address(server)
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.timeout)
+        try:
+            writer.write(f"{query}\r\n".encode())
+            await writer.drain()
+            # The server closes the connection after sending the whole answer
+            data = await asyncio.wait_for(reader.read(), self.timeout)
+            return data.decode('utf-8', errors='replace')
+        finally:
+            writer.close()
+
+    async def _lookup_server(self, zone: str):
+        # Ask IANA for the WHOIS server of a zone that isn't configured
+        try:
+            answer = await self._query(self.iana_server, zone)
+            for line in answer.splitlines():
+                if line.lower().startswith(("refer:", "whois:")):
+                    return line.split(':', 1)[1].strip()
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.error(f"Error looking up WHOIS server for zone '{zone}': {e}")
+            note_failure(FailureClass.TRANSIENT)
+        return None
+
+    async def _check(self, domain: str, semaphore) -> str:
+        async with semaphore:
+            server = self.whois_servers.get(domain.split('.', 1)[-1].lower())
+            if server is None:
+                logger.info(f"No WHOIS server known for domain '{domain}'.")
+                return "Status Unknown"
+            try:
+                answer = (await self._query(server, domain)).lower()
+            except (OSError, asyncio.TimeoutError) as e:
+                logger.error(f"WHOIS query failed for domain '{domain}': {e}")
+                note_failure(FailureClass.TRANSIENT)
+                return "Status Unknown"
+
+        if any(marker in answer for marker in NOT_FOUND_MARKERS):
+            logger.info(f"Domain '{domain}' is available.")
+            return "Available"
+        if "domain name:" in answer or "registrar:" in answer:
+            logger.info(f"Domain '{domain}' is not available.")
+            return "Taken"
+        logger.info(f"Status of domain '{domain}' is unknown.")
+        return "Status Unknown"
+
+    async def _check_all(self, domains: List[str]):
+        # Resolve the WHOIS servers of new zones once before querying the domains
+        zones = sorted({domain.split('.', 1)[-1].lower() for domain in domains} - set(self.whois_servers))
+        servers = await asyncio.gather(*[self._lookup_server(zone) for zone in zones])
+        # Zones whose lookup failed are looked up again with the next batch
+        self.whois_servers.update((zone, server) for zone, server in zip(zones, servers) if server)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*[self._check(domain, semaphore) for domain in domains])
+
+    def check_domain_status(self, domain: str) -> str:
+        return asyncio.run(self._check_all([domain]))[0]
+
+    def check_domain_statuses(self, label: str, zones: List[str]) -> Dict[str, str]:
+        # Query all zones of the label concurrently
+        statuses = asyncio.run(self._check_all([label + zone for zone in zones]))
+        return dict(zip(zones, statuses))
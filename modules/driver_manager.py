@@ -0,0 +1,167 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/driver_manager.py
+
+Description:
+This module defines the ManagedDriver class, which keeps a warm WebDriver session for
+one worker. Chrome is launched on the first WebDriver call, so a worker whose checks are
+all answered from the cache never starts it. The class forwards every WebDriver call to
+the current browser, recycles the browser
+after a number of checks or when Chrome's memory passes a threshold, and resets the
+session after failures by clearing its state and opening a fresh tab instead of
+relaunching Chrome. Spawn, recycle and reset counts are collected for the whole run.
+"""
+
+import threading
+from typing import Callable, Dict
+from utils.logger import logger
+from .metrics import METRICS
+from .webdriver_setup import setup_webdriver
+
+# Lifecycle counters of all managed drivers in the run
+DRIVER_STATS = {"spawned": 0, "recycled": 0, "resets": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(event: str) -> None:
+    with _stats_lock:
+        DRIVER_STATS[event] += 1
+
+
+# Define a function to log the lifecycle counters of the run
+def log_driver_stats() -> None:
+    logger.info("WebDriver sessions: spawned {}, recycled {}, reset {}",
+                DRIVER_STATS["spawned"], DRIVER_STATS["recycled"], DRIVER_STATS["resets"])
+
+
+class ManagedDriver:
+    _driver = None  # Current browser session; attribute lookups fall through to it.
+
+    def __init__(self, config: Dict[str, any], on_spawn: Callable = None, proxy_server: str = None):
+        lifecycle_config = config.get('driver_lifecycle', {})
+        self._config = config
+        self._on_spawn = on_spawn  # Called with the new browser after every launch.
+        self._proxy_server = proxy_server  # Proxy (forwarding shim) the browser connects through.
+        self.recycle_after_checks = lifecycle_config.get('recycle_after_checks', 200)
+        self.recycle_memory_mb = lifecycle_config.get('recycle_memory_mb', 1024)
+        self.memory_check_interval = lifecycle_config.get('memory_check_interval', 20)
+        self.checks = 0  # Checks done by the current browser session.
+
+    def __getattr__(self, name):
+        # Forward all WebDriver attributes and methods to the current browser, launching it first
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.browser, name)
+
+    @property
+    def browser(self):
+        if self._driver is None:
+            self._spawn()
+        return self._driver
+
+    def _spawn(self):
+        with METRICS.span("driver_launch"):
+            self._driver = setup_webdriver(self._config, self._proxy_server)
+        self.checks = 0
+        _count("spawned")
+        if self._on_spawn is not None:
+            self._on_spawn(self._driver)
+
+    def get(self, url: str):
+        # Page loads are timed per portal
+        with METRICS.span("page_load"):
+            self.browser.get(url)
+
+    def _browser_pids(self):
+        # chromedriver and, with undetected-chromedriver, the Chrome it launched itself
+        process = getattr(getattr(self._driver, 'service', None), 'process', None)
+        pids = [process.pid] if process is not None else []
+        browser_pid = getattr(self._driver, 'browser_pid', None)
+        if browser_pid and browser_pid not in pids:
+            pids.append(browser_pid)
+        return pids
+
+    def memory_usage_mb(self):
+        # Resident memory of chromedriver, Chrome and all of their child processes
+        if self._driver is None:
+            return 0
+        try:
+            import psutil
+        except ImportError:
+            logger.warning("psutil is not installed, memory-based WebDriver recycling is disabled.")
+            self.recycle_memory_mb = 0
+            return 0
+        processes = {}
+        for pid in self._browser_pids():
+            try:
+                root = psutil.Process(pid)
+                processes[root.pid] = root
+                processes.update((child.pid, child) for child in root.children(recursive=True))
+            except psutil.Error:
+                continue
+        rss = 0
+        for process in processes.values():
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                # Renderers come and go while the tree is read
+                continue
+        return rss / (1024 * 1024)
+
+    def record_check(self, failed: bool = False):
+        # Reset after failures and recycle once the session has done enough work
+        self.checks += 1
+        if failed:
+            self.reset_session()
+        if self.recycle_after_checks and self.checks >= self.recycle_after_checks:
+            logger.info(f"Recycling WebDriver after {self.checks} checks.")
+            self.recycle()
+        elif self.recycle_memory_mb and self.memory_check_interval \
+                and self.checks % self.memory_check_interval == 0:
+            memory_mb = self.memory_usage_mb()
+            if memory_mb > self.recycle_memory_mb:
+                logger.info(f"Recycling WebDriver using {memory_mb:.0f} MB of memory.")
+                self.recycle()
+
+    def reset_session(self):
+        # Clear the session state and continue in a fresh tab of the same browser
+        if self._driver is None:
+            return
+        from selenium.common.exceptions import WebDriverException
+        try:
+            self._driver.delete_all_cookies()
+            self._driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            old_handles = list(self._driver.window_handles)
+            self._driver.switch_to.new_window('tab')
+            new_handle = self._driver.current_window_handle
+            for handle in old_handles:
+                self._driver.switch_to.window(handle)
+                self._driver.close()
+            self._driver.switch_to.window(new_handle)
+            _count("resets")
+            METRICS.count("driver_reset")
+        except WebDriverException as e:
+            # The browser itself is broken, so a new one is needed
+            logger.warning(f"WebDriver session reset failed, relaunching: {e}")
+            self.recycle()
+
+    def recycle(self):
+        # Replace the browser with a fresh one; one that was never launched is left to the next call
+        if self._driver is None:
+            return
+        from selenium.common.exceptions import WebDriverException
+        try:
+            self._driver.quit()
+        except WebDriverException as e:
+            logger.error(f"Error closing recycled web driver: {e}")
+        self._spawn()
+        _count("recycled")
+        METRICS.count("driver_recycle")
+
+    def quit(self):
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
@@ -0,0 +1,42 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/http_session.py
+
+Description:
+This module provides a function to set up a pooled keep-alive requests Session for
+the HTTP portal backends. It applies the configured user agent and the proxy given by the proxy pool
+so the HTTP backends behave like the browser set up in webdriver_setup.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict
+
+
+# Define a function to set up a pooled HTTP session
+def create_http_session(config: Dict[str, any], proxy_url: str = None) -> requests.Session:
+    webdriver_config = config.get('webdriver', {})
+
+    session = requests.Session()
+
+    # Keep connections alive and reuse them between checks
+    pool_size = max(1, config.get('workers', 1))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    # Send the same user agent and language as the browser
+    session.headers.update({
+        'User-Agent': webdriver_config.get('user_agent', 'Mozilla/5.0'),
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Connection': 'keep-alive'
+    })
+
+    # Proxy Configuration: the current proxy of the worker, switched when the proxy pool rotates
+    if proxy_url:
+        session.proxies.update({'http': proxy_url, 'https': proxy_url})
+
+    return session
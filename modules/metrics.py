@@ -0,0 +1,206 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/metrics.py
+
+Description:
+This module defines the MetricsRegistry class and the shared METRICS instance, which
+collect timing spans and outcome counters during a run. Spans cover driver launches,
+page loads, waits, HTTP requests and whole BNS and domain checks, and are labeled with
+the portal or backend of the check in progress. At the end of the run a p50/p95/p99
+summary is logged, and the metrics can be exported as JSON or in the Prometheus
+textfile format.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Tuple
+from utils.logger import logger
+
+# Prefix of the exported Prometheus metric names
+PROMETHEUS_PREFIX = "company_scope"
+QUANTILES = (50, 95, 99)
+
+
+class _Timing:
+    # Count, sum and maximum of a span, with a bounded sample for the percentiles
+    __slots__ = ("count", "total", "maximum", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.samples = []
+
+    def add(self, seconds: float, sample_size: int):
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        if len(self.samples) < sample_size:
+            self.samples.append(seconds)
+        else:
+            # Reservoir sampling keeps every observation equally likely to be in the sample
+            index = random.randrange(self.count)
+            if index < sample_size:
+                self.samples[index] = seconds
+
+    def percentile(self, percent: float) -> float:
+        if not self.samples:
+            return 0.0
+        # Nearest-rank percentile of the sampled timings
+        ordered = sorted(self.samples)
+        rank = min(len(ordered), max(1, math.ceil(percent / 100 * len(ordered))))
+        return ordered[rank - 1]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.enabled = True
+        self.sample_size = 10000  # Samples kept per span for the percentiles.
+        self.export_format = None  # 'json' or 'prometheus'.
+        self.export_path = None
+        self.export_directory = "."  # Directory of the default export file.
+        self._timings = {}  # (span name, labels) -> _Timing.
+        self._counters = {}  # (counter name, labels) -> count.
+        self._lock = threading.Lock()
+        self._context = threading.local()  # Labels of the check running in this thread.
+
+    def configure(self, metrics_config: Dict[str, any], export_directory: str = "."):
+        metrics_config = metrics_config or {}
+        self.export_directory = export_directory
+        self.enabled = metrics_config.get('enabled', True)
+        self.sample_size = metrics_config.get('sample_size', 10000)
+        self.export_format = metrics_config.get('export_format') or None
+        self.export_path = metrics_config.get('export_path') or None
+
+    def _labels(self, labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        # Merge the labels of the current check with the labels given for this metric
+        merged = dict(getattr(self._context, 'labels', {}))
+        merged.update({key: str(value) for key, value in labels.items() if value is not None})
+        return tuple(sorted(merged.items()))
+
+    @contextmanager
+    def context(self, **labels):
+        # Label every span and counter recorded by this thread inside the block
+        previous = getattr(self._context, 'labels', {})
+        self._context.labels = dict(previous, **{key: str(value) for key, value in labels.items()})
+        try:
+            yield
+        finally:
+            self._context.labels = previous
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        # Time the block; failures are counted per span as well
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.count(f"{name}_errors", **labels)
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def observe(self, name: str, seconds: float, **labels):
+        if not self.enabled:
+            return
+        key = (name, self._labels(labels))
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = _Timing()
+            timing.add(seconds, self.sample_size)
+
+    def count(self, name: str, value: int = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def summary(self) -> Dict[str, List[Dict[str, any]]]:
+        with self._lock:
+            spans = [{"name": name, "labels": dict(labels), "count": timing.count,
+                      "sum": round(timing.total, 6), "max": round(timing.maximum, 6),
+                      **{f"p{quantile}": round(timing.percentile(quantile), 6) for quantile in QUANTILES}}
+                     for (name, labels), timing in sorted(self._timings.items())]
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self._counters.items())]
+        return {"spans": spans, "counters": counters}
+
+    def log_summary(self):
+        if not self.enabled:
+            return
+        summary = self.summary()
+        for span in summary["spans"]:
+            labels = ", ".join(f"{key}={value}" for key, value in span["labels"].items())
+            logger.info(f"Timing {span['name']}" + (f" [{labels}]" if labels else "") +
+                        f": n={span['count']} p50={span['p50']:.3f}s p95={span['p95']:.3f}s "
+                        f"p99={span['p99']:.3f}s max={span['max']:.3f}s")
+        for counter in summary["counters"]:
+            labels = ", ".join(f"{key}={value}" for key, value in counter["labels"].items())
+            logger.info(f"Count {counter['name']}" + (f" [{labels}]" if labels else "") + f": {counter['value']}")
+
+    @staticmethod
+    def _prometheus_labels(labels: Dict[str, str], **extra) -> str:
+        labels = dict(labels, **extra)
+        if not labels:
+            return ""
+        escaped = (key + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                   for key, value in labels.items())
+        return "{" + ",".join(escaped) + "}"
+
+    def to_prometheus(self) -> str:
+        # Spans become summaries in seconds, counters become totals
+        summary = self.summary()
+        span_metric = f"{PROMETHEUS_PREFIX}_span_seconds"
+        lines = [f"# HELP {span_metric} Duration of instrumented operations.", f"# TYPE {span_metric} summary"]
+        for span in summary["spans"]:
+            labels = dict(span["labels"], span=span["name"])
+            for quantile in QUANTILES:
+                lines.append(f"{span_metric}{self._prometheus_labels(labels, quantile=quantile / 100)} "
+                             f"{span[f'p{quantile}']}")
+            lines.append(f"{span_metric}_sum{self._prometheus_labels(labels)} {span['sum']}")
+            lines.append(f"{span_metric}_count{self._prometheus_labels(labels)} {span['count']}")
+        counter_metric = f"{PROMETHEUS_PREFIX}_events_total"
+        lines += [f"# HELP {counter_metric} Outcomes and events of the checks.", f"# TYPE {counter_metric} counter"]
+        for counter in summary["counters"]:
+            labels = dict(counter["labels"], event=counter["name"])
+            lines.append(f"{counter_metric}{self._prometheus_labels(labels)} {counter['value']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        # Write the metrics file if an export format is configured
+        if not self.enabled or not self.export_format:
+            return
+        export_path = Path(self.export_path or Path(self.export_directory) /
+                           f"metrics.{'prom' if self.export_format == 'prometheus' else 'json'}")
+        export_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so a textfile collector never reads half a file
+        temp_path = export_path.with_name(export_path.name + ".tmp")
+        with temp_path.open('w', encoding='utf-8') as file:
+            if self.export_format == 'prometheus':
+                file.write(self.to_prometheus())
+            else:
+                json.dump(self.summary(), file, ensure_ascii=False, indent=4)
+        temp_path.replace(export_path)
+        logger.info(f"Metrics exported to {export_path}")
+
+    def reset(self):
+        with self._lock:
+            self._timings = {}
+            self._counters = {}
+
+
+# Metrics shared by all modules of the run
+METRICS = MetricsRegistry()
@@ -0,0 +1,109 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/name_index.py
+
+Description:
+This module defines the NameIndex class, which deduplicates the input before any
+network work. Company names are reduced to a canonical portal name and a domain label,
+and each unique name and domain is checked only once. Rows that share a key wait for
+the check already in flight and reuse its result. Only the results of the most recent
+unique checks are kept, so memory stays flat on large inputs.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+from utils.logger import logger
+from .company_name_formatter import strip_company_name
+from .rate_limiter import FAILURE_STATUSES
+
+# Finished check results kept for later rows with the same key
+MAX_FINISHED_RESULTS = 10000
+
+
+class NameIndex:
+    def __init__(self, enabled: bool = True, max_results: int = MAX_FINISHED_RESULTS):
+        self.enabled = enabled
+        self.max_results = max_results
+        self.rows = 0  # Input rows added to the index.
+        self.unique_checks = 0  # Checks that were run.
+        self.shared_checks = 0  # Checks answered by another row with the same key.
+        self._futures = {}  # Check key -> future of a check in flight.
+        self._finished = OrderedDict()  # Check key -> result, most recently used last.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def canonical_name(name: str) -> str:
+        # Suffixes can be left over once punctuation is stripped ("ACME, L.L.C." -> "ACME LLC"),
+        # so the portal formatting is applied until the name stops changing
+        canonical = ' '.join(name.upper().split())
+        while True:
+            formatted = ' '.join(strip_company_name(canonical).split())
+            if formatted == canonical or not formatted:
+                return canonical
+            canonical = formatted
+
+    def add(self, name: str) -> None:
+        # Count an input row; the keys are only built when deduplication is on
+        if self.enabled:
+            with self._lock:
+                self.rows += 1
+
+    def bns_key(self, state: str, name: str) -> Hashable:
+        return "bns", state, self.canonical_name(name) if self.enabled else name
+
+    @staticmethod
+    def domain_key(label: str) -> Hashable:
+        return "domain", label
+
+    def run_once(self, key: Hashable, check: Callable[[], Any]) -> Any:
+        # Run the check for the first row with this key; the other rows reuse its result
+        if not self.enabled:
+            return check()
+        with self._lock:
+            if key in self._finished:
+                self._finished.move_to_end(key)
+                self.shared_checks += 1
+                return self._finished[key]
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+                self.unique_checks += 1
+            else:
+                self.shared_checks += 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = check()
+        except Exception as e:
+            # Let the waiting rows see the error, and let later rows try again
+            with self._lock:
+                self._futures.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            # The rows waiting now hold the future; later rows use the kept result
+            self._futures.pop(key, None)
+            if not self._failed(result):
+                # Failed checks are shared with the rows waiting now, but retried for later rows
+                self._finished[key] = result
+                if len(self._finished) > self.max_results:
+                    self._finished.popitem(last=False)
+        future.set_result(result)
+        return result
+
+    @staticmethod
+    def _failed(result: Any) -> bool:
+        statuses = result.values() if isinstance(result, dict) else [result]
+        return any(status in FAILURE_STATUSES for status in statuses)
+
+    def log_stats(self) -> None:
+        if self.enabled:
+            logger.info(f"Input index: {self.rows} rows, {self.unique_checks} checks run, "
+                        f"{self.shared_checks} checks shared.")
@@ -9,29 +9,43 @@ Description:
 This module defines the DomainAvailabilityChecker class, which checks the
 availability of domains on Namecheap using a Selenium WebDriver. It interacts
 with the Namecheap website, processes search results, and returns the domain
-status.
+status. Several zones of the same label can be checked with a single page load,
+because the Namecheap results page lists the label in many TLDs at once.
 """
 
-import time
+from typing import Dict, List
 from utils.logger import logger
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
+from modules.domain_backends.base import DomainBackend
+from modules.page_waits import wait_until
+from modules.retry_policy import note_failure
 
 # Define CSS selectors for elements on the Namecheap domain search page
 SEARCH_INPUT = 'input#search-query'
 SUBMIT_BUTTON = 'input[type="submit"]'
+DOMAIN_NAME = 'h2'  # Element holding the domain name of a result card
+
+
+# Define a function to normalize a domain name for comparison
+def normalize_domain(name) -> str:
+    return "".join((name or "").split()).lower().rstrip('.')
 
 
 # Define a class for checking the availability of a domain on Namecheap
-class DomainAvailabilityChecker:
+class DomainAvailabilityChecker(DomainBackend):
+    requires_browser = True  # Namecheap is scraped through the WebDriver.
+
     def __init__(self, driver, namecheap_url):
         # Initialize the checker with a WebDriver instance and Namecheap URL
         self.driver = driver
         self.namecheap_url = namecheap_url
 
+    @classmethod
+    def from_config(cls, config, driver=None):
+        return cls(driver, config.get('namecheap_search_url'))
+
     def check_domain_status(self, domain):
         try:
             # Navigate to the Namecheap URL for the given domain
@@ -42,43 +56,76 @@ class DomainAvailabilityChecker:
             search_input = self.driver.find_element(By.CSS_SELECTOR, SEARCH_INPUT)
             search_input.clear()
             search_input.send_keys(domain + Keys.ENTER)
-            time.sleep(2)
-
-            # Extract the domain extension from the provided domain
-            domain_extension = domain.split('.')[-1]
-            domain_unavailable_selector = f'article.domain-{domain_extension}.unavailable'
-            domain_available_selector = f'article.domain-{domain_extension}.available'
 
             try:
-                # Wait for the "unavailable" message to appear (indicating the domain is taken)
-                WebDriverWait(self.driver, 4).until(
-                    EC.visibility_of_element_located(
-                        (By.CSS_SELECTOR, domain_unavailable_selector))
-                )
-                logger.info(f"Domain '{domain}' is not available.")
-                return "Taken"
-            except TimeoutException:
-                try:
-                    # Wait for the "available" message to appear (indicating the domain is available)
-                    domain_article_available = WebDriverWait(self.driver, 4).until(
-                        EC.visibility_of_element_located(
-                            (By.CSS_SELECTOR, domain_available_selector))
-                    )
-                    price_element = domain_article_available.find_element(
-                        By.CSS_SELECTOR, 'div.price strong')
-                    price = price_element.text
-                    logger.info(f"Domain '{domain}' is available at {price}.")
-                    return f"Available at {price}"
-                except (NoSuchElementException, TimeoutException):
-                    # Handle cases where the status of the domain is unknown
-                    logger.info(f"Status of domain '{domain}' is unknown.")
-                    return "Status Unknown"
+                # Wait for the card of the searched domain itself; suggestions in the same zone,
+                # such as "getacme.com" for "acme.com", can be listed before it
+                status = wait_until(self.driver, lambda: self._read_listed_status(domain), 8)
+                if status == "Taken":
+                    logger.info(f"Domain '{domain}' is not available.")
+                else:
+                    logger.info(f"Domain '{domain}' is {status.lower()}.")
+                return status
+            except (NoSuchElementException, TimeoutException):
+                # Handle cases where the status of the domain is unknown
+                logger.info(f"Status of domain '{domain}' is unknown.")
+                return "Status Unknown"
 
         except NoSuchElementException as e:
             # Handle exceptions if elements are not found
             logger.error(f"Element not found: {e}")
+            note_failure(e)
             return "Status Unknown"
         except TimeoutException as e:
             # Handle timeout exceptions
             logger.error(f"Timeout occurred: {e}")
+            note_failure(e)
             return "Status Unknown"
+
+    def _read_listed_status(self, domain):
+        # Read the status of a domain listed on the current results page without waiting
+        domain_extension = domain.split('.')[-1]
+        for article in self.driver.find_elements(By.CSS_SELECTOR, f'article.domain-{domain_extension}'):
+            # The page also lists suggestions for other labels in the same zone, such as "getacme.co"
+            # for "acme.co", so the card's own domain name has to match exactly
+            names = article.find_elements(By.CSS_SELECTOR, DOMAIN_NAME)
+            if not names or normalize_domain(names[0].get_attribute('textContent')) != normalize_domain(domain):
+                continue
+            classes = (article.get_attribute('class') or '').split()
+            if 'unavailable' in classes:
+                return "Taken"
+            if 'available' in classes:
+                price_elements = article.find_elements(By.CSS_SELECTOR, 'div.price strong')
+                if price_elements:
+                    return f"Available at {price_elements[0].get_attribute('textContent').strip()}"
+        return None
+
+    def check_domain_statuses(self, label: str, zones: List[str]) -> Dict[str, str]:
+        # Check every zone of one label with a single results page where possible
+        statuses = {}
+        if not zones:
+            return statuses
+
+        # The first zone is searched the usual way, which also loads the results page
+        first_domain = label + zones[0]
+        statuses[zones[0]] = self.check_domain_status(first_domain)
+
+        # Read the other zones from the loaded page without waiting for missing elements
+        implicit_wait = self.driver.timeouts.implicit_wait
+        self.driver.implicitly_wait(0)
+        try:
+            for zone in zones[1:]:
+                status = self._read_listed_status(label + zone)
+                if status is not None:
+                    logger.info(f"Domain '{label + zone}' read from the results page: {status}")
+                    statuses[zone] = status
+        except (NoSuchElementException, TimeoutException) as e:
+            logger.error(f"Error reading the results page for '{label}': {e}")
+        finally:
+            self.driver.implicitly_wait(implicit_wait)
+
+        # Zones that the results page doesn't list are checked one by one
+        for zone in zones[1:]:
+            if zone not in statuses:
+                statuses[zone] = self.check_domain_status(label + zone)
+        return statuses
@@ -0,0 +1,131 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/page_waits.py
+
+Description:
+This module provides the wait helpers shared by the portal classes and the Namecheap
+checker. Instead of fixed sleeps they wait for concrete page conditions, such as a
+result element being present, the document being loaded or the network going idle.
+Every wait is capped by a configurable ceiling, and human-like typing is opt-in.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+from .metrics import METRICS
+
+# Wait settings, updated from the 'waits' section of the configuration
+WAIT_SETTINGS = {
+    "max_wait": None,  # Ceiling in seconds applied to every wait (None keeps the defaults).
+    "poll_frequency": 0.1,  # Seconds between two checks of a wait condition.
+    "network_idle_time": 0.5,  # Seconds without new requests that count as idle.
+    "human_typing": False,  # Type one character at a time like a human.
+    "typing_delay": 0.1  # Seconds between two characters when typing like a human.
+}
+
+
+# Define a function to apply the wait settings from the configuration
+def configure_waits(waits_config: Dict[str, any]) -> None:
+    for key, value in (waits_config or {}).items():
+        if key in WAIT_SETTINGS:
+            WAIT_SETTINGS[key] = value
+
+
+# Define a function to apply the configured ceiling to a wait timeout
+def wait_timeout(timeout: float) -> float:
+    max_wait = WAIT_SETTINGS["max_wait"]
+    return min(timeout, max_wait) if max_wait else timeout
+
+
+def _webdriver_wait(driver, timeout: float, ignored_exceptions=None):
+    # Selenium's wait support is imported on first use, so runs without a browser skip it
+    from selenium.webdriver.support.ui import WebDriverWait
+    return WebDriverWait(driver, wait_timeout(timeout), WAIT_SETTINGS["poll_frequency"],
+                         ignored_exceptions=ignored_exceptions)
+
+
+@contextmanager
+def _without_implicit_wait(driver):
+    # The implicit wait would delay every poll of an explicit wait, so switch it off
+    implicit_wait = driver.timeouts.implicit_wait
+    driver.implicitly_wait(0)
+    try:
+        yield
+    finally:
+        driver.implicitly_wait(implicit_wait)
+
+
+# Define a function to wait until an element is present (or visible) and return it
+def wait_for_element(driver, locator: Tuple[str, str], timeout: float = 10, visible: bool = False):
+    from selenium.webdriver.support import expected_conditions as EC
+    condition = EC.visibility_of_element_located if visible else EC.presence_of_element_located
+    with METRICS.span("element_wait"), _without_implicit_wait(driver):
+        return _webdriver_wait(driver, timeout).until(condition(locator))
+
+
+# Define a function to wait until the first of several elements appears
+def wait_for_any_element(driver, locators: List[Tuple[str, str]], timeout: float = 10,
+                         visible: bool = False):
+    # Returns (index of the matching locator, element)
+    def first_match(drv):
+        for index, locator in enumerate(locators):
+            for element in drv.find_elements(*locator):
+                if not visible or element.is_displayed():
+                    return index, element
+        return False
+
+    with METRICS.span("element_wait"), _without_implicit_wait(driver):
+        return _webdriver_wait(driver, timeout).until(first_match)
+
+
+# Define a function to wait until a condition returns a value and return it
+def wait_until(driver, condition: Callable[[], any], timeout: float = 10):
+    # Elements replaced while the page updates are read again on the next poll
+    from selenium.common.exceptions import StaleElementReferenceException
+    with METRICS.span("element_wait"), _without_implicit_wait(driver):
+        return _webdriver_wait(driver, timeout, [StaleElementReferenceException]).until(
+            lambda drv: condition())
+
+
+# Define a function to wait until the document has finished loading
+def wait_for_document_ready(driver, timeout: float = 10) -> None:
+    with METRICS.span("document_ready"):
+        _webdriver_wait(driver, timeout).until(
+            lambda drv: drv.execute_script("return document.readyState") == "complete")
+
+
+# Define a function to wait until the page stops starting new network requests
+def wait_for_network_idle(driver, timeout: float = 5) -> bool:
+    with METRICS.span("network_idle"):
+        return _wait_for_network_idle(driver, timeout)
+
+
+def _wait_for_network_idle(driver, timeout: float) -> bool:
+    idle_time = WAIT_SETTINGS["network_idle_time"]
+    deadline = time.monotonic() + wait_timeout(timeout)
+    script = "return performance.getEntriesByType('resource').length"
+    request_count = driver.execute_script(script)
+    idle_since = time.monotonic()
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_SETTINGS["poll_frequency"])
+        current_count = driver.execute_script(script)
+        if current_count != request_count:
+            request_count, idle_since = current_count, time.monotonic()
+        elif time.monotonic() - idle_since >= idle_time:
+            return True
+    # Not being idle within the ceiling isn't an error, the caller goes on
+    return False
+
+
+# Define a function to type text into an element, character by character only if enabled
+def type_text(element, text: str) -> None:
+    if not WAIT_SETTINGS["human_typing"]:
+        element.send_keys(text)
+        return
+    for character in text:
+        element.send_keys(character)
+        time.sleep(WAIT_SETTINGS["typing_delay"])
+
@@ -8,14 +8,31 @@ Module: modules/portal_factory.py
 Description:
 This module provides a function to dynamically retrieve a portal class based on
 the state abbreviation. It uses Python's importlib to load the corresponding module
-and return the appropriate class for handling portal-specific logic.
+and return the appropriate class for handling portal-specific logic. When the HTTP
+backend is requested, the browserless portal class is returned if the state has one,
+otherwise the browser-based class is used as a fallback.
 """
 
 import importlib
+from utils.logger import logger
 
 
 # Define a function to dynamically get a portal class based on the state abbreviation
-def get_portal_class(state_abbr):
+def get_portal_class(state_abbr, backend="browser"):
+    if backend == "http":
+        try:
+            # Construct the module name of the browserless portal (e.g., "nj_http_portal")
+            http_module = importlib.import_module(f".portals.{state_abbr.lower()}_http_portal",
+                                                  package="modules")
+            return getattr(http_module, f"{state_abbr.upper()}HttpPortal")
+        except ModuleNotFoundError as e:
+            if e.name != f"modules.portals.{state_abbr.lower()}_http_portal":
+                raise
+            # Portals that need JavaScript only have the browser-based class
+            logger.info(f"No HTTP backend for state {state_abbr}, falling back to the browser.")
+        except AttributeError:
+            logger.info(f"No HTTP backend for state {state_abbr}, falling back to the browser.")
+
     try:
         # Construct the module name using the state abbreviation and import the module
         portal_module = importlib.import_module(f".portals.{state_abbr.lower()}_portal",
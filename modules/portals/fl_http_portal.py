@@ -0,0 +1,59 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/portals/fl_http_portal.py
+
+Description:
+This module defines the FLHttpPortal class, a browserless backend for the Florida Sunbiz
+Portal. It submits the search by name form through a pooled HTTP session and matches
+the company names and statuses in the returned result table.
+"""
+
+from requests import RequestException
+from utils.logger import logger
+from modules.portals.http_portal_base import HttpPortalBase
+from modules.retry_policy import FailureClass, note_failure
+from modules.portals.portal_configs import FL_PORTAL_CONFIG
+from modules.company_name_formatter import format_company_name_for_fl
+
+
+class FLHttpPortal(HttpPortalBase):
+    default_url = FL_PORTAL_CONFIG["url"]
+
+    # Same name formatting as the browser-based FL portal.
+    format_company_name = staticmethod(format_company_name_for_fl)
+
+    def check_availability(self, company_name):
+        logger.info(f"Received company name: {company_name}")
+        formatted_company_name = self.format_company_name(company_name)
+        logger.info(f"Formatted company name: {formatted_company_name}")
+        try:
+            logger.info(f"Accessing FL Sunbiz portal over HTTP: {self.url}")
+            page = self.search(FL_PORTAL_CONFIG["selectors"]["search_input"], formatted_company_name)
+            if page is None:
+                return "Status Unknown"
+
+            # Retrieving a list of companies and their statuses.
+            companies = page.select(FL_PORTAL_CONFIG["selectors"]["company_name"])
+            statuses = page.select(FL_PORTAL_CONFIG["selectors"]["company_status"])
+            if not companies:
+                logger.error("No result table found in FL Sunbiz portal response.")
+                note_failure(FailureClass.LAYOUT)
+                return "Status Unknown"
+
+            # Checking if the formatted company name matches any active company.
+            for comp, status in zip(companies, statuses):
+                comp_name = comp.get_text().strip().upper()
+                status_text = status.get_text().strip()
+                if comp_name == formatted_company_name and status_text.lower() == "active":
+                    logger.info(f"Company name '{formatted_company_name}' is Active in FL.")
+                    return "Not Available"
+            logger.info(f"Company name '{formatted_company_name}' not found as Active in FL.")
+            return "Available"
+
+        except RequestException as e:
+            logger.error(f"HTTP error in FL Sunbiz portal: {e}")
+            note_failure(e)
+            return "Status Unknown"
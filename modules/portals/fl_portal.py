@@ -13,36 +13,22 @@ of company statuses from the portal.
 
 from utils.logger import logger
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-
-# Configuration settings for the Florida Sunbiz Portal
-FL_PORTAL_CONFIG = {
-    "url": "https://search.sunbiz.org/Inquiry/CorporationSearch/ByName",  # URL of the Florida Sunbiz Portal.
-    "selectors": {
-        "search_input": "input#SearchTerm",  # CSS selector for the search input field.
-        "submit_button": "input[type='submit']",  # CSS selector for the search submit button.
-        "company_name": "td.large-width a",  # CSS selector for elements containing company names.
-        "company_status": "td.small-width"  # CSS selector for elements containing company statuses.
-    }
-}
+from modules.retry_policy import note_failure
+from modules.portals.portal_configs import FL_PORTAL_CONFIG
+from modules.page_waits import wait_for_element
+from modules.company_name_formatter import format_company_name_for_fl
 
 
 class FLPortal:
     # Class representing the Florida Sunbiz Portal.
+    requires_browser = True  # Class variable to indicate that a WebDriver instance is required.
 
     def __init__(self, driver):
         self.driver = driver  # Initializing the class with a WebDriver instance.
 
-    @staticmethod
-    def format_company_name(name):
-        # Static method to format company names.
-        name = name.upper()  # Converts the name to uppercase.
-        # Adds " LLC" to the name if it doesn't already end with "LLC" or "INC".
-        if "LLC" not in name and "INC" not in name:
-            return name + " LLC"
-        return name
+    # Static method to format company names.
+    format_company_name = staticmethod(format_company_name_for_fl)
 
     def check_availability(self, company_name):
         # Method to check the availability of a company name.
@@ -54,7 +40,7 @@ class FLPortal:
             logger.info(f"Accessing FL Sunbiz portal: {FL_PORTAL_CONFIG['url']}")
 
             # Waiting for the search input to be present and then clearing it and entering the formatted company name.
-            search_input = WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, FL_PORTAL_CONFIG["selectors"]["search_input"])))
+            search_input = wait_for_element(self.driver, (By.CSS_SELECTOR, FL_PORTAL_CONFIG["selectors"]["search_input"]), 10)
             search_input.clear()
             search_input.send_keys(formatted_company_name)
 
@@ -63,7 +49,7 @@ class FLPortal:
             search_button.click()
 
             # Waiting for the company name elements to be present.
-            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, FL_PORTAL_CONFIG["selectors"]["company_name"])))
+            wait_for_element(self.driver, (By.CSS_SELECTOR, FL_PORTAL_CONFIG["selectors"]["company_name"]), 10)
 
             # Retrieving a list of companies and their statuses.
             companies = self.driver.find_elements(By.CSS_SELECTOR, FL_PORTAL_CONFIG["selectors"]["company_name"])
@@ -82,7 +68,9 @@ class FLPortal:
 
         except NoSuchElementException as e:
             logger.error(f"Element not found in FL Sunbiz portal: {e}")
+            note_failure(e)
             return "Status Unknown"
         except TimeoutException as e:
             logger.error(f"Timeout occurred in FL Sunbiz portal: {e}")
+            note_failure(e)
             return "Status Unknown"
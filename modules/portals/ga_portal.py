@@ -13,11 +13,14 @@ and retrieve company statuses from the portal.
 
 from utils.logger import logger
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
+from modules.retry_policy import note_failure
+from modules.page_waits import wait_for_any_element
 
 
 class GAPortal:
+    requires_browser = True  # Class variable to indicate that a WebDriver instance is required.
+
     def __init__(self, driver):
         self.driver = driver  # Initializing with a WebDriver instance to control the browser.
 
@@ -65,16 +68,16 @@ class GAPortal:
             search_button.click()
 
             # Waiting for either an error message or a status element to appear.
-            WebDriverWait(self.driver, 20).until(
-                lambda driver: driver.find_element(By.CSS_SELECTOR, self.config["selectors"]["error_message"]) or
-                               driver.find_element(By.CSS_SELECTOR, self.config["selectors"]["company_status"])
-            )
+            found_index, _ = wait_for_any_element(self.driver, [
+                (By.CSS_SELECTOR, self.config["selectors"]["error_message"]),
+                (By.CSS_SELECTOR, self.config["selectors"]["company_status"])], 20)
 
             # Checking for "No data found" error messages.
-            error_messages = self.driver.find_elements(By.CSS_SELECTOR, self.config["selectors"]["error_message"])
-            if any("No data found" in message.text for message in error_messages):
-                logger.info(f"Company name '{formatted_company_name}' is available in GA.")
-                return "Available"
+            if found_index == 0:
+                error_messages = self.driver.find_elements(By.CSS_SELECTOR, self.config["selectors"]["error_message"])
+                if any("No data found" in message.text for message in error_messages):
+                    logger.info(f"Company name '{formatted_company_name}' is available in GA.")
+                    return "Available"
 
             # Checking if any of the status elements contain the word "Active".
             status_elements = self.driver.find_elements(By.CSS_SELECTOR, self.config["selectors"]["company_status"])
@@ -88,7 +91,9 @@ class GAPortal:
 
         except NoSuchElementException as e:
             logger.error(f"Element not found in GA portal: {e}")
+            note_failure(e)
             return "Status Unknown"
         except TimeoutException as e:
             logger.error(f"Timeout occurred in GA portal: {e}")
+            note_failure(e)
             return "Status Unknown"
@@ -0,0 +1,110 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/portals/http_portal_base.py
+
+Description:
+This module defines the HttpPortalBase class, the shared base of the browserless portal
+backends. It loads a portal search page through a pooled requests Session, fills and
+submits the search form the same way a browser would, and returns the parsed result
+page for the portal-specific status checks.
+"""
+
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from utils.logger import logger
+from modules.metrics import METRICS
+from modules.retry_policy import FailureClass, is_blocked_page, note_failure
+
+
+class HttpPortalBase:
+    requires_browser = False  # HTTP backends don't need a WebDriver instance.
+    default_url = None  # URL of the portal search page, set by each subclass.
+
+    def __init__(self, session, url=None, timeout=10):
+        self.session = session  # Pooled keep-alive requests Session.
+        self.url = url or self.default_url  # Allows pointing the backend at a local stand-in.
+        self.timeout = timeout  # Timeout in seconds for every HTTP request.
+
+    def fetch_page(self, url, params=None):
+        # Load a page and return it parsed
+        with METRICS.span("http_request", step="page"):
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        return self.parse_response(response)
+
+    @staticmethod
+    def parse_response(response):
+        # Parse a page, noting a captcha or block page so the check is retried as blocked
+        response.raise_for_status()
+        if is_blocked_page(response.text):
+            logger.warning(f"Block page returned by {response.url}")
+            note_failure(FailureClass.BLOCKED)
+        return BeautifulSoup(response.text, 'html.parser')
+
+    @staticmethod
+    def find_form(page, input_selector):
+        # Find the form that contains the given input field
+        search_input = page.select_one(input_selector)
+        if search_input is None:
+            return None
+        return search_input.find_parent('form')
+
+    @staticmethod
+    def form_fields(form):
+        # Collect the default values of all form fields, including hidden tokens
+        fields = {}
+        for field in form.find_all(['input', 'select', 'textarea']):
+            name = field.get('name')
+            if not name:
+                continue
+            if field.name == 'select':
+                selected = field.find('option', selected=True) or field.find('option')
+                fields[name] = selected.get('value', selected.text) if selected else ''
+            elif field.get('type') in ('checkbox', 'radio'):
+                if field.has_attr('checked'):
+                    fields[name] = field.get('value', 'on')
+            elif field.get('type') not in ('submit', 'button', 'image', 'reset'):
+                fields[name] = field.get('value', field.text or '')
+        return fields
+
+    @staticmethod
+    def option_value(form, select_selector, text_prefix):
+        # Return the value of the first option whose text starts with the given prefix
+        select = form.select_one(select_selector)
+        if select is None:
+            return None
+        for option in select.find_all('option'):
+            if option.text.strip().lower().startswith(text_prefix.lower()):
+                return option.get('value', option.text.strip())
+        return None
+
+    def submit_form(self, page_url, form, fields):
+        # Submit the form like a browser would and return the parsed result page
+        action = urljoin(page_url, form.get('action') or page_url)
+        method = (form.get('method') or 'get').lower()
+        logger.info(f"Submitting {method.upper()} form to {action}")
+        with METRICS.span("http_request", step="submit"):
+            if method == 'post':
+                response = self.session.post(action, data=fields, timeout=self.timeout,
+                                             headers={'Referer': page_url})
+            else:
+                response = self.session.get(action, params=fields, timeout=self.timeout,
+                                            headers={'Referer': page_url})
+        return self.parse_response(response)
+
+    def search(self, input_selector, value, extra_fields=None):
+        # Load the search page, fill the search input and submit its form
+        page = self.fetch_page(self.url)
+        form = self.find_form(page, input_selector)
+        input_name = page.select_one(input_selector).get('name') if form is not None else None
+        if not input_name:
+            logger.error(f"Search form with a named '{input_selector}' not found at {self.url}")
+            note_failure(FailureClass.LAYOUT)
+            return None
+
+        fields = self.form_fields(form)
+        fields.update(extra_fields or {})
+        fields[input_name] = value
+        return self.submit_form(self.url, form, fields)
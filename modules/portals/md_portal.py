@@ -8,18 +8,16 @@ Module: modules/portals/md_portal.py
 Description:
 This module defines the MDPortal class, which interacts with the Maryland Business Express
 Entity Search portal to check the availability of company names. It automates the search process
-using Selenium WebDriver and simulates human-like typing for input fields.
+using Selenium WebDriver and can simulate human-like typing for input fields.
 """
 
-import time
-
 from selenium.webdriver import ActionChains
 
 from utils.logger import logger
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
+from modules.retry_policy import note_failure
+from modules.page_waits import wait_for_element, wait_for_document_ready, type_text
 
 # Configuration settings for the Maryland Business Express Entity Search
 MD_PORTAL_CONFIG = {
@@ -34,6 +32,9 @@ MD_PORTAL_CONFIG = {
 
 
 class MDPortal:
+    requires_browser = True  # Class variable to indicate that a WebDriver instance is required.
+    cache_results = False  # "Not Available" is inferred from a wait timeout, so it isn't cached.
+
     def __init__(self, driver):
         self.driver = driver
 
@@ -44,20 +45,14 @@ class MDPortal:
             return name + " LLC"
         return name
 
-    def type_like_human(self, element, text, delay=0.1):
-        """ Type text into an element like a human """
-        for character in text:
-            element.send_keys(character)
-            time.sleep(delay)
-
     def check_availability(self, company_name):
         logger.info(f"Received company name: {company_name}")
         formatted_company_name = self.format_company_name(company_name)
         logger.info(f"Formatted company name: {formatted_company_name}")
         try:
-            # First, open Google and wait for a second
+            # First, open Google and wait until it has loaded
             self.driver.get("https://www.google.com")
-            time.sleep(1)  # Wait for 1 second
+            wait_for_document_ready(self.driver, 1)
 
             self.driver.get(MD_PORTAL_CONFIG["url"])
             logger.info(
@@ -65,29 +60,24 @@ class MDPortal:
 
             # Wait for the "DepartmentId" radio button to be present and then click it
             department_radio_selector = "input[name='SearchType'][value='DepartmentId']"
-            WebDriverWait(self.driver, 3).until(EC.presence_of_element_located(
-                (By.CSS_SELECTOR, department_radio_selector)))
-            department_radio = self.driver.find_element(By.CSS_SELECTOR,
-                                                        department_radio_selector)
+            department_radio = wait_for_element(self.driver, (By.CSS_SELECTOR,
+                                                              department_radio_selector), 3)
             actions = ActionChains(self.driver)
             actions.move_to_element(department_radio).click().perform()
 
             # Wait for the "BusinessName" radio button to be present and then click it
             business_radio_selector = "input[name='SearchType'][value='BusinessName']"
-            WebDriverWait(self.driver, 3).until(EC.presence_of_element_located(
-                (By.CSS_SELECTOR, business_radio_selector)))
-            business_radio = self.driver.find_element(By.CSS_SELECTOR,
-                                                      business_radio_selector)
+            business_radio = wait_for_element(self.driver, (By.CSS_SELECTOR,
+                                                            business_radio_selector), 3)
             actions = ActionChains(self.driver)
             actions.move_to_element(business_radio).click().perform()
 
-            search_input = WebDriverWait(self.driver, 3).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, MD_PORTAL_CONFIG["selectors"]["search_input"])))
+            search_input = wait_for_element(
+                self.driver, (By.CSS_SELECTOR, MD_PORTAL_CONFIG["selectors"]["search_input"]), 3)
             search_input.clear()
 
-            # Simulate human-like typing
-            self.type_like_human(search_input, formatted_company_name)
+            # Type the name, simulating human-like typing only if enabled in the config
+            type_text(search_input, formatted_company_name)
 
             search_button = self.driver.find_element(By.CSS_SELECTOR,
                                                      MD_PORTAL_CONFIG["selectors"][
@@ -95,8 +85,8 @@ class MDPortal:
             actions = ActionChains(self.driver)
             actions.move_to_element(search_button).click().perform()
 
-            WebDriverWait(self.driver, 3).until(EC.presence_of_element_located(
-                (By.XPATH, MD_PORTAL_CONFIG["selectors"]["not_found_message"])))
+            wait_for_element(self.driver,
+                             (By.XPATH, MD_PORTAL_CONFIG["selectors"]["not_found_message"]), 3)
             logger.info(f"Company name '{formatted_company_name}' is available in MD.")
             return "Available"
         except TimeoutException:
@@ -106,4 +96,5 @@ class MDPortal:
         except NoSuchElementException as e:
             logger.error(
                 f"Element not found in Maryland Business Express Entity Search: {e}")
+            note_failure(e)
             return "Status Unknown"
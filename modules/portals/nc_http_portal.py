@@ -0,0 +1,73 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/portals/nc_http_portal.py
+
+Description:
+This module defines the NCHttpPortal class, a browserless backend for the North Carolina
+Business Search portal. It submits the exact-match corporation search through a pooled
+HTTP session and reads the record count from the returned HTML.
+"""
+
+from requests import RequestException
+from utils.logger import logger
+from modules.portals.http_portal_base import HttpPortalBase
+from modules.retry_policy import FailureClass, note_failure
+from modules.portals.portal_configs import NC_PORTAL_CONFIG
+
+
+class NCHttpPortal(HttpPortalBase):
+    default_url = NC_PORTAL_CONFIG["url"]
+
+    def check_availability(self, company_name):
+        logger.info(f"Received company name: {company_name}")
+        selectors = NC_PORTAL_CONFIG["selectors"]
+        try:
+            logger.info(f"Accessing NC Business Search portal over HTTP: {self.url}")
+            page = self.fetch_page(self.url)
+            form = self.find_form(page, selectors["search_input"])
+            if form is None:
+                logger.error(f"Search form not found in NC Business Search portal: {self.url}")
+                note_failure(FailureClass.LAYOUT)
+                return "Status Unknown"
+
+            # The search type, search mode and search input must all be named form fields
+            search_type = form.select_one(selectors["search_type"])
+            search_mode = form.select_one(selectors["search_mode"])
+            search_input = form.select_one(selectors["search_input"])
+            missing = [key for key, field in (("search_type", search_type), ("search_mode", search_mode),
+                                              ("search_input", search_input))
+                       if field is None or not field.get('name')]
+            if missing:
+                logger.error(f"Search form fields {', '.join(missing)} not found in NC Business Search portal.")
+                note_failure(FailureClass.LAYOUT)
+                return "Status Unknown"
+
+            # Selecting "CORPORATION" as search type and "Exact" as search mode.
+            fields = self.form_fields(form)
+            fields[search_type['name']] = "CORPORATION"
+            exact_value = self.option_value(form, selectors["search_mode"], "Exact")
+            if exact_value is not None:
+                fields[search_mode['name']] = exact_value
+            fields[search_input['name']] = company_name
+
+            results_page = self.submit_form(self.url, form, fields)
+            results = results_page.select_one(selectors["results"])
+            if results is None:
+                logger.error("No results element found in NC Business Search portal response.")
+                note_failure(FailureClass.LAYOUT)
+                return "Status Unknown"
+
+            # Checking the text in the results element.
+            if "Records Found: 0" in results.get_text():
+                logger.info(f"Company name '{company_name}' is available in NC.")
+                return "Available"
+            logger.info(f"Company name '{company_name}' is not available in NC.")
+            return "Not Available"
+
+        except RequestException as e:
+            logger.error(f"HTTP error in NC Business Search portal: {e}")
+            note_failure(e)
+            return "Status Unknown"
@@ -13,27 +13,17 @@ and processing the results.
 """
 
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
 from utils.logger import logger
-
-# Configuration settings for the North Carolina Business Search Portal
-NC_PORTAL_CONFIG = {
-    "url": "https://www.sosnc.gov/divisions/business_registration",  # URL of the NC Business Search Portal.
-    "selectors": {
-        "search_type": "select#CorpSearchType",  # CSS selector for the search type dropdown.
-        "search_mode": "select#Words",  # CSS selector for the search mode dropdown.
-        "search_input": "input#SearchCriteria",  # CSS selector for the search input field.
-        "submit_button": "button#SubmitButton",  # CSS selector for the submit button.
-        "results": "article#results-article span"  # CSS selector for the element showing search results.
-    }
-}
+from modules.retry_policy import note_failure
+from modules.portals.portal_configs import NC_PORTAL_CONFIG
+from modules.page_waits import wait_for_element
 
 
 class NCPortal:
     # Class for interacting with the North Carolina Business Search Portal.
+    requires_browser = True  # Class variable to indicate that a WebDriver instance is required.
 
     def __init__(self, driver):
         self.driver = driver  # Initializing with a WebDriver instance.
@@ -63,10 +53,10 @@ class NCPortal:
             search_button.click()
 
             # Waiting for the results element to be present.
-            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, NC_PORTAL_CONFIG["selectors"]["results"])))
+            results_element = wait_for_element(self.driver, (By.CSS_SELECTOR, NC_PORTAL_CONFIG["selectors"]["results"]), 10)
 
             # Checking the text in the results element.
-            results_text = self.driver.find_element(By.CSS_SELECTOR, NC_PORTAL_CONFIG["selectors"]["results"]).text
+            results_text = results_element.text
             if "Records Found: 0" in results_text:
                 logger.info(f"Company name '{company_name}' is available in NC.")
                 return "Available"
@@ -76,7 +66,9 @@ class NCPortal:
 
         except NoSuchElementException as e:
             logger.error(f"Element not found in NC Business Search portal: {e}")
+            note_failure(e)
             return "Status Unknown"
         except TimeoutException as e:
             logger.error(f"Timeout occurred in NC Business Search portal: {e}")
+            note_failure(e)
             return "Status Unknown"
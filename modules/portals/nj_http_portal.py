@@ -0,0 +1,56 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/portals/nj_http_portal.py
+
+Description:
+This module defines the NJHttpPortal class, a browserless backend for the New Jersey
+Business Name Search portal. It submits the availability search form through a pooled
+HTTP session and reads the result alerts straight from the returned HTML.
+"""
+
+from requests import RequestException
+from utils.logger import logger
+from modules.portals.http_portal_base import HttpPortalBase
+from modules.retry_policy import FailureClass, note_failure
+from modules.portals.portal_configs import NJ_PORTAL_CONFIG
+from modules.company_name_formatter import format_company_name_for_portal
+
+
+class NJHttpPortal(HttpPortalBase):
+    default_url = NJ_PORTAL_CONFIG["url"]
+
+    remove_suffix = True  # Same suffix handling as the browser-based NJ portal.
+
+    def format_company_name(self, name):
+        # Method to format the company name using the imported formatter.
+        return format_company_name_for_portal(name, remove_suffix=self.remove_suffix)
+
+    def check_availability(self, company_name):
+        logger.info(f"Original company name: {company_name}")
+        formatted_company_name = self.format_company_name(company_name)
+        logger.info(f"Formatted company name: {formatted_company_name}")
+        try:
+            logger.info(f"Accessing NJ portal over HTTP: {self.url}")
+            page = self.search(NJ_PORTAL_CONFIG["selectors"]["search_input"], formatted_company_name)
+            if page is None:
+                return "Status Unknown"
+
+            # Checking for success or error alerts in the result page.
+            if page.select(NJ_PORTAL_CONFIG["selectors"]["alert_error"]):
+                logger.info(f"Company name '{formatted_company_name}' is not available in NJ.")
+                return "Not Available"
+            elif page.select(NJ_PORTAL_CONFIG["selectors"]["alert_success"]):
+                logger.info(f"Company name '{formatted_company_name}' is available in NJ.")
+                return "Available"
+            else:
+                logger.info(f"Status of company name '{formatted_company_name}' is unknown in NJ.")
+                note_failure(FailureClass.LAYOUT)
+                return "Status Unknown"
+
+        except RequestException as e:
+            logger.error(f"HTTP error in NJ portal: {e}")
+            note_failure(e)
+            return "Status Unknown"
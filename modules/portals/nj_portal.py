@@ -14,27 +14,17 @@ the results to determine name availability.
 
 from utils.logger import logger
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from modules.company_name_formatter import format_company_name_for_portal
-
-# Configuration settings for the NJ Portal
-NJ_PORTAL_CONFIG = {
-    "url": "https://www.njportal.com/DOR/BusinessNameSearch/Search/Availability",  # URL of the NJ Business Name Search Portal.
-    "selectors": {
-        "search_input": "input#BusinessName",  # CSS selector for the business name search input.
-        "submit_button": "input[type='submit'].btn.btn-warning",  # CSS selector for the submit button.
-        "alert": ".alert",  # CSS selector for any alert message.
-        "alert_error": ".alert.alert-error",  # CSS selector for an error alert.
-        "alert_success": ".alert.alert-success"  # CSS selector for a success alert.
-    }
-}
+from modules.retry_policy import note_failure
+from modules.portals.portal_configs import NJ_PORTAL_CONFIG
+from modules.page_waits import wait_for_element, wait_for_any_element
 
 
 # Define a class for the NJ Portal
 class NJPortal:
     remove_suffix = True  # Class variable to indicate if a suffix should be removed from the company name.
+    requires_browser = True  # Class variable to indicate that a WebDriver instance is required.
 
     def __init__(self, driver):
         self.driver = driver  # Initializing with a WebDriver instance.
@@ -53,21 +43,24 @@ class NJPortal:
             logger.info(f"Accessing NJ portal: {NJ_PORTAL_CONFIG['url']}")
 
             # Finding and interacting with elements on the NJ Portal page.
-            search_input = WebDriverWait(self.driver, 4).until(EC.presence_of_element_located((By.CSS_SELECTOR, NJ_PORTAL_CONFIG["selectors"]["search_input"])))
+            search_input = wait_for_element(self.driver, (By.CSS_SELECTOR, NJ_PORTAL_CONFIG["selectors"]["search_input"]), 4)
             search_input.clear()
             search_input.send_keys(formatted_company_name)
 
             search_button = self.driver.find_element(By.CSS_SELECTOR, NJ_PORTAL_CONFIG["selectors"]["submit_button"])
             search_button.click()
 
-            # Waiting for the alert element to be present.
-            WebDriverWait(self.driver, 4).until(EC.presence_of_element_located((By.CSS_SELECTOR, NJ_PORTAL_CONFIG["selectors"]["alert"])))
+            # Waiting for an error, success or other alert element to be present.
+            alert_index, _ = wait_for_any_element(self.driver, [
+                (By.CSS_SELECTOR, NJ_PORTAL_CONFIG["selectors"]["alert_error"]),
+                (By.CSS_SELECTOR, NJ_PORTAL_CONFIG["selectors"]["alert_success"]),
+                (By.CSS_SELECTOR, NJ_PORTAL_CONFIG["selectors"]["alert"])], 4)
 
             # Checking for success or error alerts on the NJ Portal page.
-            if self.driver.find_elements(By.CSS_SELECTOR, NJ_PORTAL_CONFIG["selectors"]["alert_error"]):
+            if alert_index == 0:
                 logger.info(f"Company name '{formatted_company_name}' is not available in NJ.")
                 return "Not Available"
-            elif self.driver.find_elements(By.CSS_SELECTOR, NJ_PORTAL_CONFIG["selectors"]["alert_success"]):
+            elif alert_index == 1:
                 logger.info(f"Company name '{formatted_company_name}' is available in NJ.")
                 return "Available"
             else:
@@ -76,7 +69,9 @@ class NJPortal:
 
         except NoSuchElementException as e:
             logger.error(f"Element not found in NJ portal: {e}")
+            note_failure(e)
             return "Status Unknown"
         except TimeoutException as e:
             logger.error(f"Timeout occurred in NJ portal: {e}")
+            note_failure(e)
             return "Status Unknown"
@@ -0,0 +1,47 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/portals/portal_configs.py
+
+Description:
+This module holds the URLs and CSS selectors of the NJ, FL and NC portals. They are
+shared by the browser-based portals and their HTTP backends, and kept free of Selenium
+so the HTTP backends can be loaded without it.
+"""
+
+# Configuration settings for the NJ Portal
+NJ_PORTAL_CONFIG = {
+    "url": "https://www.njportal.com/DOR/BusinessNameSearch/Search/Availability",  # URL of the NJ Business Name Search Portal.
+    "selectors": {
+        "search_input": "input#BusinessName",  # CSS selector for the business name search input.
+        "submit_button": "input[type='submit'].btn.btn-warning",  # CSS selector for the submit button.
+        "alert": ".alert",  # CSS selector for any alert message.
+        "alert_error": ".alert.alert-error",  # CSS selector for an error alert.
+        "alert_success": ".alert.alert-success"  # CSS selector for a success alert.
+    }
+}
+
+# Configuration settings for the Florida Sunbiz Portal
+FL_PORTAL_CONFIG = {
+    "url": "https://search.sunbiz.org/Inquiry/CorporationSearch/ByName",  # URL of the Florida Sunbiz Portal.
+    "selectors": {
+        "search_input": "input#SearchTerm",  # CSS selector for the search input field.
+        "submit_button": "input[type='submit']",  # CSS selector for the search submit button.
+        "company_name": "td.large-width a",  # CSS selector for elements containing company names.
+        "company_status": "td.small-width"  # CSS selector for elements containing company statuses.
+    }
+}
+
+# Configuration settings for the North Carolina Business Search Portal
+NC_PORTAL_CONFIG = {
+    "url": "https://www.sosnc.gov/divisions/business_registration",  # URL of the NC Business Search Portal.
+    "selectors": {
+        "search_type": "select#CorpSearchType",  # CSS selector for the search type dropdown.
+        "search_mode": "select#Words",  # CSS selector for the search mode dropdown.
+        "search_input": "input#SearchCriteria",  # CSS selector for the search input field.
+        "submit_button": "button#SubmitButton",  # CSS selector for the submit button.
+        "results": "article#results-article span"  # CSS selector for the element showing search results.
+    }
+}
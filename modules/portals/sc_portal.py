@@ -13,12 +13,11 @@ the results, and manages browser instances to maintain session integrity.
 """
 
 from selenium import webdriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException
-import time
 from utils.logger import logger
+from modules.retry_policy import note_failure
+from modules.page_waits import wait_for_element, wait_for_network_idle
 
 # Configuration settings for the SC Portal
 SC_PORTAL_CONFIG = {
@@ -34,6 +33,8 @@ SC_PORTAL_CONFIG = {
 
 
 class SCPortal:
+    requires_browser = True  # Class variable to indicate that a WebDriver instance is required.
+
     def __init__(self, driver=None):
         # Constructor for the SCPortal class.
         self.driver = driver if driver is not None else webdriver.Chrome()  # Initializing the WebDriver.
@@ -44,20 +45,19 @@ class SCPortal:
         logger.info(f"Checking availability of company name: {company_name}")
         try:
             self.driver.get(SC_PORTAL_CONFIG["url"])  # Navigating to the SC Portal URL.
-            time.sleep(1)  # Short pause to ensure page loads properly.
 
-            # Selecting 'Exact Match' from the dropdown menu.
-            search_type_select = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, SC_PORTAL_CONFIG["selectors"]["search_type_dropdown"]))
-            )
+            # Selecting 'Exact Match' from the dropdown menu once it is present.
+            search_type_select = wait_for_element(
+                self.driver, (By.CSS_SELECTOR, SC_PORTAL_CONFIG["selectors"]["search_type_dropdown"]), 10)
             search_type_select.send_keys("Exact Match")
-            time.sleep(1)  # Short pause after selection.
+            # The selection may trigger requests that update the form.
+            wait_for_network_idle(self.driver, 2)
 
             # Entering the company name into the search input.
-            search_input = self.driver.find_element(By.CSS_SELECTOR, SC_PORTAL_CONFIG["selectors"]["search_input"])
+            search_input = wait_for_element(
+                self.driver, (By.CSS_SELECTOR, SC_PORTAL_CONFIG["selectors"]["search_input"]), 10)
             search_input.clear()
             search_input.send_keys(company_name)
-            time.sleep(1)  # Short pause after entering the name.
 
             # Clicking the search button.
             search_button = self.driver.find_element(By.CSS_SELECTOR, SC_PORTAL_CONFIG["selectors"]["submit_button"])
@@ -65,12 +65,12 @@ class SCPortal:
 
             # Waiting for the availability message to appear.
             try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, SC_PORTAL_CONFIG["selectors"]["name_availability_message"]))
-                )
-                availability_message = self.driver.find_element(By.CSS_SELECTOR, SC_PORTAL_CONFIG["selectors"]["name_availability_message"]).text.lower()
-            except TimeoutException:
+                availability_message = wait_for_element(
+                    self.driver, (By.CSS_SELECTOR, SC_PORTAL_CONFIG["selectors"]["name_availability_message"]),
+                    10, visible=True).text.lower()
+            except TimeoutException as e:
                 logger.error("Timeout while waiting for the availability message.")
+                note_failure(e)
                 return "Timeout/Error"
 
             # Interpreting the availability message.
@@ -83,14 +83,18 @@ class SCPortal:
 
         except Exception as e:
             logger.error(f"Error occurred in SC portal: {e}")
+            note_failure(e)
             return "Error"
 
         finally:
             self.check_count += 1  # Incrementing the check counter.
 
-            # Restarting the browser after every 3 checks to avoid potential issues.
+            # Resetting the session after every 3 checks to avoid potential issues.
             if self.check_count % 3 == 0:
-                self.driver.quit()  # Closing the browser.
-                time.sleep(5)  # Pausing before restarting.
-                self.driver = webdriver.Chrome()  # Restarting the browser.
+                if hasattr(self.driver, "reset_session"):
+                    # Managed drivers clear their state and open a fresh tab instead of relaunching.
+                    self.driver.reset_session()
+                else:
+                    self.driver.quit()  # Closing the browser.
+                    self.driver = webdriver.Chrome()  # Restarting the browser.
 
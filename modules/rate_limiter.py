@@ -0,0 +1,98 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/rate_limiter.py
+
+Description:
+This module defines the AdaptiveRateLimiter and RateLimiterRegistry classes. Each state
+portal and each domain backend gets a token bucket shared by all workers. The rate is
+lowered when requests time out or return error pages and raised again step by step while
+responses are healthy, so parallel workers run at the highest rate the site tolerates.
+"""
+
+import threading
+import time
+from typing import Dict
+from utils.logger import logger
+
+# Statuses that mean the site didn't give a usable answer
+FAILURE_STATUSES = ("Status Unknown", "Timeout/Error", "Error")
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, name: str, rate: float = 1.0, burst: float = 1, min_rate: float = 0.1,
+                 max_rate: float = 5.0, backoff_factor: float = 0.5, recovery_step: float = 0.1):
+        self.name = name
+        self.rate = rate  # Current number of requests per second.
+        self.burst = max(1, burst)  # Bucket size.
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.backoff_factor = backoff_factor  # Rate multiplier after a failure.
+        self.recovery_step = recovery_step  # Rate increase after a healthy response.
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, tokens: float = 1):
+        # Reserve the tokens and sleep until they are available
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= tokens
+            wait_time = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def record_success(self):
+        # Speed up slowly while the site answers normally
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.recovery_step)
+
+    def record_failure(self):
+        # Back off quickly on timeouts and error pages
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+        logger.warning(f"Rate limiter '{self.name}' backing off to {self.rate:.2f} requests/s.")
+
+    def record_status(self, status: str):
+        if status in FAILURE_STATUSES:
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+class RateLimiterRegistry:
+    def __init__(self, rate_limits_config: Dict[str, any]):
+        self.config = rate_limits_config or {}
+        self.enabled = self.config.get('enabled', False)
+        self.limiters = {}
+        self._lock = threading.Lock()
+
+    def _create(self, section: str, name: str) -> AdaptiveRateLimiter:
+        # Merge the default settings with the settings of the portal or backend
+        settings = dict(self.config.get('default') or {})
+        settings.update((self.config.get(section) or {}).get(name) or {})
+        return AdaptiveRateLimiter(f"{section}:{name}", **settings)
+
+    def get(self, section: str, name: str):
+        # Return the shared limiter of a portal ('portals') or domain backend ('domain_backends')
+        if not self.enabled:
+            return None
+        with self._lock:
+            key = (section, name)
+            if key not in self.limiters:
+                self.limiters[key] = self._create(section, name)
+            return self.limiters[key]
+
+    def log_rates(self):
+        # Log the rate every limiter settled on during the run
+        for limiter in self.limiters.values():
+            logger.info(f"Rate limiter '{limiter.name}' final rate: {limiter.rate:.2f} requests/s.")
@@ -7,21 +7,25 @@ Module: modules/reporting/csv_report_generator.py
 
 Description:
 This module defines the CSVReportGenerator class, which handles the creation of
-CSV reports. It writes headers and data to a CSV file based on the provided results
-and supports dynamic data formatting for domain availability checks.
+CSV reports. It writes the headers when the report is opened and appends one row
+per company as results arrive, flushing each row so the file can be read during a run.
 """
 
 import csv
 from typing import List
 from pathlib import Path
 from utils.logger import logger
+from modules.result_record import CompanyResult
 
 
 # Define a class for generating CSV reports
 class CSVReportGenerator:
-    def __init__(self, domain_zones: List[str], state: str):
+    def __init__(self, domain_zones: List[str], states: List[str]):
         self.domain_zones = domain_zones
-        self.state = state
+        self.states = states
+        self.state = ", ".join(states)
+        self._file = None
+        self._csv_writer = None
 
     def _write_header(self, csv_writer, headers: List[str]):
         try:
@@ -31,39 +35,46 @@ class CSVReportGenerator:
             logger.error(f"Error while writing CSV header: {e}")
             raise
 
-    def _write_data(self, csv_writer, results: List[List[str]]):
-        logger.info("Writing data to CSV")
-        try:
-            # Iterate through the results and write data to the CSV file
-            for result_lines in results:
-                company_data = [result_lines[0].replace('Company: ', ''), self.state,
-                                result_lines[1].split(': ')[1]]
+    def _row_data(self, result: CompanyResult) -> List[str]:
+        # One BNS column per checked state, then one column per domain zone
+        company_data = [result.company, self.state]
+        company_data.extend(result.bns[state].text if state in result.bns else '' for state in self.states)
+        company_data.extend(result.domains[zone].text if zone in result.domains else ''
+                            for zone in self.domain_zones)
+        return company_data
+
+    def open(self, report_name: str, headers: List[str]):
+        logger.info(f"Saving CSV report to {report_name}")
+        report_path = Path(report_name)
+        # Check if the report name has a file extension, if not, add .csv extension
+        if not report_path.suffix:
+            report_path = report_path.with_suffix('.csv')
 
-                for domain_zone in self.domain_zones:
-                    for line in result_lines[2:]:
-                        if f"{domain_zone}" in line:
-                            dynamic_value = line.split(': ')[1]
-                            company_data.append(dynamic_value)
-                            break
+        self._file = report_path.open(mode='w', newline='', encoding='utf-8')
+        self._csv_writer = csv.writer(self._file)
+        self._write_header(self._csv_writer, headers)
+        self._file.flush()
 
-                csv_writer.writerow(company_data)
+    def write_row(self, result: CompanyResult):
+        try:
+            # Append the company and flush it, so the report can be read while the run goes on
+            self._csv_writer.writerow(self._row_data(result))
+            self._file.flush()
         except Exception as e:
             logger.error(f"Error while writing data to CSV: {e}")
             raise
 
-    def save_csv(self, report_name: str, results: List[List[str]], headers: List[str]):
-        try:
-            logger.info(f"Saving CSV report to {report_name}")
-            report_path = Path(report_name)
-            # Check if the report name has a file extension, if not, add .csv extension
-            if not report_path.suffix:
-                report_path = report_path.with_suffix('.csv')
-
-            with report_path.open(mode='w', newline='', encoding='utf-8') as file:
-                csv_writer = csv.writer(file)
-                self._write_header(csv_writer, headers)
-                self._write_data(csv_writer, results)
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
 
+    def save_csv(self, report_name: str, results: List[CompanyResult], headers: List[str]):
+        try:
+            self.open(report_name, headers)
+            logger.info("Writing data to CSV")
+            for result in results:
+                self.write_row(result)
         except PermissionError:
             logger.error(
                 f"Permission denied: Unable to save the CSV report to {report_name}")
@@ -71,8 +82,10 @@ class CSVReportGenerator:
             logger.error(f"IO Error occurred: {e}")
         except Exception as e:
             logger.error(f"Unexpected error while saving the CSV report: {e}")
+        finally:
+            self.close()
 
-    def generate_csv_report(self, report_name: str, results: List[List[str]],
+    def generate_csv_report(self, report_name: str, results: List[CompanyResult],
                             headers: List[str]):
         logger.info(f"Starting CSV report generation for {report_name}")
         self.save_csv(report_name, results, headers)
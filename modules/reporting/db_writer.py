@@ -0,0 +1,160 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/reporting/db_writer.py
+
+Description:
+This module defines the DatabaseReportGenerator class, which writes the results straight
+into a database through any DB-API connection, SQLite by default. The schema is normalized
+into companies, BNS checks and domain checks. Rows are sent with executemany in batched
+transactions and upserted on (company, state) and (company, zone), so each table keeps the
+latest check of a company and the tables can be queried during a run.
+"""
+
+import importlib
+from pathlib import Path
+from typing import Dict, List
+from utils.logger import logger
+from modules.result_record import CompanyResult
+
+# Normalized schema, portable across SQLite, PostgreSQL and MySQL
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS companies (
+        name VARCHAR(255) NOT NULL PRIMARY KEY,
+        states VARCHAR(255),
+        checked_at DOUBLE PRECISION
+    )""",
+    """CREATE TABLE IF NOT EXISTS bns_checks (
+        company VARCHAR(255) NOT NULL,
+        state VARCHAR(16) NOT NULL,
+        status VARCHAR(32),
+        checked_at DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (company, state)
+    )""",
+    """CREATE TABLE IF NOT EXISTS domain_checks (
+        company VARCHAR(255) NOT NULL,
+        zone VARCHAR(32) NOT NULL,
+        domain VARCHAR(255),
+        status VARCHAR(32),
+        price DOUBLE PRECISION,
+        price_text VARCHAR(64),
+        checked_at DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (company, zone)
+    )"""
+]
+
+# Columns and upsert keys of each table
+TABLES = {
+    "companies": (("name", "states", "checked_at"), ("name",)),
+    "bns_checks": (("company", "state", "status", "checked_at"), ("company", "state")),
+    "domain_checks": (("company", "zone", "domain", "status", "price", "price_text", "checked_at"),
+                      ("company", "zone"))
+}
+
+# DB-API drivers that use MySQL's upsert syntax
+MYSQL_DRIVERS = ("pymysql", "MySQLdb", "mysql.connector")
+
+
+class DatabaseReportGenerator:
+    def __init__(self, connection, states: List[str], paramstyle: str = "qmark", dialect: str = "sqlite",
+                 batch_size: int = 1000):
+        self.connection = connection  # Open DB-API connection.
+        self.states = states
+        self.paramstyle = paramstyle  # DB-API paramstyle of the driver.
+        self.dialect = dialect  # 'mysql' for ON DUPLICATE KEY, ON CONFLICT otherwise.
+        self.batch_size = max(1, batch_size)  # Companies per transaction.
+        self.statements = {table: self._upsert_statement(table) for table in TABLES}
+        self._batch = {table: [] for table in TABLES}
+        self._companies = 0  # Companies waiting in the current batch.
+        self.rows_written = 0
+
+    @classmethod
+    def from_config(cls, database_config: Dict[str, any], states: List[str], default_path: str):
+        # Connect through the configured DB-API driver, a SQLite file by default
+        driver = database_config.get('driver', 'sqlite3')
+        module = importlib.import_module(driver)
+        connect_args = dict(database_config.get('connect') or {})
+        if driver == 'sqlite3':
+            database_path = Path(database_config.get('path') or default_path)
+            database_path.parent.mkdir(parents=True, exist_ok=True)
+            connect_args.setdefault('database', str(database_path))
+            connect_args.setdefault('check_same_thread', False)
+        connection = module.connect(**connect_args)
+        if driver == 'sqlite3':
+            # WAL lets other processes read the tables while the run is writing them
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+        logger.info(f"Writing results to database via {driver} ({connect_args.get('database', '')}).")
+        return cls(connection, states, getattr(module, 'paramstyle', 'qmark'),
+                   'mysql' if driver in MYSQL_DRIVERS else 'sqlite',
+                   database_config.get('batch_size', 1000))
+
+    def _placeholders(self, count: int) -> str:
+        if self.paramstyle == "qmark":
+            return ", ".join("?" * count)
+        if self.paramstyle in ("format", "pyformat"):
+            return ", ".join(["%s"] * count)
+        if self.paramstyle == "numeric":
+            return ", ".join(f":{index}" for index in range(1, count + 1))
+        raise ValueError(f"Unsupported DB-API paramstyle: {self.paramstyle}")
+
+    def _upsert_statement(self, table: str) -> str:
+        columns, keys = TABLES[table]
+        updates = [column for column in columns if column not in keys]
+        insert = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({self._placeholders(len(columns))})"
+        if self.dialect == "mysql":
+            return insert + " ON DUPLICATE KEY UPDATE " + ", ".join(
+                f"{column} = VALUES({column})" for column in updates)
+        return insert + f" ON CONFLICT ({', '.join(keys)}) DO UPDATE SET " + ", ".join(
+            f"{column} = excluded.{column}" for column in updates)
+
+    def open(self):
+        cursor = self.connection.cursor()
+        try:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+            self.connection.commit()
+        finally:
+            cursor.close()
+
+    def write_row(self, result: CompanyResult):
+        self._batch["companies"].append((result.company, ", ".join(self.states), result.checked_at))
+        for bns in result.bns.values():
+            self._batch["bns_checks"].append((result.company, bns.state, bns.status.value, bns.checked_at))
+        for domain in result.domains.values():
+            self._batch["domain_checks"].append((result.company, domain.zone, domain.domain, domain.status.value,
+                                                 domain.price, domain.price_text, domain.checked_at))
+        self._companies += 1
+        if self._companies >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        # Send the batch with executemany in one transaction
+        if not self._companies:
+            return
+        cursor = self.connection.cursor()
+        try:
+            for table, rows in self._batch.items():
+                if rows:
+                    cursor.executemany(self.statements[table], rows)
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Error writing results to the database: {e}")
+            raise
+        finally:
+            cursor.close()
+        self.rows_written += self._companies
+        self._batch = {table: [] for table in TABLES}
+        self._companies = 0
+
+    def close(self):
+        if self.connection is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+            self.connection = None
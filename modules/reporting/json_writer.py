@@ -7,8 +7,9 @@ Module: modules/reporting/json_writer.py
 
 Description:
 This module defines the JSONReportGenerator class, which handles the creation of
-JSON reports. It allows adding data as dictionaries to an internal list and
-saves the list to a JSON file with proper formatting.
+JSON reports. Each company is written to the file as soon as it is added, either as
+an element of a JSON array or, in JSON Lines mode, as one object per line that can
+be read while the run is still going.
 """
 
 import json
@@ -18,27 +19,55 @@ from utils.logger import logger
 
 # Define a class for generating JSON reports
 class JSONReportGenerator:
-    def __init__(self):
-        self.data = []
+    def __init__(self, json_lines: bool = False):
+        self.json_lines = json_lines  # Write one object per line instead of an array.
+        self._file = None
+        self._count = 0
+
+    def open(self, report_name):
+        # Check if the report name has a file extension, if not, add .json or .jsonl extension
+        logger.info(f"Saving JSON report to {report_name}")
+        report_path = Path(report_name)
+        if not report_path.suffix:
+            report_path = report_path.with_suffix('.jsonl' if self.json_lines else '.json')
+
+        self._file = report_path.open(mode='w', encoding='utf-8')
+        self._count = 0
+        if not self.json_lines:
+            self._file.write("[")
 
     def add_data(self, data_dict):
-        # Add data in the form of a dictionary to the internal data list
-        self.data.append(data_dict)
+        # Serialize the dictionary and append it to the file right away
+        if self.json_lines:
+            self._file.write(json.dumps(data_dict, ensure_ascii=False) + "\n")
+        else:
+            separator = "," if self._count else ""
+            entry = json.dumps(data_dict, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+            self._file.write(f"{separator}\n    {entry}")
+        self._count += 1
+        self._file.flush()
+
+    def close(self):
+        # Close the array; in JSON Lines mode every line is already complete
+        if self._file is None:
+            return
+        try:
+            if not self.json_lines:
+                self._file.write("\n]" if self._count else "]")
+        finally:
+            self._file.close()
+            self._file = None
 
-    def save_json(self, report_name):
+    def save_json(self, report_name, data):
         try:
-            # Check if the report name has a file extension, if not, add .json extension
-            logger.info(f"Saving JSON report to {report_name}")
-            report_path = Path(report_name)
-            if not report_path.suffix:
-                report_path = report_path.with_suffix('.json')
-
-            with report_path.open(mode='w', encoding='utf-8') as file:
-                # Serialize the data list to JSON format and save it to the file
-                json.dump(self.data, file, ensure_ascii=False, indent=4)
+            self.open(report_name)
+            for data_dict in data:
+                self.add_data(data_dict)
         except PermissionError:
             logger.error(f"Permission denied: Unable to save the JSON report to {report_name}")
         except IOError as e:
             logger.error(f"IO Error occurred: {e}")
         except Exception as e:
             logger.error(f"Unexpected error while saving the JSON report: {e}")
+        finally:
+            self.close()
@@ -0,0 +1,66 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/reporting/ordered_emitter.py
+
+Description:
+This module defines the OrderedEmitter class, which passes results to a report writer
+in input order while companies finish out of order. Results that arrive early wait in
+a bounded buffer; once it is full, reading new companies pauses until the rows ahead
+of them are written.
+"""
+
+import threading
+from typing import Any, Callable, Optional
+from utils.logger import logger
+
+
+class OrderedEmitter:
+    def __init__(self, write_row: Callable[[Any], None], capacity: int = 1000):
+        self.write_row = write_row  # Called with each result in input order.
+        self.capacity = max(1, capacity)  # Companies read but not yet written.
+        self.next_index = 0  # Input position of the next row to write.
+        self.reserved = 0  # Input positions handed out so far.
+        self._buffer = {}  # Input position -> result that arrived early.
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+
+    def reserve(self, timeout: Optional[float] = None) -> Optional[int]:
+        # Hand out the next input position, waiting while the buffer is full (None after the timeout)
+        if not self._slots.acquire(timeout=timeout):
+            return None
+        with self._lock:
+            index = self.reserved
+            self.reserved += 1
+        return index
+
+    def add(self, index: int, result: Any) -> None:
+        # Store the result; None marks a company without a result, which is skipped
+        with self._lock:
+            self._buffer[index] = result
+            self._flush()
+
+    def _flush(self):
+        # Write every buffered row that continues the input order
+        while self.next_index in self._buffer:
+            result = self._buffer.pop(self.next_index)
+            self.next_index += 1
+            try:
+                if result is not None:
+                    self.write_row(result)
+            finally:
+                self._slots.release()
+
+    def close(self) -> None:
+        # Write the rows still waiting for an earlier company that never finished
+        with self._lock:
+            missing = self.reserved - self.next_index - len(self._buffer)
+            if missing:
+                logger.warning(f"{missing} companies did not finish and are missing from the report.")
+            for index in sorted(self._buffer):
+                result = self._buffer.pop(index)
+                if result is not None:
+                    self.write_row(result)
+            self.next_index = self.reserved
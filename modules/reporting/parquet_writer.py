@@ -0,0 +1,116 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/reporting/parquet_writer.py
+
+Description:
+This module defines the ParquetReportGenerator class, which writes columnar reports
+with pyarrow, either as Parquet or as an Arrow IPC file. Every BNS state and domain zone
+gets typed columns (status, numeric price, check time), and rows are collected into
+row groups that are written out as the results stream in.
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+import pyarrow as pa
+import pyarrow.parquet as pq
+from utils.logger import logger
+from modules.reporting.report_columns import zone_column
+from modules.result_record import CompanyResult
+
+# Timestamps are stored in microseconds, in UTC
+TIMESTAMP_TYPE = pa.timestamp('us', tz='UTC')
+
+
+class ParquetReportGenerator:
+    def __init__(self, domain_zones: List[str], states: List[str], file_format: str = 'parquet',
+                 row_group_size: int = 10000, compression: str = 'snappy'):
+        self.domain_zones = domain_zones
+        self.states = states
+        self.state = ", ".join(states)
+        self.file_format = file_format  # 'parquet' or 'arrow' (Arrow IPC file).
+        self.row_group_size = max(1, row_group_size)  # Rows buffered per row group.
+        self.compression = compression
+        self.schema = self._build_schema()
+        self._columns = {name: [] for name in self.schema.names}
+        self._rows = 0  # Rows waiting for the next row group.
+        self._writer = None
+        self._sink = None
+
+    def _bns_prefix(self, state: str) -> str:
+        return "bns" if len(self.states) == 1 else f"bns_{state.lower()}"
+
+    def _build_schema(self) -> pa.Schema:
+        fields = [pa.field("company", pa.string()),
+                  pa.field("state", pa.string()),
+                  pa.field("checked_at", TIMESTAMP_TYPE)]
+        for state in self.states:
+            fields.append(pa.field(f"{self._bns_prefix(state)}_status", pa.string()))
+        for zone in self.domain_zones:
+            # One group of columns per domain zone, e.g., com_domain, com_status, com_price
+            column = zone_column(zone)
+            fields.extend([pa.field(f"{column}_domain", pa.string()),
+                           pa.field(f"{column}_status", pa.string()),
+                           pa.field(f"{column}_price", pa.float64()),
+                           pa.field(f"{column}_price_text", pa.string())])
+        return pa.schema(fields)
+
+    def open(self, report_name: str):
+        report_path = Path(report_name)
+        if not report_path.suffix:
+            report_path = report_path.with_suffix('.arrow' if self.file_format == 'arrow' else '.parquet')
+        logger.info(f"Saving {self.file_format} report to {report_path}")
+        if self.file_format == 'arrow':
+            self._sink = pa.OSFile(str(report_path), 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+        else:
+            self._writer = pq.ParquetWriter(str(report_path), self.schema, compression=self.compression)
+
+    def write_row(self, result: CompanyResult):
+        columns = self._columns
+        columns["company"].append(result.company)
+        columns["state"].append(self.state)
+        columns["checked_at"].append(datetime.fromtimestamp(result.checked_at, timezone.utc))
+        for state in self.states:
+            bns = result.bns.get(state)
+            columns[f"{self._bns_prefix(state)}_status"].append(bns.status.value if bns else None)
+        for zone in self.domain_zones:
+            domain = result.domains.get(zone)
+            column = zone_column(zone)
+            columns[f"{column}_domain"].append(domain.domain if domain else None)
+            columns[f"{column}_status"].append(domain.status.value if domain else None)
+            columns[f"{column}_price"].append(domain.price if domain else None)
+            columns[f"{column}_price_text"].append(domain.price_text if domain else None)
+
+        self._rows += 1
+        if self._rows >= self.row_group_size:
+            self._write_row_group()
+
+    def _write_row_group(self):
+        # Write the buffered rows as one row group (record batch) and start a new buffer
+        if not self._rows:
+            return
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(self._columns[field.name], type=field.type) for field in self.schema],
+            schema=self.schema)
+        if self.file_format == 'arrow':
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write_batch(batch, row_group_size=self._rows)
+        self._columns = {name: [] for name in self.schema.names}
+        self._rows = 0
+
+    def close(self):
+        if self._writer is None:
+            return
+        try:
+            self._write_row_group()
+        finally:
+            self._writer.close()
+            self._writer = None
+            if self._sink is not None:
+                self._sink.close()
+                self._sink = None
@@ -0,0 +1,25 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/reporting/report_columns.py
+
+Description:
+This module provides the column helpers shared by the report writers. A single state
+keeps the plain BNS column, several states get one BNS column per state.
+"""
+
+from typing import List
+
+
+# Define a function to build the BNS column names for the checked states
+def bns_headers(states: List[str], title: str = "BNS Status", separator: str = " ") -> List[str]:
+    if len(states) == 1:
+        return [title]
+    return [f"{title}{separator}{state}" for state in states]
+
+
+# Define a function to turn a domain zone into a column name, e.g., ".co.uk" -> "co_uk"
+def zone_column(zone: str) -> str:
+    return zone.lstrip('.').replace('.', '_')
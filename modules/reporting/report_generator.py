@@ -7,144 +7,191 @@ Module: modules/reporting/report_generator.py
 
 Description:
 This module defines the ReportGenerator class, which handles the creation of reports
-in various formats, including XLS, CSV, JSON, XML, TXT, and SQL. It generates reports
-based on the configuration parameters and processed results.
+in various formats, including XLS, XLSX, CSV, JSON, JSONL, XML, TXT, SQL, Parquet and Arrow, or
+writes it into a database (SQLite or another DB-API driver). A report is
+opened once, receives each company with write_row as soon as it is finished, and is
+completed with close; generate_report writes a complete list of results at once. Only
+the writer of the selected format is imported, together with its dependencies.
 """
 
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Union
 from datetime import datetime
-from modules.reporting.xls_writer import XLSReportGenerator
-from modules.reporting.xml_writer import XMLReportGenerator
-from modules.reporting.json_writer import JSONReportGenerator
-from modules.reporting.csv_writer import CSVReportGenerator
-from modules.reporting.sql_writer import SQLReportGenerator
+from modules.reporting.report_columns import bns_headers
+from modules.result_record import CompanyResult
+from modules.metrics import METRICS
 from utils.logger import logger
 
 
 # Define a class for generating reports in various formats
 class ReportGenerator:
-    def __init__(self, config_params: Dict[str, any], results_list: List[List[str]],state_abbr_param: str):
+    def __init__(self, config_params: Dict[str, any], results_list: List[CompanyResult],
+                 state_abbr_param: Union[str, List[str]]):
         self.config_data = config_params
-        self.state_abbr = state_abbr_param
+        # One state abbreviation or the list of states checked in the run
+        self.states = [state_abbr_param] if isinstance(state_abbr_param, str) else list(state_abbr_param)
+        self.state_abbr = ", ".join(self.states)
         self.result_data = results_list
+        self.report_format = None
+        self.rows_written = 0
+        self._writer = None  # Format writer of the open report.
+        self._write = None  # Writes one company to the open report.
         self.report_filename = Path(self.config_data.get('reports_directory',
                                                          'reports')) / f"{self.config_data.get('report_filename', 'result')}_{datetime.now().strftime('%d_%m_%Y')}"
 
-    def generate_report(self) -> None:
+    def open(self) -> None:
         # Determine the output format for the report
-        report_format = self.config_data.get('output_format', 'txt').lower()
-        logger.info(f"Generating report in {report_format} format.")
+        self.report_format = self.config_data.get('output_format', 'txt').lower()
+        logger.info(f"Generating report in {self.report_format} format.")
 
-        # Define methods for generating reports in different formats
+        # Define methods for opening reports in different formats
         report_methods = {
-            'xls': self._generate_xls_report,
-            'xml': self._generate_xml_report,
-            'json': self._generate_json_report,
-            'txt': self._generate_txt_report,
-            'csv': self._generate_csv_report,
-            'sql': self._generate_sql_report
+            'xls': self._open_xls_report,
+            'xlsx': self._open_xlsx_report,
+            'xml': self._open_xml_report,
+            'json': self._open_json_report,
+            'jsonl': self._open_jsonl_report,
+            'txt': self._open_txt_report,
+            'csv': self._open_csv_report,
+            'sql': self._open_sql_report,
+            'parquet': self._open_parquet_report,
+            'arrow': self._open_arrow_report,
+            'sqlite': self._open_database_report,
+            'database': self._open_database_report
         }
 
-        # Get the appropriate report generation method based on the format
-        generate_method = report_methods.get(report_format, self._generate_txt_report)
-        try:
-            generate_method()
-        except Exception as e:
-            logger.error(f"Error generating {report_format.upper()} report: {e}")
-            raise
-
-    def _generate_xls_report(self):
-        try:
-            logger.info("Generating XLS report.")
-            state_abbr_param = self.config_data.get('state_portal_abbr', 'Unknown')
-            report_generator = XLSReportGenerator(self.config_data['domain_zones'],
-                                                  state_abbr_param)
-            report_generator.write_report(str(self.report_filename), self.result_data)
-        except Exception as e:
-            logger.error(f"Error generating XLS report: {e}")
-            raise
-
-    def _generate_csv_report(self):
+        # Get the appropriate report method based on the format
+        open_method = report_methods.get(self.report_format, self._open_txt_report)
         try:
-            logger.info("Generating CSV report.")
-            csv_filename = f"{str(self.report_filename)}.csv"
-            state = self.config_data.get('state_portal_abbr', 'Unknown')
-            headers = ["Company", "State", "BNS Status"] + self.config_data.get(
-                'domain_zones', [])
-            csv_report_generator = CSVReportGenerator(
-                self.config_data.get('domain_zones', []), state)
-            csv_report_generator.generate_csv_report(csv_filename, self.result_data,
-                                                     headers)
+            open_method()
         except Exception as e:
-            logger.error(f"Error generating CSV report: {e}")
+            logger.error(f"Error generating {self.report_format.upper()} report: {e}")
             raise
 
-    def _generate_json_report(self):
+    def write_row(self, result: CompanyResult) -> None:
+        # Append one company to the open report
         try:
-            logger.info("Generating JSON report.")
-            state = self.config_data.get('state_portal_abbr', 'Unknown')
-            json_generator = JSONReportGenerator()
-
-            for result_lines in self.result_data:
-                data_dict = {
-                    "Company": result_lines[0].replace('Company: ', ''),
-                    "State": state,
-                    "BNS status": result_lines[1].split(': ')[1],
-                    "Domains": {}
-                }
-                for domain_info in result_lines[2:]:
-                    domain, status = domain_info.split(': ', 1)
-                    data_dict["Domains"][domain.strip()] = status.strip()
-                json_generator.add_data(data_dict)
-            json_generator.save_json(self.report_filename.with_suffix('.json'))
+            with METRICS.span("report_write"):
+                self._write(result)
+            self.rows_written += 1
         except Exception as e:
-            logger.error(f"Error generating JSON report: {e}")
+            logger.error(f"Error writing {self.report_format.upper()} report row: {e}")
             raise
 
-    def _generate_sql_report(self):
-        try:
-            logger.info("Generating SQL report.")
-            sql_filename = f"{str(self.report_filename)}.sql"
-            state = self.config_data.get('state_portal_abbr', 'Unknown')
-            sql_report_generator = SQLReportGenerator(state)
-            sql_report_generator.generate_sql_report(sql_filename, self.result_data)
-        except Exception as e:
-            logger.error(f"Error generating SQL report: {e}")
-            raise
+    def close(self) -> None:
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            with METRICS.span("report_close"):
+                writer.close()
+            logger.info(f"Report finished with {self.rows_written} companies.")
 
-    def _generate_xml_report(self):
+    def generate_report(self) -> None:
+        # Write a complete list of results in one go
+        self.open()
         try:
-            logger.info("Generating XML report.")
-            state = self.config_data.get('state_portal_abbr', 'Unknown')
-            xml_writer = XMLReportGenerator(str(self.report_filename), state=state)
-            modified_data = [
-                [f"Company: {line[0]}",
-                 f"State: {state}",
-                 f"BNS Status: {line[1]}",
-                 *line[2:]] for line in self.result_data]
-
-            xml_writer.write_to_xml(modified_data)
-        except Exception as e:
-            logger.error(f"Error generating XML report: {e}")
-            raise
+            for result in self.result_data:
+                self.write_row(result)
+        finally:
+            self.close()
+
+    def _open_xls_report(self):
+        logger.info("Generating XLS report.")
+        from modules.reporting.xls_writer import XLSReportGenerator
+        self._writer = XLSReportGenerator(self.config_data['domain_zones'], self.states)
+        self._writer.open(str(self.report_filename))
+        self._write = self._writer.write_row
+
+    def _open_xlsx_report(self):
+        logger.info("Generating XLSX report.")
+        from modules.reporting.xlsx_writer import XLSXReportGenerator
+        self._writer = XLSXReportGenerator(self.config_data['domain_zones'], self.states)
+        self._writer.open(str(self.report_filename))
+        self._write = self._writer.write_row
+
+    def _open_csv_report(self):
+        logger.info("Generating CSV report.")
+        from modules.reporting.csv_writer import CSVReportGenerator
+        csv_filename = f"{str(self.report_filename)}.csv"
+        headers = ["Company", "State"] + bns_headers(self.states) + self.config_data.get(
+            'domain_zones', [])
+        self._writer = CSVReportGenerator(self.config_data.get('domain_zones', []), self.states)
+        self._writer.open(csv_filename, headers)
+        self._write = self._writer.write_row
+
+    def _json_data(self, result: CompanyResult) -> Dict[str, any]:
+        bns_statuses = {state: bns.text for state, bns in result.bns.items()}
+        return {
+            "Company": result.company,
+            "State": self.state_abbr,
+            # A single status for one state, the status per state for several
+            "BNS status": bns_statuses.get(self.states[0]) if len(self.states) == 1 else bns_statuses,
+            "Domains": {domain.domain: domain.text for domain in result.domains.values()}
+        }
 
-    def _generate_txt_report(self):
+    def _open_json_report(self, json_lines: bool = False):
+        logger.info(f"Generating {'JSONL' if json_lines else 'JSON'} report.")
+        from modules.reporting.json_writer import JSONReportGenerator
+        self._writer = JSONReportGenerator(json_lines)
+        self._writer.open(self.report_filename.with_suffix('.jsonl' if json_lines else '.json'))
+        self._write = lambda result: self._writer.add_data(self._json_data(result))
+
+    def _open_jsonl_report(self):
+        # One JSON object per line, readable while the run is still going
+        self._open_json_report(json_lines=True)
+
+    def _open_sql_report(self):
+        logger.info("Generating SQL report.")
+        from modules.reporting.sql_writer import SQLReportGenerator
+        sql_filename = f"{str(self.report_filename)}.sql"
+        self._writer = SQLReportGenerator(self.states)
+        self._writer.open(sql_filename)
+        self._write = self._writer.write_row
+
+    def _open_xml_report(self):
+        logger.info("Generating XML report.")
+        from modules.reporting.xml_writer import XMLReportGenerator
+        self._writer = XMLReportGenerator(str(self.report_filename), states=self.states)
+        self._writer.open()
+        self._write = self._writer.write_company
+
+    def _open_parquet_report(self, file_format: str = 'parquet'):
+        logger.info(f"Generating {file_format.upper()} report.")
+        # pyarrow is only needed for the columnar formats, so it is imported here
         try:
-            logger.info("Generating TXT report.")
-            txt_filename = f"{str(self.report_filename)}.txt"
-            state = self.config_data.get('state_portal_abbr', 'Unknown')
-
-            with open(txt_filename, 'w', encoding='utf-8') as file:
-                for result_lines in self.result_data:
-                    file.write(result_lines[0] + "\n")
-                    file.write(f"State: {state}\n")
-                    for line in result_lines[1:]:
-                        file.write(line + "\n")
-                    file.write("\n")
-        except Exception as e:
-            logger.error(f"Error generating TXT report: {e}")
-            raise
+            from modules.reporting.parquet_writer import ParquetReportGenerator
+        except ImportError as e:
+            raise ImportError(f"The {file_format} output format requires pyarrow (pip install pyarrow): {e}")
+        parquet_config = self.config_data.get('parquet', {})
+        self._writer = ParquetReportGenerator(self.config_data.get('domain_zones', []), self.states, file_format,
+                                              parquet_config.get('row_group_size', 10000),
+                                              parquet_config.get('compression', 'snappy'))
+        self._writer.open(str(self.report_filename))
+        self._write = self._writer.write_row
+
+    def _open_arrow_report(self):
+        # Arrow IPC file with the same columns as the Parquet report
+        self._open_parquet_report('arrow')
+
+    def _open_database_report(self):
+        logger.info("Writing report to database.")
+        from modules.reporting.db_writer import DatabaseReportGenerator
+        # One database across runs (no date in the name), so re-runs upsert into the same tables
+        default_path = Path(self.config_data.get('reports_directory', 'reports')) / \
+            f"{self.config_data.get('report_filename', 'result')}.sqlite"
+        database_config = dict(self.config_data.get('database', {}))
+        if self.report_format == 'sqlite':
+            database_config['driver'] = 'sqlite3'
+        self._writer = DatabaseReportGenerator.from_config(database_config, self.states, str(default_path))
+        self._writer.open()
+        self._write = self._writer.write_row
+
+    def _open_txt_report(self):
+        logger.info("Generating TXT report.")
+        from modules.reporting.txt_writer import TXTReportGenerator
+        txt_filename = f"{str(self.report_filename)}.txt"
+        self._writer = TXTReportGenerator(self.states)
+        self._writer.open(txt_filename)
+        self._write = self._writer.write_row
 
 
 # Example usage
@@ -8,57 +8,61 @@ Module: modules/reporting/sql_writer.py
 Description:
 This module defines the SQLReportGenerator class, which generates SQL reports based
 on the provided results. It formats the results into SQL INSERT statements, handling
-company names, business name status, and domain data.
+company names, business name status, and domain data, and appends one statement per
+company as results arrive.
 """
 
 from utils.logger import logger
 from typing import List
+from modules.reporting.report_columns import bns_headers, zone_column
+from modules.result_record import CompanyResult
 
 
 class SQLReportGenerator:
-    def __init__(self, state_abbr: str):
-        self.state_abbr = state_abbr  # Storing the state abbreviation.
+    def __init__(self, states: List[str]):
+        self.states = states  # Storing the checked states.
+        self.state_abbr = ", ".join(states)  # Storing the state abbreviations.
+        self.bns_columns = bns_headers(states, "BNS", "_")  # One BNS column per state.
+        self._file = None
 
-    def generate_sql_report(self, filename: str, results: List[List[str]]) -> None:
-        # Method to generate an SQL report.
-        try:
-            with open(filename, 'w', encoding='utf-8') as file:
-                # Writing to the specified file.
-                for result_lines in results:
-                    # Parsing each line of results.
-                    company_name = self._parse_info(result_lines[0])[1]  # Extracting the company name.
-                    bns_status = self._parse_info(result_lines[1])[1]  # Extracting the business name status.
-                    domain_data = result_lines[2:]  # Extracting the domain data.
-
-                    domain_columns = []
-                    domain_values = []
-                    for domain_info in domain_data:
-                        # Parsing each domain information line.
-                        domain_zone, domain_status = self._parse_info(domain_info)
-                        domain_columns.append(domain_zone)
-                        domain_values.append(self._escape_sql_value(domain_status))
+    def open(self, filename: str) -> None:
+        # Opening the report file; each company is appended as an INSERT statement.
+        self._file = open(filename, 'w', encoding='utf-8')
 
-                    # Constructing the SQL INSERT statement columns and values.
-                    columns = ['name', 'state', 'BNS'] + domain_columns
-                    values = [self._escape_sql_value(value) for value in
-                              [company_name, self.state_abbr, bns_status]] + domain_values
+    def write_row(self, result: CompanyResult) -> None:
+        try:
+            # Constructing the SQL INSERT statement columns and values from the record fields.
+            bns_columns = [column for column, state in zip(self.bns_columns, self.states) if state in result.bns]
+            bns_values = [result.bns[state].text for state in self.states if state in result.bns]
+            domain_columns = [zone_column(zone) for zone in result.domains]  # e.g., .com -> com
+            domain_values = [domain.text for domain in result.domains.values()]
 
-                    # Writing the SQL statement to the file.
-                    sql_statement = f"INSERT INTO companies ({', '.join(columns)}) VALUES ({', '.join(values)})"
-                    file.write(sql_statement + ";\n")
+            columns = ['name', 'state'] + bns_columns + domain_columns
+            values = [self._escape_sql_value(value) for value in
+                      [result.company, self.state_abbr] + bns_values + domain_values]
 
-                file.write("\n")  # Adding a new line at the end of the file.
+            # Writing the SQL statement to the file and flushing it for readers during the run.
+            sql_statement = f"INSERT INTO companies ({', '.join(columns)}) VALUES ({', '.join(values)})"
+            self._file.write(sql_statement + ";\n")
+            self._file.flush()
         except Exception as e:
             logger.error(f"Error generating SQL report: {e}", exc_info=True)
             raise
 
-    @staticmethod
-    def _parse_info(info: str) -> (str, str):
-        # Static method to parse information from a string.
-        parts = info.split(': ')
-        domain = parts[0].strip()
-        zone = domain.split('.')[-1]  # Extracting the domain zone (e.g., .com, .net).
-        return f".{zone}", parts[1].strip()  # Returning the domain zone and the second part of the split.
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.write("\n")  # Adding a new line at the end of the file.
+            self._file.close()
+            self._file = None
+
+    def generate_sql_report(self, filename: str, results: List[CompanyResult]) -> None:
+        # Method to generate an SQL report from a complete list of results.
+        self.open(filename)
+        try:
+            for result in results:
+                self.write_row(result)
+        finally:
+            self.close()
 
     @staticmethod
     def _escape_sql_value(value: str) -> str:
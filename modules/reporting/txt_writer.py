@@ -0,0 +1,42 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/reporting/txt_writer.py
+
+Description:
+This module defines the TXTReportGenerator class, which writes plain text reports.
+Each company block is appended and flushed as soon as its result arrives.
+"""
+
+from pathlib import Path
+from typing import List
+from utils.logger import logger
+from modules.result_record import CompanyResult
+
+
+class TXTReportGenerator:
+    def __init__(self, states: List[str]):
+        self.states = states
+        self.state = ", ".join(states)  # State abbreviations shown for every company.
+        self._file = None
+
+    def open(self, report_name: str):
+        logger.info(f"Saving TXT report to {report_name}")
+        self._file = Path(report_name).open('w', encoding='utf-8')
+
+    def write_row(self, result: CompanyResult):
+        lines = [f"Company: {result.company}", f"State: {self.state}"]
+        for state, bns in result.bns.items():
+            # One state keeps the plain label, several states name the state
+            label = "BNS status" if len(self.states) == 1 else f"BNS status {state}"
+            lines.append(f"{label}: {bns.text}")
+        lines.extend(f"{domain.domain}: {domain.text}" for domain in result.domains.values())
+        self._file.write("\n".join(lines) + "\n\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -7,13 +7,18 @@ Module: modules/reporting/xls_writer.py
 
 Description:
 This module defines the XLSReportGenerator class, which generates Excel reports using the xlwt library.
-It handles custom styling, writing data to the worksheet, and saving the workbook in the .xls format.
+It handles custom styling, writing data to the worksheet row by row, and saving the workbook in the .xls format.
 """
 
 import xlwt
 from typing import List
 from pathlib import Path
 from utils.logger import logger
+from modules.reporting.report_columns import bns_headers
+from modules.result_record import CheckStatus, BnsResult, DomainResult, CompanyResult
+
+# Number of rows after which the worksheet serializes its row data
+FLUSH_ROWS = 100
 
 
 # Define a class for managing custom Excel styles
@@ -69,17 +74,21 @@ class ExcelStyles:
 
 # Define a class for generating Excel reports
 class XLSReportGenerator:
-    def __init__(self, domain_zones: List[str], state_abbr: str):
+    def __init__(self, domain_zones: List[str], states: List[str]):
         self.domain_zones = domain_zones
-        self.state_abbr = state_abbr
+        self.states = states
+        self.state_abbr = ", ".join(states)
         self.wb = xlwt.Workbook() # Create a new Excel workbook
         self.styles = ExcelStyles(self.wb)  # Initialize custom styles for the workbook
+        self.report_name = None
+        self.worksheet = None
+        self.row_num = 0
 
     def _create_sheet(self):
         try:
             # Create a new worksheet in the workbook
             worksheet = self.wb.add_sheet('Results')
-            headers = ["Company Name", "State", "BNS Status"]
+            headers = ["Company Name", "State"] + bns_headers(self.states)
 
             # Add headers for each domain zone
             for zone in self.domain_zones:
@@ -95,45 +104,75 @@ class XLSReportGenerator:
             logger.error(f"Error during sheet creation: {e}")
             raise
 
-    def _write_data(self, worksheet, results: List[List[str]], headers: List[str]):
+    def _bns_style(self, bns: BnsResult):
+        # Green for free names, red for taken ones, plain when the portal gave no answer
+        if bns is None or bns.status.is_failure:
+            return self.styles.normal_style
+        return self.styles.green_style if bns.status.is_available else self.styles.red_style
+
+    def _write_row(self, worksheet, row_num: int, result: CompanyResult):
+        col_num = 0  # Start at the first column for each new row
+
+        # Write Company Name
+        worksheet.write(row_num, col_num, result.company, self.styles.normal_style)
+        col_num += 1
+
+        worksheet.write(row_num, col_num, self.state_abbr, self.styles.normal_style)
+        col_num += 1
+
+        # Write the BNS Status of every state without prefix
+        for state in self.states:
+            bns = result.bns.get(state)
+            worksheet.write(row_num, col_num, bns.text if bns else '', self._bns_style(bns))
+            col_num += 1
+
+        # Write Domains and Statuses
+        for domain in result.domains.values():
+            worksheet.write(row_num, col_num, domain.domain, self.styles.normal_style)
+            col_num += 1
+
+            # Determine the style for the status based on whether it has a price
+            cell_style = self.styles.orange_style if domain.price is not None else self.styles.normal_style
+            worksheet.write(row_num, col_num, domain.text, cell_style)
+            col_num += 1
+
+        # Adjust row height
+        worksheet.row(row_num).height_mismatch = True
+        worksheet.row(row_num).height = 20 * 40  # Set row height
+
+    def _write_data(self, worksheet, results: List[CompanyResult], headers: List[str]):
         logger.info("Writing data to the worksheet")
         try:
-            for row_num, result_lines in enumerate(results, start=1):
-                col_num = 0  # Start at the first column for each new row
-
-                # Write Company Name
-                company_name = result_lines[0].replace('Company: ', '')
-                worksheet.write(row_num, col_num, company_name, self.styles.normal_style)
-                col_num += 1
-
-                worksheet.write(row_num, col_num, self.state_abbr, self.styles.normal_style)
-                col_num += 1
-
-                # Write BNS Status without prefix
-                bns_status = result_lines[1].split(': ')[1]
-                cell_style = self.styles.red_style if 'Not Available' in bns_status else self.styles.green_style
-                worksheet.write(row_num, col_num, bns_status, cell_style)
-                col_num += 1
-
-                # Write Domains and Statuses
-                for domain_info in result_lines[2:]:
-                    domain, status = domain_info.split(': ')
-                    worksheet.write(row_num, col_num, domain, self.styles.normal_style)
-                    col_num += 1
-
-                    # Determine the style for the status based on whether it contains a price
-                    cell_style = self.styles.orange_style if "$" in status else self.styles.normal_style
-                    worksheet.write(row_num, col_num, status, cell_style)
-                    col_num += 1
-
-                # Adjust row height
-                worksheet.row(row_num).height_mismatch = True
-                worksheet.row(row_num).height = 20 * 40  # Set row height
+            for row_num, result in enumerate(results, start=1):
+                self._write_row(worksheet, row_num, result)
+        except Exception as e:
+            logger.error(f"Error while writing data to the worksheet: {e}")
+            raise
 
+    def open(self, report_name: str):
+        # Start the worksheet; rows are added one by one as results arrive
+        logger.info(f"Starting report generation for {report_name}")
+        self.report_name = report_name
+        self.worksheet, _ = self._create_sheet()
+        self.row_num = 0
+
+    def write_row(self, result: CompanyResult):
+        try:
+            self.row_num += 1
+            self._write_row(self.worksheet, self.row_num, result)
+            # Serialize finished rows so the workbook doesn't keep every cell object
+            if self.row_num % FLUSH_ROWS == 0:
+                self.worksheet.flush_row_data()
         except Exception as e:
             logger.error(f"Error while writing data to the worksheet: {e}")
             raise
 
+    def close(self):
+        # The xls format can only be written as a whole, so it is saved at the end
+        if self.worksheet is not None:
+            self.save_workbook(self.report_name)
+            self.worksheet = None
+
     def save_workbook(self, report_name: str):
         try:
             logger.info(f"Saving the workbook to {report_name}")
@@ -151,7 +190,7 @@ class XLSReportGenerator:
         except Exception as e:
             logger.error(f"Unexpected error while saving the workbook: {e}")
 
-    def write_report(self, report_name: str, results: List[List[str]]):
+    def write_report(self, report_name: str, results: List[CompanyResult]):
         logger.info(f"Starting report generation for {report_name}")
         ws, headers = self._create_sheet()
         self._write_data(ws, results, headers)
@@ -161,12 +200,14 @@ class XLSReportGenerator:
 # Example usage
 if __name__ == "__main__":
     try:
-        report_generator = XLSReportGenerator([".com", ".net", ".org"])
+        report_generator = XLSReportGenerator([".com", ".net", ".org"], ["NJ"])
         example_data = [
-            ["Company: Company1", "BNS Status: Available", ".com: $9.99",
-             ".net: Not Available", ".org: $14.99"],
-            ["Company: Company2", "BNS Status: Not Available", ".com: Taken",
-             ".net: Taken", ".org: Taken"]
+            CompanyResult("Company1", {"NJ": BnsResult("NJ", CheckStatus.AVAILABLE)},
+                          {".com": DomainResult.from_text("company1.com", ".com", "Available at $9.99"),
+                           ".net": DomainResult.from_text("company1.net", ".net", "Taken")}),
+            CompanyResult("Company2", {"NJ": BnsResult("NJ", CheckStatus.NOT_AVAILABLE)},
+                          {".com": DomainResult.from_text("company2.com", ".com", "Taken"),
+                           ".net": DomainResult.from_text("company2.net", ".net", "Taken")})
         ]
         report_generator.write_report("example_report", example_data)
         logger.info("Report generated successfully.")
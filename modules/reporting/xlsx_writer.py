@@ -0,0 +1,129 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/reporting/xlsx_writer.py
+
+Description:
+This module defines the XLSXReportGenerator class, which generates Excel reports in the
+.xlsx format using the xlsxwriter library. Rows are streamed to disk in constant memory
+mode, the cell formats are created once and shared by all cells, and column widths and
+row heights are set per sheet instead of per cell. The colors match the xls report.
+"""
+
+from pathlib import Path
+from typing import List
+import xlsxwriter
+from utils.logger import logger
+from modules.reporting.report_columns import bns_headers
+from modules.result_record import CompanyResult, BnsResult
+
+# Rows per worksheet; the xlsx format allows 1,048,576 including the header
+MAX_SHEET_ROWS = 1048575
+
+
+# Define a class for the shared xlsx cell formats
+class XLSXStyles:
+    def __init__(self, workbook):
+        # Same fonts, borders and colors as the ExcelStyles of the xls report
+        base = {'font_name': 'Times New Roman', 'font_size': 15, 'border': 1, 'valign': 'top'}
+        self.header_style = workbook.add_format(dict(base, bold=True, font_size=17))
+        self.normal_style = workbook.add_format(base)
+        self.red_style = workbook.add_format(dict(base, pattern=1, bg_color='#FFCCCC'))
+        self.green_style = workbook.add_format(dict(base, pattern=1, bg_color='#9BC280'))
+        self.orange_style = workbook.add_format(dict(base, pattern=1, bg_color='#FFCFA0'))
+
+
+# Define a class for generating xlsx reports
+class XLSXReportGenerator:
+    def __init__(self, domain_zones: List[str], states: List[str]):
+        self.domain_zones = domain_zones
+        self.states = states
+        self.state_abbr = ", ".join(states)
+        self.wb = None
+        self.styles = None
+        self.worksheet = None
+        self.sheet_count = 0
+        self.row_num = 0
+
+    def _headers(self) -> List[str]:
+        headers = ["Company Name", "State"] + bns_headers(self.states)
+        # Add headers for each domain zone
+        for zone in self.domain_zones:
+            headers.extend([zone, "Status"])
+        return headers
+
+    def _create_sheet(self):
+        # Start a new worksheet with the header row; sheet-wide widths and heights
+        self.sheet_count += 1
+        name = 'Results' if self.sheet_count == 1 else f'Results {self.sheet_count}'
+        self.worksheet = self.wb.add_worksheet(name)
+        headers = self._headers()
+        self.worksheet.set_column(0, len(headers) - 1, 20)
+        self.worksheet.set_default_row(40)
+        self.worksheet.set_row(0, 20)
+        self.worksheet.write_row(0, 0, headers, self.styles.header_style)
+        self.row_num = 0
+
+    def _bns_style(self, bns: BnsResult):
+        # Green for free names, red for taken ones, plain when the portal gave no answer
+        if bns is None or bns.status.is_failure:
+            return self.styles.normal_style
+        return self.styles.green_style if bns.status.is_available else self.styles.red_style
+
+    def open(self, report_name: str):
+        report_path = Path(report_name)
+        if not report_path.suffix:
+            report_path = report_path.with_suffix('.xlsx')
+        logger.info(f"Saving the workbook to {report_path}")
+        # constant_memory flushes every finished row to a temporary file
+        self.wb = xlsxwriter.Workbook(str(report_path), {'constant_memory': True})
+        self.styles = XLSXStyles(self.wb)
+        self._create_sheet()
+
+    def write_row(self, result: CompanyResult):
+        try:
+            if self.row_num >= MAX_SHEET_ROWS:
+                self._create_sheet()
+            self.row_num += 1
+            row, worksheet, styles = self.row_num, self.worksheet, self.styles
+
+            worksheet.write_string(row, 0, result.company, styles.normal_style)
+            worksheet.write_string(row, 1, self.state_abbr, styles.normal_style)
+            col_num = 2
+
+            # Write the BNS Status of every state
+            for state in self.states:
+                bns = result.bns.get(state)
+                worksheet.write_string(row, col_num, bns.text if bns else '', self._bns_style(bns))
+                col_num += 1
+
+            # Write Domains and Statuses, highlighting the statuses with a price
+            for domain in result.domains.values():
+                worksheet.write_string(row, col_num, domain.domain, styles.normal_style)
+                worksheet.write_string(row, col_num + 1, domain.text,
+                                       styles.orange_style if domain.price is not None else styles.normal_style)
+                col_num += 2
+        except Exception as e:
+            logger.error(f"Error while writing data to the worksheet: {e}")
+            raise
+
+    def close(self):
+        if self.wb is not None:
+            try:
+                self.wb.close()
+            except Exception as e:
+                logger.error(f"Unexpected error while saving the workbook: {e}")
+                raise
+            finally:
+                self.wb = None
+
+    def write_report(self, report_name: str, results: List[CompanyResult]):
+        logger.info(f"Starting report generation for {report_name}")
+        self.open(report_name)
+        try:
+            for result in results:
+                self.write_row(result)
+        finally:
+            self.close()
@@ -8,62 +8,75 @@ Module: modules/reporting/xml_writer.py
 Description:
 This module defines the XMLReportGenerator class, which generates XML reports based on the provided data.
 It creates an XML file with structured elements representing company information, including domain status
-and business name status.
+and business name status. Each company element is serialized and appended on its own, so the report is
+written incrementally instead of building one large tree.
 """
 
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import List
 from utils.logger import logger
+from modules.result_record import CheckStatus, BnsResult, CompanyResult
 
 
 class XMLReportGenerator:
-    def __init__(self, file_name: str, state: str):
+    def __init__(self, file_name: str, states: List[str]):
         self.file_name = file_name  # Name of the XML file to be created.
-        self.state = state  # State information to be included in the XML report.
+        self.states = states  # States checked in the run.
+        self.state = ", ".join(states)  # State information to be included in the XML report.
+        self._file = None
 
-    def write_to_xml(self, data: List[List[str]]):
-        # Method to write provided data into an XML file.
-        logger.info("Beginning data recording into XML file")
-        root = ET.Element("Companies")  # Creating the root element 'Companies'.
+    def open(self):
+        # Writing the XML declaration and the opening root tag 'Companies'.
+        xml_file_path = Path(f"{self.file_name}.xml")  # Defining the file path.
+        self._file = xml_file_path.open('w', encoding='utf-8')
+        self._file.write("<?xml version='1.0' encoding='utf-8'?>\n<Companies>")
+        self._file.flush()
+        logger.info(f"Beginning data recording into XML file {xml_file_path}")
+
+    def _company_element(self, result: CompanyResult) -> ET.Element:
+        # Creating a 'Company' element for one company in the data.
+        company_elem = ET.Element("Company")
+        ET.SubElement(company_elem, "Name").text = result.company
+        ET.SubElement(company_elem, "State").text = self.state
+        for state, bns in result.bns.items():
+            # The BNS status of one of several states keeps the state as an attribute.
+            attributes = {"state": state} if len(self.states) > 1 else {}
+            ET.SubElement(company_elem, "BNSStatus", attributes).text = bns.text
+        for domain in result.domains.values():
+            # Each domain is an element named after the domain itself.
+            ET.SubElement(company_elem, domain.domain).text = domain.text
+        return company_elem
 
-        for result_lines in data:
-            # Creating a 'Company' sub-element for each company in the data.
-            company_elem = ET.SubElement(root, "Company")
-            for line in result_lines:
-                try:
-                    if ":" not in line:
-                        tag = "Domain"  # Default tag for lines without ':'.
-                        text = line
-                    else:
-                        # Splitting the line into tag and text.
-                        parts = line.split(": ", 1)
-                        tag = parts[0].strip()
-                        text = parts[1].strip() if len(parts) > 1 else ""
-                        # Replacing specific strings in tags and texts.
-                        tag = tag.replace("Company", "").replace("BNS Status", "BNSStatus")
-                        text = text.replace("Company: ", "").replace("BNS status: ", "")
+    def write_company(self, result: CompanyResult):
+        # Serializing one company and appending it, so only one element is in memory at a time.
+        self._file.write(ET.tostring(self._company_element(result), encoding="unicode"))
+        self._file.flush()
 
-                    # Adding the tag and text to the company element.
-                    ET.SubElement(company_elem, tag or "Name").text = text
-                except ValueError as e:
-                    logger.error(f"Error in data format '{line}': {e}")
+    def close(self):
+        # Closing the root element; the file is a complete XML document from here on.
+        if self._file is not None:
+            self._file.write("</Companies>")
+            self._file.close()
+            self._file = None
+            logger.info(f"XML file successfully saved: {self.file_name}.xml")
 
+    def write_to_xml(self, data: List[CompanyResult]):
+        # Method to write provided data into an XML file.
         try:
-            # Generating the XML tree and saving it to a file.
-            tree = ET.ElementTree(root)
-            xml_file_path = Path(f"{self.file_name}.xml")  # Defining the file path.
-            tree.write(xml_file_path)  # Writing the XML tree to the file.
-            logger.info(f"XML file successfully saved: {xml_file_path}")
-        except ET.ParseError as e:
-            logger.error(f"Error while generating XML: {e}")
+            self.open()
+            for result in data:
+                self.write_company(result)
         except Exception as e:
             logger.error(f"Unexpected error while saving XML file: {e}")
+        finally:
+            self.close()
 
 
 # Example usage
 if __name__ == "__main__":
     # Creating an instance of XMLReportGenerator and writing sample data to an XML file.
-    xml_writer = XMLReportGenerator("report", state="NJ")
-    sample_data = [["Company: Company1", "Status: Active"], ["Company: Company2", "Status: Inactive"]]
+    xml_writer = XMLReportGenerator("report", states=["NJ"])
+    sample_data = [CompanyResult("Company1", {"NJ": BnsResult("NJ", CheckStatus.AVAILABLE)}),
+                   CompanyResult("Company2", {"NJ": BnsResult("NJ", CheckStatus.NOT_AVAILABLE)})]
     xml_writer.write_to_xml(sample_data)
@@ -0,0 +1,147 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/resource_blocker.py
+
+Description:
+This module defines the ResourceBlocker class, which stops Chrome from downloading
+images, media, fonts and known third-party hosts such as analytics and ads. The
+blocking profile is set globally and can be changed per portal or domain backend,
+including an allowlist of hosts and URL patterns a page needs to work. The blocked URL
+patterns are applied through the Chrome DevTools Protocol before each check.
+"""
+
+import threading
+from typing import Dict, List
+from utils.logger import logger
+
+# URL patterns blocked for each resource type
+RESOURCE_TYPE_PATTERNS = {
+    "block_images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp"],
+    "block_media": ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav", "*.m4a", "*.avi"],
+    "block_fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+}
+
+# Analytics, advertising and tracking hosts blocked by default
+DEFAULT_BLOCKED_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "bat.bing.com",
+    "nr-data.net",
+    "newrelic.com",
+    "optimizely.com",
+    "adnxs.com",
+    "criteo.com"
+]
+
+
+def _globs_overlap(first: str, second: str) -> bool:
+    # Whether some string matches both wildcard patterns, where '*' matches any run of characters
+    reachable = {(0, 0)}
+    pending = [(0, 0)]
+    while pending:
+        i, j = pending.pop()
+        if i == len(first) and j == len(second):
+            return True
+        steps = []
+        if i < len(first) and first[i] == '*':
+            steps.append((i + 1, j))  # The star matches nothing more.
+            if j < len(second):
+                steps.append((i, j + 1))  # The star absorbs the next character of the other pattern.
+        if j < len(second) and second[j] == '*':
+            steps.append((i, j + 1))
+            if i < len(first):
+                steps.append((i + 1, j))
+        if i < len(first) and j < len(second) and first[i] == second[j] != '*':
+            steps.append((i + 1, j + 1))
+        for step in steps:
+            if step not in reachable:
+                reachable.add(step)
+                pending.append(step)
+    return False
+
+
+def _url_parts(pattern: str):
+    # Split a 'scheme://host/path' pattern; patterns like '*.png' match against the whole URL
+    if "://" not in pattern:
+        return None
+    scheme, rest = pattern.split("://", 1)
+    host, _, path = rest.partition("/")
+    return scheme, host, path
+
+
+def patterns_overlap(first: str, second: str) -> bool:
+    # Whether some URL matches both patterns; the scheme, host and path are compared separately
+    first_parts, second_parts = _url_parts(first), _url_parts(second)
+    if first_parts is None or second_parts is None:
+        return _globs_overlap(first, second)
+    return all(_globs_overlap(a, b) for a, b in zip(first_parts, second_parts))
+
+
+def allowed_patterns(profile: Dict[str, any]) -> List[str]:
+    # URL patterns of the allowlist; a host also allows its subdomains
+    patterns = list(profile.get('allowed_urls') or [])
+    for host in profile.get('allowed_hosts') or []:
+        patterns.extend([f"*://{host}/*", f"*://*.{host}/*"])
+    return patterns
+
+
+class ResourceBlocker:
+    def __init__(self, blocking_config: Dict[str, any]):
+        self.config = blocking_config or {}
+        self.enabled = self.config.get('enabled', False)
+        self._applied = {}  # Patterns last applied per browser tab.
+        self._lock = threading.Lock()
+
+    def profile_for(self, name: str) -> Dict[str, any]:
+        # Merge the global settings with the profile of a portal or domain backend
+        profile = {key: value for key, value in self.config.items() if key != 'profiles'}
+        profile.setdefault('blocked_hosts', DEFAULT_BLOCKED_HOSTS)
+        profile.update((self.config.get('profiles') or {}).get(name) or {})
+        return profile
+
+    def patterns_for(self, name: str) -> List[str]:
+        profile = self.profile_for(name)
+        patterns = []
+        for setting, type_patterns in RESOURCE_TYPE_PATTERNS.items():
+            if profile.get(setting, True):
+                patterns.extend(type_patterns)
+        for host in profile.get('blocked_hosts') or []:
+            patterns.extend([f"*://{host}/*", f"*://*.{host}/*"])
+
+        # Chrome's blocklist has no exceptions, so a pattern that could block an allowed URL is left out
+        allowed = allowed_patterns(profile)
+        kept = [pattern for pattern in patterns if not any(patterns_overlap(pattern, url) for url in allowed)]
+        if len(kept) < len(patterns):
+            logger.debug(f"Resource blocking profile '{name}' leaves out "
+                         f"{', '.join(p for p in patterns if p not in kept)} for its allowlist.")
+        return kept
+
+    def apply(self, driver, name: str) -> None:
+        # Apply the profile of a portal or domain backend to the current browser tab
+        if not self.enabled or driver is None:
+            return
+        # Selenium is imported only once a browser exists, so browserless runs never load it
+        from selenium.common.exceptions import WebDriverException
+        try:
+            patterns = self.patterns_for(name)
+            # Blocked URLs are set per tab, so track what the current tab already has
+            tab_key = (driver.session_id, driver.current_window_handle)
+            with self._lock:
+                if self._applied.get(tab_key) == patterns:
+                    return
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            with self._lock:
+                self._applied[tab_key] = patterns
+            logger.info(f"Applied resource blocking profile '{name}' ({len(patterns)} patterns).")
+        except WebDriverException as e:
+            logger.error(f"Error applying resource blocking profile '{name}': {e}")
@@ -0,0 +1,115 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/result_cache.py
+
+Description:
+This module defines the ResultCache class, a persistent SQLite store for business name
+and domain check results. Entries are keyed by (state, normalized name) and by full
+domain, and expire after a configurable time that depends on the kind of result, so
+definite answers are reused across runs while uncertain ones are checked again.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from utils.logger import logger
+from .rate_limiter import FAILURE_STATUSES
+
+HOUR = 3600
+
+
+class ResultCache:
+    def __init__(self, db_path: str, taken_ttl_hours: float = 720,
+                 available_ttl_hours: float = 6):
+        # Time to live in seconds for each kind of result
+        self.ttl = {
+            "taken": taken_ttl_hours * HOUR,
+            "available": available_ttl_hours * HOUR
+        }
+        self.stats = {"bns_hits": 0, "bns_misses": 0, "domain_hits": 0, "domain_misses": 0}
+        self._lock = threading.Lock()
+
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection is shared by all worker threads, guarded by the lock
+        self.connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS bns_results ("
+            "state TEXT NOT NULL, name TEXT NOT NULL, status TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, PRIMARY KEY (state, name))")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS domain_results ("
+            "domain TEXT PRIMARY KEY, status TEXT NOT NULL, expires_at REAL NOT NULL)")
+        self.connection.commit()
+        logger.info(f"Result cache opened at {db_path}")
+
+    @classmethod
+    def from_config(cls, cache_config: Dict[str, any]) -> Optional["ResultCache"]:
+        # Create the cache from the 'cache' section of the configuration, if enabled
+        if not cache_config or not cache_config.get('enabled'):
+            return None
+        return cls(cache_config.get('path', 'data/cache/results.sqlite'),
+                   cache_config.get('taken_ttl_hours', 720),
+                   cache_config.get('available_ttl_hours', 6))
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        # Case and whitespace differences don't change the portal answer
+        return ' '.join(name.upper().split())
+
+    @staticmethod
+    def _status_kind(status: str) -> Optional[str]:
+        # Map a status to its TTL kind; unknown or error statuses are never cached
+        if not status or status in FAILURE_STATUSES:
+            return None
+        if status in ("Taken", "Not Available"):
+            return "taken"
+        if status.startswith("Available") or status == "Not Found":
+            return "available"
+        return None
+
+    def _get(self, query, params, kind):
+        with self._lock:
+            row = self.connection.execute(query, params + (time.time(),)).fetchone()
+            self.stats[f"{kind}_hits" if row else f"{kind}_misses"] += 1
+        return row[0] if row else None
+
+    def _set(self, query, params, status):
+        kind = self._status_kind(status)
+        if kind is None or self.ttl[kind] <= 0:
+            return
+        with self._lock:
+            self.connection.execute(query, params + (status, time.time() + self.ttl[kind]))
+            self.connection.commit()
+
+    def get_bns(self, state: str, name: str) -> Optional[str]:
+        return self._get("SELECT status FROM bns_results WHERE state = ? AND name = ? "
+                         "AND expires_at > ?", (state.upper(), self.normalize_name(name)), "bns")
+
+    def set_bns(self, state: str, name: str, status: str):
+        self._set("INSERT OR REPLACE INTO bns_results (state, name, status, expires_at) "
+                  "VALUES (?, ?, ?, ?)", (state.upper(), self.normalize_name(name)), status)
+
+    def get_domain(self, domain: str) -> Optional[str]:
+        return self._get("SELECT status FROM domain_results WHERE domain = ? "
+                         "AND expires_at > ?", (domain.lower(),), "domain")
+
+    def set_domain(self, domain: str, status: str):
+        self._set("INSERT OR REPLACE INTO domain_results (domain, status, expires_at) "
+                  "VALUES (?, ?, ?)", (domain.lower(),), status)
+
+    def log_stats(self):
+        # Log the hit/miss counts collected during the run
+        logger.info("Result cache: BNS hits {}, misses {}; domain hits {}, misses {}",
+                    self.stats["bns_hits"], self.stats["bns_misses"],
+                    self.stats["domain_hits"], self.stats["domain_misses"])
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
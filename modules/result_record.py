@@ -0,0 +1,139 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/result_record.py
+
+Description:
+This module defines the result records produced for every company: CompanyResult with
+its BnsResult per state and DomainResult per zone. Statuses are CheckStatus enums,
+domain prices are parsed into numbers and every record carries the time it was checked.
+The records use __slots__ to stay small, and the report writers read their fields
+directly instead of parsing text.
+"""
+
+import re
+import time
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+
+class CheckStatus(Enum):
+    AVAILABLE = "Available"
+    NOT_AVAILABLE = "Not Available"
+    TAKEN = "Taken"
+    NOT_FOUND = "Not Found"
+    UNKNOWN = "Status Unknown"
+    TIMEOUT = "Timeout/Error"
+    ERROR = "Error"
+
+    @classmethod
+    def parse(cls, text: str) -> Tuple["CheckStatus", Optional[str]]:
+        # Split a checker status such as "Available at $9.98/yr" into the status and price text
+        text = (text or "").strip()
+        if text.startswith("Available at "):
+            return cls.AVAILABLE, text[len("Available at "):].strip()
+        try:
+            return cls(text), None
+        except ValueError:
+            return cls.UNKNOWN, None
+
+    @property
+    def is_available(self) -> bool:
+        return self in (CheckStatus.AVAILABLE, CheckStatus.NOT_FOUND)
+
+    @property
+    def is_failure(self) -> bool:
+        return self in (CheckStatus.UNKNOWN, CheckStatus.TIMEOUT, CheckStatus.ERROR)
+
+
+# Define a function to read the amount from a price such as "$7,995.00" or "$9.97/yr"
+def parse_price(price_text: Optional[str]) -> Optional[float]:
+    if not price_text:
+        return None
+    match = re.search(r"\d[\d,]*(?:\.\d+)?", price_text)
+    return float(match.group().replace(",", "")) if match else None
+
+
+class BnsResult:
+    __slots__ = ("state", "status", "checked_at")
+
+    def __init__(self, state: str, status: CheckStatus, checked_at: float = None):
+        self.state = state
+        self.status = status
+        self.checked_at = checked_at if checked_at is not None else time.time()
+
+    @property
+    def text(self) -> str:
+        return self.status.value
+
+    def to_dict(self) -> Dict[str, any]:
+        return {"state": self.state, "status": self.status.value, "checked_at": self.checked_at}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, any]):
+        return cls(data["state"], CheckStatus(data["status"]), data.get("checked_at"))
+
+
+class DomainResult:
+    __slots__ = ("domain", "zone", "status", "price", "price_text", "checked_at")
+
+    def __init__(self, domain: str, zone: str, status: CheckStatus, price_text: Optional[str] = None,
+                 checked_at: float = None):
+        self.domain = domain
+        self.zone = zone
+        self.status = status
+        self.price_text = price_text  # Price as shown by the registrar, e.g., "$9.97/yr".
+        self.price = parse_price(price_text)  # Numeric amount of the price, if any.
+        self.checked_at = checked_at if checked_at is not None else time.time()
+
+    @classmethod
+    def from_text(cls, domain: str, zone: str, text: str, checked_at: float = None):
+        status, price_text = CheckStatus.parse(text)
+        return cls(domain, zone, status, price_text, checked_at)
+
+    @property
+    def text(self) -> str:
+        # Status as shown in the reports
+        return f"Available at {self.price_text}" if self.price_text else self.status.value
+
+    def to_dict(self) -> Dict[str, any]:
+        return {"domain": self.domain, "zone": self.zone, "status": self.status.value,
+                "price_text": self.price_text, "checked_at": self.checked_at}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, any]):
+        return cls(data["domain"], data["zone"], CheckStatus(data["status"]),
+                   data.get("price_text"), data.get("checked_at"))
+
+
+class CompanyResult:
+    __slots__ = ("company", "bns", "domains", "checked_at")
+
+    def __init__(self, company: str, bns: Dict[str, BnsResult] = None,
+                 domains: Dict[str, DomainResult] = None, checked_at: float = None):
+        self.company = company
+        self.bns = bns or {}  # BNS result per state abbreviation.
+        self.domains = domains or {}  # Domain result per zone, in the configured zone order.
+        self.checked_at = checked_at if checked_at is not None else time.time()
+
+    def to_dict(self) -> Dict[str, any]:
+        return {"company": self.company,
+                "bns": [bns.to_dict() for bns in self.bns.values()],
+                "domains": [domain.to_dict() for domain in self.domains.values()],
+                "checked_at": self.checked_at}
+
+    @property
+    def has_failures(self) -> bool:
+        # True when any BNS or domain check of the company ended without an answer
+        return any(result.status.is_failure for result in (*self.bns.values(), *self.domains.values()))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, any]):
+        bns = [BnsResult.from_dict(entry) for entry in data.get("bns", [])]
+        domains = [DomainResult.from_dict(entry) for entry in data.get("domains", [])]
+        return cls(data["company"],
+                   {entry.state: entry for entry in bns},
+                   {entry.zone: entry for entry in domains},
+                   data.get("checked_at"))
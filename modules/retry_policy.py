@@ -0,0 +1,185 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/retry_policy.py
+
+Description:
+This module defines the shared retry layer of the BNS and domain checks. A failed check
+is classified as a transient timeout, a page-layout change, a block (captcha or access
+denied) or a dead driver, from the error the portal noted with note_failure, the
+exception it raised or the page it stopped on. RetryPolicy then retries the check with
+jittered exponential backoff per failure class, resetting the browser session or
+relaunching the browser where the class calls for it. Checks still failing after their
+retries are left to the re-queue pass at the end of the batch.
+"""
+
+import random
+import threading
+import time
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+from utils.logger import logger
+from .metrics import METRICS
+from .rate_limiter import FAILURE_STATUSES
+
+# Page text showing that the site blocked the request instead of answering it
+BLOCK_MARKERS = ("g-recaptcha", "h-captcha", "hcaptcha", "cf-challenge", "captcha", "access denied",
+                 "unusual traffic", "are you a robot", "request blocked")
+# WebDriver errors meaning the browser or its session is gone
+DRIVER_DEAD_MARKERS = ("invalid session id", "chrome not reachable", "disconnected", "session deleted",
+                       "no such window", "target window already closed", "unable to receive message")
+
+# Retries and backoff in seconds per failure class
+DEFAULT_RETRY_SETTINGS = {
+    "transient": {"retries": 3, "base_delay": 1.0, "max_delay": 15.0},
+    "layout": {"retries": 1, "base_delay": 2.0, "max_delay": 5.0},
+    "blocked": {"retries": 2, "base_delay": 20.0, "max_delay": 120.0},
+    "driver_dead": {"retries": 2, "base_delay": 0.0, "max_delay": 0.0}
+}
+
+_last_failure = threading.local()
+
+
+class FailureClass(Enum):
+    TRANSIENT = "transient"  # Timeouts, connection errors, 5xx answers.
+    LAYOUT = "layout"  # Expected elements or forms are missing.
+    BLOCKED = "blocked"  # Captcha, access denied or 403/429 answers.
+    DRIVER_DEAD = "driver_dead"  # The browser or its session is gone.
+
+
+def _error_classes(error: BaseException) -> set:
+    # Qualified names of the exception's classes; matching by name keeps requests and Selenium
+    # from being imported just to classify an error
+    return {f"{cls.__module__}.{cls.__name__}" for cls in type(error).__mro__}
+
+
+# Define a function to classify an exception raised by a check
+def classify_error(error: BaseException) -> Optional[FailureClass]:
+    classes = _error_classes(error)
+    response = getattr(error, 'response', None)
+    if "requests.exceptions.HTTPError" in classes and response is not None:
+        return FailureClass.BLOCKED if response.status_code in (401, 403, 407, 429) \
+            else FailureClass.TRANSIENT
+    if "requests.exceptions.RequestException" in classes:
+        return FailureClass.TRANSIENT
+    if "selenium.common.exceptions.NoSuchElementException" in classes:
+        return FailureClass.LAYOUT
+    if "selenium.common.exceptions.TimeoutException" in classes:
+        return FailureClass.TRANSIENT
+    if "selenium.common.exceptions.WebDriverException" in classes:
+        message = str(error).lower()
+        if any(marker in message for marker in DRIVER_DEAD_MARKERS):
+            return FailureClass.DRIVER_DEAD
+        return FailureClass.TRANSIENT
+    if isinstance(error, (KeyError, TypeError)):
+        # Fields missing from a parsed page
+        return FailureClass.LAYOUT
+    return None
+
+
+# Define a function for the portals to note why a check failed before returning its status
+def note_failure(failure) -> None:
+    failure = failure if isinstance(failure, FailureClass) else classify_error(failure)
+    # A block explains whatever else went wrong in the same check, so it is kept
+    if getattr(_last_failure, 'value', None) is not FailureClass.BLOCKED:
+        _last_failure.value = failure
+
+
+def _take_failure() -> Optional[FailureClass]:
+    failure = getattr(_last_failure, 'value', None)
+    _last_failure.value = None
+    return failure
+
+
+# Define a function to run a check in a pool thread and return its status with the failure it noted
+def run_with_failure(check: Callable, *args):
+    # Failures are noted per thread, so the caller notes the returned one in its own thread
+    _take_failure()
+    return check(*args), _take_failure()
+
+
+# Define a function to tell whether a page shows a captcha or block message
+def is_blocked_page(text: str) -> bool:
+    text = (text or "").lower()
+    return any(marker in text for marker in BLOCK_MARKERS)
+
+
+class RetryPolicy:
+    def __init__(self, retry_config: Dict[str, any] = None):
+        retry_config = retry_config or {}
+        self.enabled = retry_config.get('enabled', True)
+        self.settings = {}
+        for failure_class in FailureClass:
+            settings = dict(DEFAULT_RETRY_SETTINGS[failure_class.value])
+            settings.update(retry_config.get(failure_class.value) or {})
+            self.settings[failure_class] = settings
+        self.requeue = retry_config.get('requeue', True)  # Recheck unresolved companies at the end of the batch.
+        self.requeue_delay = retry_config.get('requeue_delay', 30)  # Seconds before a company is rechecked.
+
+    def backoff(self, failure_class: FailureClass, attempt: int) -> float:
+        # Full jitter: a random delay up to the exponential backoff of the attempt
+        settings = self.settings[failure_class]
+        return random.uniform(0, min(settings['max_delay'], settings['base_delay'] * 2 ** attempt))
+
+    @staticmethod
+    def classify(status: str, driver=None) -> FailureClass:
+        # Use the noted failure, then the page the browser stopped on, then the status itself
+        failure = _take_failure()
+        if failure in (None, FailureClass.LAYOUT, FailureClass.TRANSIENT) and driver is not None:
+            try:
+                if is_blocked_page(driver.page_source):
+                    return FailureClass.BLOCKED
+            except Exception as e:
+                # The browser couldn't even return its page
+                return classify_error(e) or FailureClass.TRANSIENT
+        if failure is not None:
+            return failure
+        return FailureClass.TRANSIENT if status in ("Timeout/Error", "Status Unknown") else FailureClass.LAYOUT
+
+    @staticmethod
+    def _attempt(check: Callable[[], any]):
+        # Run the check; a classified exception becomes an "Error" status
+        _take_failure()
+        try:
+            return check(), None
+        except Exception as e:
+            failure = classify_error(e)
+            if failure is None:
+                raise
+            logger.warning(f"Check raised {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}")
+            return None, failure
+
+    def run(self, check: Callable[[], str], description: str, driver=None,
+            recover: Callable[[FailureClass], None] = None) -> str:
+        # Run a check returning one status, retrying it while it fails
+        statuses = self.run_many(lambda keys: {None: check()}, [None], description, driver, recover)
+        return statuses[None]
+
+    def run_many(self, check: Callable[[List], Dict], keys: List, description: str, driver=None,
+                 recover: Callable[[FailureClass], None] = None) -> Dict:
+        # Run a check returning a status per key, retrying only the keys that failed
+        statuses, failure = self._attempt(lambda: check(keys))
+        statuses = statuses or {key: "Error" for key in keys}
+        attempts = {failure_class: 0 for failure_class in FailureClass}
+        while self.enabled:
+            failed = [key for key in keys if statuses[key] in FAILURE_STATUSES]
+            if not failed:
+                break
+            failure = failure or self.classify(statuses[failed[0]], driver)
+            if attempts[failure] >= self.settings[failure]['retries']:
+                METRICS.count("check_unresolved", failure=failure.value)
+                logger.warning(f"{description} unresolved after retries ({failure.value}).")
+                break
+            delay = self.backoff(failure, attempts[failure])
+            attempts[failure] += 1
+            METRICS.count("check_retry", failure=failure.value)
+            logger.info(f"Retrying {description} after a {failure.value} failure "
+                        f"in {delay:.1f}s (retry {attempts[failure]}).")
+            if recover is not None:
+                recover(failure)
+            time.sleep(delay)
+            retried, failure = self._attempt(lambda: check(failed))
+            statuses.update(retried or {key: "Error" for key in failed})
+        return statuses
@@ -0,0 +1,65 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/run_journal.py
+
+Description:
+This module defines the RunJournal class, an append-only JSON Lines file that records
+every company as soon as its checks are finished. The journal is flushed to disk after
+each entry, so an interrupted run can be resumed and its report rebuilt without
+checking the finished companies again.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict
+from utils.logger import logger
+from .result_record import CompanyResult
+
+
+class RunJournal:
+    def __init__(self, journal_path: str):
+        self.journal_path = Path(journal_path)
+        self._file = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, CompanyResult]:
+        # Read the finished companies from an existing journal
+        entries = {}
+        if not self.journal_path.exists():
+            return entries
+        with self.journal_path.open('r', encoding='utf-8') as file:
+            for line_num, line in enumerate(file, start=1):
+                try:
+                    entry = json.loads(line)
+                    entries[entry["company"]] = CompanyResult.from_dict(entry["result"])
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    # A crash can leave the last line half written
+                    logger.warning(f"Skipping unreadable journal line {line_num} in {self.journal_path}")
+        logger.info(f"Loaded {len(entries)} finished companies from journal {self.journal_path}")
+        return entries
+
+    def open(self, resume: bool = False):
+        # Continue the existing journal when resuming, otherwise start a new one
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.journal_path.open('a' if resume else 'w', encoding='utf-8')
+
+    def append(self, company: str, result: CompanyResult):
+        # Write the entry and force it to disk before moving on
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps({"company": company, "result": result.to_dict()},
+                                        ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
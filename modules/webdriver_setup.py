@@ -12,20 +12,22 @@ proxy settings, and stealth mode, based on the provided configuration.
 """
 
 import json
-import undetected_chromedriver as uc
 from utils.logger import logger
-from selenium_stealth import stealth
 from typing import Dict
 
 
 # Define a function to set up the WebDriver
-def setup_webdriver(config: Dict[str, any]) -> uc.Chrome:
-    # Extract proxy and WebDriver configuration from the provided 'config' dictionary
-    proxy_settings = config.get('proxy_settings', {})
+def setup_webdriver(config: Dict[str, any], proxy_server: str = None) -> "uc.Chrome":
+    # undetected-chromedriver and selenium-stealth take a while to import, so runs
+    # that never launch a browser don't load them
+    import undetected_chromedriver as uc
+    from selenium_stealth import stealth
+
+    # Extract the WebDriver configuration from the provided 'config' dictionary
     webdriver_config = config.get('webdriver', {})
 
     # Log the proxy and WebDriver configuration before setting up the WebDriver
-    logger.info("Proxy Settings: {}", json.dumps(proxy_settings))
+    logger.info("Proxy Server: {}", proxy_server or "none")
     logger.info("WebDriver Configuration: {}", json.dumps(webdriver_config))
 
     # Configure WebDriver options
@@ -70,21 +72,10 @@ def setup_webdriver(config: Dict[str, any]) -> uc.Chrome:
     if headless_mode:
         options.add_argument("--headless")
 
-    # Proxy Configuration
-    if 'proxy_settings' in config and config['proxy_settings'].get('proxy_enabled'):
-        proxy_host = config['proxy_settings'].get('proxy_host')
-        proxy_port = config['proxy_settings'].get('proxy_port')
-        proxy_username = config['proxy_settings'].get('proxy_username')
-        proxy_password = config['proxy_settings'].get('proxy_password')
-
-        # Construct the proxy string
-        if proxy_host and proxy_port:
-            proxy_str = f"{proxy_host}:{proxy_port}"
-
-            if proxy_username and proxy_password:
-                proxy_str = f"{proxy_username}:{proxy_password}@{proxy_str}"
-
-            options.add_argument(f'--proxy-server=http://{proxy_str}')
+    # Proxy Configuration: the proxy pool gives each worker a local forwarding shim,
+    # which holds the credentials Chrome can't take in --proxy-server
+    if proxy_server:
+        options.add_argument(f'--proxy-server={proxy_server}')
 
     try:
         # Set up the WebDriver using ChromeDriverManager
@@ -0,0 +1,256 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: modules/worker_pool.py
+
+Description:
+This module defines the BrowserWorker and BrowserWorkerPool classes. Each worker owns
+its own WebDrivers or HTTP session, a portal instance per state and a domain backend,
+and the pool distributes companies to the workers through a shared work queue. The
+companies are fed to the queue lazily as they are read, and the results are put back
+in input order before they are returned to the caller.
+"""
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List
+from utils.logger import logger
+from .driver_manager import ManagedDriver
+from .rate_limiter import FAILURE_STATUSES
+from .http_session import create_http_session
+from .proxy_pool import ProxyLease
+from .retry_policy import FailureClass
+from .domain_backends.dns_prefilter import DNSPreFilter, PrefilteredDomainBackend
+
+# Sentinel placed on the work queue to tell a worker thread to stop
+_STOP = object()
+
+
+# Define a class holding the per-worker browser resources
+class BrowserWorker:
+    def __init__(self, config: Dict[str, Any], portal_classes: Dict[str, Any] = None,
+                 domain_backend_class=None, portal_urls: Dict[str, str] = None, proxy_pool=None):
+        self.config = config
+        self.drivers = []
+        self.http_session = None
+        self.portals = {}  # Portal instance per state abbreviation.
+        self.portal_drivers = {}  # WebDriver of each browser-based portal.
+        self.domain_checker = None
+        self.domain_driver = None
+        self.executor = None
+        # Proxy of this worker, rotated within the shared proxy pool
+        self.proxy_lease = ProxyLease(proxy_pool) if proxy_pool is not None else None
+        portal_urls = portal_urls or {}
+
+        # Every worker gets its own portal instance for each state
+        for state, portal_class in (portal_classes or {}).items():
+            if portal_class.requires_browser:
+                # Each browser portal has its own warm session, so the states can run concurrently
+                self.portal_drivers[state] = self._new_driver()
+                self.portals[state] = portal_class(self.portal_drivers[state])
+            else:
+                if self.http_session is None:
+                    self.http_session = self._new_http_session()
+                self.portals[state] = portal_class(self.http_session, url=portal_urls.get(state),
+                                                   timeout=config.get('http_timeout', 10))
+        if len(self.portals) > 1:
+            self.executor = ThreadPoolExecutor(max_workers=len(self.portals),
+                                               thread_name_prefix="states")
+
+        if domain_backend_class is not None:
+            if domain_backend_class.requires_browser:
+                # The domain checks run after the BNS checks, so they can reuse a portal browser
+                self.domain_driver = self.drivers[0] if self.drivers else self._new_driver()
+            self.domain_checker = domain_backend_class.from_config(config, self.domain_driver)
+            # Optionally answer obviously registered domains from the DNS first
+            prefilter = DNSPreFilter.from_config(config.get('dns_prefilter', {}))
+            if prefilter is not None:
+                self.domain_checker = PrefilteredDomainBackend(self.domain_checker, prefilter)
+
+    def _new_driver(self):
+        # Chrome is only started for components that need it, and kept warm for the worker
+        proxy_server = self.proxy_lease.browser_proxy_url() if self.proxy_lease else None
+        driver = ManagedDriver(self.config, proxy_server=proxy_server)
+        self.drivers.append(driver)
+        return driver
+
+    def _new_http_session(self):
+        if self.proxy_lease is None:
+            return create_http_session(self.config)
+        session = create_http_session(self.config, self.proxy_lease.proxy.url)
+        # Send the next requests through the new proxy after a rotation
+        self.proxy_lease.on_rotate(lambda proxy: session.proxies.update({'http': proxy.url, 'https': proxy.url}))
+        return session
+
+    def record_check(self, driver, *statuses):
+        # Let the managed driver reset or recycle its session as needed
+        if driver is not None:
+            driver.record_check(failed=any(status in FAILURE_STATUSES for status in statuses))
+
+    def record_proxy(self, seconds, *statuses):
+        # Score the worker's proxy by the outcome of a check made through it
+        if self.proxy_lease is not None:
+            self.proxy_lease.record(seconds, *statuses)
+
+    def recover(self, driver, failure: FailureClass):
+        # Prepare the retry of a failed check: a blocked check continues from another proxy
+        # in a clean session, a dead browser is replaced
+        if failure is FailureClass.BLOCKED:
+            if self.proxy_lease is not None:
+                self.proxy_lease.rotate()
+            if driver is not None:
+                driver.reset_session()
+        elif failure is FailureClass.DRIVER_DEAD and driver is not None:
+            driver.recycle()
+
+    def close(self):
+        try:
+            # Quit the WebDrivers and close the sessions owned by this worker
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+            if self.domain_checker is not None:
+                self.domain_checker.close()
+            for driver in self.drivers:
+                driver.quit()
+            if self.http_session is not None:
+                self.http_session.close()
+            if self.proxy_lease is not None:
+                self.proxy_lease.close()
+        except Exception as e:
+            logger.error(f"Error closing worker resources: {e}")
+
+
+# Define a class for distributing companies across a pool of browser workers
+class BrowserWorkerPool:
+    def __init__(self, worker_factory: Callable[[], Any], workers: int):
+        self.worker_factory = worker_factory  # Callable creating one worker's resources.
+        self.workers = max(1, workers)  # Number of worker threads to start.
+        self._active_workers = []
+        self._handed_back = deque()  # Companies left by threads whose worker failed to start.
+        self._running = 0  # Worker threads still taking work.
+        self._lock = threading.Lock()
+
+    def _start_worker(self):
+        try:
+            # Create the worker resources inside the thread that uses them
+            worker = self.worker_factory()
+            with self._lock:
+                self._active_workers.append(worker)
+            return worker
+        except Exception as e:
+            logger.error(f"Error starting worker: {e}")
+            return None
+
+    def _worker_loop(self, work_queue, process, results, on_result):
+        worker = None
+        started = False
+        stopping = False
+
+        while True:
+            item = self._next_item(work_queue, stopping)
+            if item is _STOP:
+                if stopping:
+                    return
+                # Finish the companies handed back by other threads before stopping
+                stopping = True
+                continue
+            index, company = item
+            if not started:
+                # Browsers are only launched once there is work for this thread
+                worker = self._start_worker()
+                started = True
+            if worker is None and self._hand_back(item):
+                # Without a worker this thread stops taking work; the other threads process the company
+                logger.warning(f"Worker thread without browsers stopped, handing back company '{company}'.")
+                return
+            result = None
+            if worker is not None:
+                try:
+                    result = process(worker, company)
+                except Exception as e:
+                    logger.error(f"Error processing company '{company}': {e}")
+            else:
+                # No thread of the pool could start a worker
+                logger.error(f"No worker available, company '{company}' is dropped.")
+            self._deliver(index, company, result, results, on_result)
+
+    def _next_item(self, work_queue, stopping):
+        # Companies handed back by a thread without a worker are taken first
+        with self._lock:
+            if self._handed_back:
+                return self._handed_back.popleft()
+            if stopping:
+                self._running -= 1
+                return _STOP
+        item = work_queue.get()
+        work_queue.task_done()
+        return item
+
+    def _hand_back(self, item) -> bool:
+        # Leave the company to the other threads, unless this is the last one running
+        with self._lock:
+            if self._running <= 1:
+                return False
+            self._handed_back.append(item)
+            self._running -= 1
+            return True
+
+    @staticmethod
+    def _deliver(index, company, result, results, on_result):
+        if on_result is None:
+            results[index] = result
+            return
+        try:
+            # Let the caller record the finished company right away (None if it failed)
+            on_result(index, company, result)
+        except Exception as e:
+            logger.error(f"Error recording result of company '{company}': {e}")
+
+    def _feed(self, work_queue, companies, workers):
+        # Put the companies on the queue as they are read, then stop every worker
+        try:
+            for index, company in enumerate(companies):
+                work_queue.put((index, company))
+        finally:
+            for _ in range(workers):
+                work_queue.put(_STOP)
+
+    def map(self, process: Callable[[Any, str], Any], companies: Iterable[str],
+            on_result: Callable[[int, str, Any], None] = None) -> List[Any]:
+        # Process every company through the pool and return the results in input order.
+        # With on_result, each result is passed to it as soon as it is ready instead of being kept.
+        results = {}
+        # A bounded queue keeps only a few companies ahead of the workers
+        work_queue = queue.Queue(maxsize=self.workers * 2)
+
+        logger.info(f"Starting {self.workers} worker(s).")
+        self._handed_back.clear()
+        self._running = self.workers
+        threads = []
+        for worker_num in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop,
+                                      args=(work_queue, process, results, on_result),
+                                      name=f"worker-{worker_num + 1}", daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        try:
+            self._feed(work_queue, companies, self.workers)
+        finally:
+            for thread in threads:
+                thread.join()
+            self.close()
+
+        # Companies that failed completely are dropped from the ordered results
+        return [results[index] for index in sorted(results) if results[index] is not None]
+
+    def close(self):
+        # Close the resources of every worker that was started
+        with self._lock:
+            workers, self._active_workers = self._active_workers, []
+        for worker in workers:
+            worker.close()
@@ -0,0 +1,102 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/local_servers.py
+
+Description:
+Local HTTP and TCP servers that stand in for the portals and domain services, so the
+tests run offline. Servers started through the helpers are closed when the test ends.
+"""
+
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class LocalHTTPServer:
+    # Serves the answers of a function (method, path, query, body) -> (status, content_type, body)
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode('utf-8') if length else ""
+                url = urlsplit(self.path)
+                server.requests.append((method, url.path))
+                status, content_type, text = server.respond(method, url.path, url.query, body)
+                data = text.encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class LocalTCPServer:
+    # Answers one line of text per connection with respond(line) and closes it, like WHOIS
+    def __init__(self, respond):
+        self.respond = respond
+        self.queries = []
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                query = self.rfile.readline().decode('utf-8').strip()
+                server.queries.append(query)
+                self.wfile.write(server.respond(query).encode('utf-8'))
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+
+def start_http_server(test_case, respond) -> LocalHTTPServer:
+    # Start a local HTTP server that is closed when the test case ends
+    server = LocalHTTPServer(respond)
+    test_case.addCleanup(server.close)
+    return server
+
+
+def start_tcp_server(test_case, respond) -> LocalTCPServer:
+    # Start a local TCP server that is closed when the test case ends
+    server = LocalTCPServer(respond)
+    test_case.addCleanup(server.close)
+    return server
@@ -1,26 +1,33 @@
 # tests/run_tests.py
+import sys
 import unittest
+from pathlib import Path
+
+# Directory of the tests and the project root they import the modules from
+TESTS_DIRECTORY = Path(__file__).resolve().parent
+PROJECT_ROOT = TESTS_DIRECTORY.parent
 
 
 # Define a function to run tests
 def run_tests():
+    # Make the project packages importable when the script is started from anywhere
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+
     # Create a TestLoader instance to load test cases
     loader = unittest.TestLoader()
 
-    # Specify the directory where tests are located
-    start_dir = 'tests'
-
     # Discover and collect all test cases from the 'tests' directory
-    suite = loader.discover(start_dir)
+    suite = loader.discover(str(TESTS_DIRECTORY), top_level_dir=str(PROJECT_ROOT))
 
     # Create a TextTestRunner instance to run the tests and display results
     runner = unittest.TextTestRunner()
 
     # Run the test suite using the TextTestRunner
-    runner.run(suite)
+    return runner.run(suite)
 
 
 # This script allows running unit tests when executed directly
 if __name__ == "__main__":
     # Call the run_tests() function to execute tests and display results
-    run_tests()
+    sys.exit(0 if run_tests().wasSuccessful() else 1)
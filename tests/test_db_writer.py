@@ -0,0 +1,41 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_db_writer.py
+
+Description:
+Tests of the database report writer on an in-memory SQLite database.
+"""
+
+import sqlite3
+import unittest
+from modules.reporting.db_writer import DatabaseReportGenerator
+from modules.result_record import BnsResult, CheckStatus, CompanyResult, DomainResult
+
+
+def result(status: CheckStatus, checked_at: float) -> CompanyResult:
+    return CompanyResult("Acme Widgets LLC",
+                         {"NJ": BnsResult("NJ", status, checked_at)},
+                         {".com": DomainResult.from_text("acmewidgets.com", ".com", "Taken", checked_at)},
+                         checked_at)
+
+
+class DatabaseReportGeneratorTest(unittest.TestCase):
+    def test_rerun_updates_the_latest_check(self):
+        connection = sqlite3.connect(":memory:")
+        writer = DatabaseReportGenerator(connection, ["NJ"])
+        self.addCleanup(writer.close)
+        writer.open()
+        writer.write_row(result(CheckStatus.UNKNOWN, 100.0))
+        writer.flush()
+        writer.write_row(result(CheckStatus.AVAILABLE, 200.0))
+        writer.flush()
+
+        self.assertEqual(connection.execute("SELECT company, state, status, checked_at FROM bns_checks").fetchall(),
+                         [("Acme Widgets LLC", "NJ", "Available", 200.0)])
+        self.assertEqual(connection.execute("SELECT company, zone, status, checked_at FROM domain_checks").fetchall(),
+                         [("Acme Widgets LLC", ".com", "Taken", 200.0)])
+        self.assertEqual(connection.execute("SELECT name, checked_at FROM companies").fetchall(),
+                         [("Acme Widgets LLC", 200.0)])
@@ -0,0 +1,123 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_dns_prefilter.py
+
+Description:
+Tests of the DNS pre-filter against a local UDP stub resolver that answers NS and SOA
+queries, returns NXDOMAIN or doesn't answer at all.
+"""
+
+import socket
+import struct
+import threading
+import unittest
+from modules.domain_backends.base import DomainBackend
+from modules.domain_backends.dns_prefilter import (DNSPreFilter, PrefilteredDomainBackend, QTYPE_NS, QTYPE_SOA,
+                                                   RCODE_NOERROR, RCODE_NXDOMAIN)
+
+# Answers of the stub: domain -> {query type: number of answer records}; other domains are NXDOMAIN
+ZONE = {
+    "live.test": {QTYPE_NS: 2},
+    "apex.test": {QTYPE_NS: 0, QTYPE_SOA: 1},  # Delegated, but only the SOA query answers.
+}
+SILENT = {"slow.test"}  # Domains the stub never answers.
+
+
+def parse_question(data: bytes):
+    # Return (query id, domain, query type, raw question section) of a DNS query
+    query_id = struct.unpack(">H", data[:2])[0]
+    labels, offset = [], 12
+    while data[offset]:
+        length = data[offset]
+        labels.append(data[offset + 1:offset + 1 + length].decode('idna'))
+        offset += 1 + length
+    qtype = struct.unpack(">H", data[offset + 1:offset + 3])[0]
+    return query_id, ".".join(labels).lower(), qtype, data[12:offset + 5]
+
+
+def build_answer(query_id, question, qtype, answers):
+    rcode = RCODE_NOERROR if answers is not None else RCODE_NXDOMAIN
+    header = struct.pack(">HHHHHH", query_id, 0x8180 | rcode, 1, answers or 0, 0, 0)
+    records = b""
+    for _ in range(answers or 0):
+        # Name pointer to the question, then type, class, TTL and a one-byte root name as data
+        records += struct.pack(">HHHIH", 0xC00C, qtype, 1, 300, 1) + b"\x00"
+    return header + question + records
+
+
+class StubResolver:
+    # UDP resolver on a local port that answers from ZONE and records the queries
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.05)
+        self.port = self.sock.getsockname()[1]
+        self.queries = []
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while self._running.is_set():
+            try:
+                data, addr = self.sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            query_id, domain, qtype, question = parse_question(data)
+            self.queries.append((domain, qtype))
+            if domain in SILENT:
+                continue
+            answers = ZONE[domain].get(qtype, 0) if domain in ZONE else None
+            self.sock.sendto(build_answer(query_id, question, qtype, answers), addr)
+
+    def close(self):
+        self._running.clear()
+        self._thread.join()
+        self.sock.close()
+
+
+class RecordingBackend(DomainBackend):
+    # Domain backend that answers "Available" and records what it was asked
+    def __init__(self):
+        self.checked = []
+
+    def check_domain_status(self, domain: str) -> str:
+        self.checked.append(domain)
+        return "Available"
+
+
+class DNSPreFilterTest(unittest.TestCase):
+    def setUp(self):
+        self.resolver = StubResolver()
+        self.addCleanup(self.resolver.close)
+        self.backend = RecordingBackend()
+        self.checker = PrefilteredDomainBackend(self.backend,
+                                                DNSPreFilter("127.0.0.1", self.resolver.port, timeout=0.3))
+
+    def test_live_delegation_is_taken(self):
+        self.assertEqual(self.checker.check_domain_statuses("live", [".test"]), {".test": "Taken"})
+        self.assertEqual(self.backend.checked, [])
+        self.assertEqual(self.resolver.queries, [("live.test", QTYPE_NS)])
+
+    def test_soa_answer_at_the_apex_is_taken(self):
+        self.assertEqual(self.checker.check_domain_status("apex.test"), "Taken")
+        self.assertEqual(self.backend.checked, [])
+        self.assertEqual(self.resolver.queries, [("apex.test", QTYPE_NS), ("apex.test", QTYPE_SOA)])
+
+    def test_nxdomain_falls_through_to_the_backend(self):
+        self.assertEqual(self.checker.check_domain_statuses("free", [".test"]), {".test": "Available"})
+        self.assertEqual(self.backend.checked, ["free.test"])
+
+    def test_timeout_falls_through_to_the_backend(self):
+        self.assertEqual(self.checker.check_domain_status("slow.test"), "Available")
+        self.assertEqual(self.backend.checked, ["slow.test"])
+
+    def test_mixed_batch_keeps_zone_order(self):
+        statuses = self.checker.check_domain_statuses("live", [".test", ".example"])
+        self.assertEqual(list(statuses), [".test", ".example"])
+        self.assertEqual(statuses, {".test": "Taken", ".example": "Available"})
+        self.assertEqual(self.backend.checked, ["live.example"])
@@ -0,0 +1,157 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_domain_backends.py
+
+Description:
+Offline tests of the RDAP and WHOIS domain backends against a local RDAP server, a local
+bootstrap file and a local WHOIS server.
+"""
+
+import json
+import socket
+import time
+import unittest
+from modules.domain_backends.rdap_backend import RDAPDomainBackend
+from modules.domain_backends.whois_backend import WhoisDomainBackend
+from modules.retry_policy import FailureClass, _take_failure
+from tests.local_servers import start_http_server, start_tcp_server
+
+TAKEN = "taken"
+AVAILABLE = "free"
+LIMITED = "limited"
+
+
+def rdap_responder(state):
+    # RDAP server and bootstrap file in one; state controls the bootstrap answers
+    def respond(method, path, query, body):
+        if path == "/bootstrap.json":
+            time.sleep(state.get("bootstrap_delay", 0))
+            if state.get("bootstrap_fails"):
+                return 503, "text/plain", "unavailable"
+            return 200, "application/json", json.dumps(
+                {"services": [[["test", "example"], [state["base_url"] + "/rdap/"]]]})
+        label = path.rsplit('/', 1)[-1].split('.')[0]
+        if label.startswith(TAKEN):
+            return 200, "application/rdap+json", json.dumps({"objectClassName": "domain"})
+        if label.startswith(AVAILABLE):
+            return 404, "application/rdap+json", json.dumps({"errorCode": 404})
+        if label.startswith(LIMITED):
+            return 429, "application/rdap+json", json.dumps({"errorCode": 429})
+        return 500, "application/rdap+json", json.dumps({"errorCode": 500})
+    return respond
+
+
+def start_rdap(test_case, **state):
+    server = start_http_server(test_case, rdap_responder(state))
+    state["base_url"] = server.url
+    return server, state
+
+
+def whois_responder(registry_address):
+    # IANA-style referral for zones, registry answers for domains
+    def respond(query):
+        if '.' not in query:
+            return f"domain:       {query.upper()}\nrefer:        {registry_address}\n"
+        if query.startswith(TAKEN):
+            return f"Domain Name: {query.upper()}\nRegistrar: Example Registrar\n"
+        if query.startswith(AVAILABLE):
+            return f'No match for "{query.upper()}".\n'
+        return "Rate limit exceeded, try later.\n"
+    return respond
+
+
+def closed_port_address():
+    # Address of a local port with nothing listening on it
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return "127.0.0.1:{}".format(sock.getsockname()[1])
+
+
+class RDAPDomainBackendTest(unittest.TestCase):
+    def test_statuses_from_configured_server(self):
+        server, _ = start_rdap(self)
+        backend = RDAPDomainBackend({".test": server.url + "/rdap/"}, bootstrap_url=server.url + "/bootstrap.json")
+        self.addCleanup(backend.close)
+        self.assertEqual(backend.check_domain_status("free-acme.test"), "Available")
+        self.assertEqual(backend.check_domain_status("taken-acme.test"), "Taken")
+        self.assertEqual(backend.check_domain_status("odd-acme.test"), "Status Unknown")
+        # The configured server is used without loading the bootstrap file
+        self.assertNotIn(("GET", "/bootstrap.json"), server.requests)
+
+    def test_bootstrap_is_loaded_once_for_concurrent_zones(self):
+        server, _ = start_rdap(self, bootstrap_delay=0.2)
+        backend = RDAPDomainBackend(bootstrap_url=server.url + "/bootstrap.json")
+        self.addCleanup(backend.close)
+        # Both zones are checked at once while the bootstrap file is still loading
+        statuses = backend.check_domain_statuses("free", [".test", ".example"])
+        self.assertEqual(statuses, {".test": "Available", ".example": "Available"})
+        self.assertEqual(server.requests.count(("GET", "/bootstrap.json")), 1)
+
+    def test_bootstrap_failure_is_retried(self):
+        server, state = start_rdap(self, bootstrap_fails=True)
+        backend = RDAPDomainBackend(bootstrap_url=server.url + "/bootstrap.json")
+        self.addCleanup(backend.close)
+        self.assertEqual(backend.check_domain_status("taken.test"), "Status Unknown")
+        # Once the bootstrap file loads again, the backend recovers
+        state["bootstrap_fails"] = False
+        self.assertEqual(backend.check_domain_status("taken.test"), "Taken")
+        self.assertEqual(server.requests.count(("GET", "/bootstrap.json")), 2)
+
+    def test_failures_are_noted_in_the_calling_thread(self):
+        # The zones are checked on the pool, but the retry policy reads the failure here
+        server, _ = start_rdap(self)
+        backend = RDAPDomainBackend({".test": server.url + "/rdap/", ".example": server.url + "/rdap/"})
+        self.addCleanup(backend.close)
+        for label, zones, failure in [("odd", [".test"], FailureClass.TRANSIENT),
+                                      ("limited", [".test", ".example"], FailureClass.BLOCKED),
+                                      ("free", [".test", ".example"], None)]:
+            with self.subTest(label=label):
+                _take_failure()
+                statuses = backend.check_domain_statuses(label, zones)
+                self.assertEqual(set(statuses), set(zones))
+                self.assertIs(_take_failure(), failure)
+
+    def test_request_failure_is_transient(self):
+        backend = RDAPDomainBackend({".test": f"http://{closed_port_address()}/rdap/"}, timeout=2)
+        self.addCleanup(backend.close)
+        _take_failure()
+        self.assertEqual(backend.check_domain_statuses("taken", [".test"]), {".test": "Status Unknown"})
+        self.assertIs(_take_failure(), FailureClass.TRANSIENT)
+
+
+class WhoisDomainBackendTest(unittest.TestCase):
+    def start_registry(self):
+        registry = start_tcp_server(self, lambda query: "")
+        registry.respond = whois_responder(registry.address)
+        return registry
+
+    def test_statuses_through_referral(self):
+        registry = self.start_registry()
+        backend = WhoisDomainBackend(timeout=2, iana_server=registry.address)
+        self.assertEqual(backend.check_domain_statuses("free", [".test"]), {".test": "Available"})
+        self.assertEqual(backend.check_domain_status("taken.test"), "Taken")
+        self.assertEqual(backend.check_domain_status("odd.test"), "Status Unknown")
+        # The zone was looked up once and remembered
+        self.assertEqual(registry.queries.count("test"), 1)
+
+    def test_lookup_failure_is_not_remembered(self):
+        registry = self.start_registry()
+        backend = WhoisDomainBackend(timeout=2, iana_server=closed_port_address())
+        _take_failure()
+        self.assertEqual(backend.check_domain_status("taken.test"), "Status Unknown")
+        self.assertNotIn("test", backend.whois_servers)
+        # The failed lookup is noted for the retry policy
+        self.assertIs(_take_failure(), FailureClass.TRANSIENT)
+
+        # The next batch looks the zone up again
+        backend.iana_server = registry.address
+        self.assertEqual(backend.check_domain_status("taken.test"), "Taken")
+
+    def test_query_failure_is_noted(self):
+        backend = WhoisDomainBackend({".test": closed_port_address()}, timeout=2)
+        _take_failure()
+        self.assertEqual(backend.check_domain_status("taken.test"), "Status Unknown")
+        self.assertIs(_take_failure(), FailureClass.TRANSIENT)
@@ -0,0 +1,86 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_driver_manager.py
+
+Description:
+Tests of the browser memory measured by ManagedDriver, with a real process tree
+standing in for chromedriver and Chrome.
+"""
+
+import subprocess
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from modules.driver_manager import ManagedDriver
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class FakeBrowser:
+    def __init__(self, driver_pid, browser_pid=None):
+        self.service = SimpleNamespace(process=SimpleNamespace(pid=driver_pid))
+        self.browser_pid = browser_pid
+        self.quits = 0
+
+    def quit(self):
+        self.quits += 1
+
+
+def managed(browser, **lifecycle):
+    driver = ManagedDriver({"driver_lifecycle": lifecycle})
+    driver._driver = browser
+    return driver
+
+
+@unittest.skipIf(psutil is None, "psutil is not installed")
+class MemoryUsageTest(unittest.TestCase):
+    def setUp(self):
+        # A parent process with a child, like Chrome and one of its renderers
+        # The child prints once it has started, so the memory is measured on settled processes
+        child = "import time; print('ready', flush=True); time.sleep(30)"
+        process = subprocess.Popen([sys.executable, "-c",
+                                    "import subprocess, sys, time\n"
+                                    f"subprocess.Popen([sys.executable, '-c', {child!r}])\n"
+                                    "time.sleep(30)"], stdout=subprocess.PIPE, text=True)
+        self.addCleanup(process.wait)
+        self.addCleanup(process.stdout.close)
+        self.addCleanup(process.kill)
+        self.assertEqual(process.stdout.readline().strip(), "ready")
+        self.chrome = psutil.Process(process.pid)
+        for child_process in self.chrome.children(recursive=True):
+            self.addCleanup(child_process.kill)
+
+    def test_memory_counts_the_whole_process_tree(self):
+        processes = [self.chrome] + self.chrome.children(recursive=True)
+        self.assertEqual(len(processes), 2)
+        driver = managed(FakeBrowser(self.chrome.pid))
+        expected = sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+        self.assertAlmostEqual(driver.memory_usage_mb(), expected, delta=expected * 0.2)
+
+    def test_browser_pid_is_counted_once(self):
+        child = self.chrome.children()[0]
+        both = managed(FakeBrowser(self.chrome.pid, browser_pid=child.pid)).memory_usage_mb()
+        parent_only = managed(FakeBrowser(self.chrome.pid)).memory_usage_mb()
+        self.assertAlmostEqual(both, parent_only, delta=parent_only * 0.2)
+
+    def test_exited_browser_reports_no_memory(self):
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        self.assertEqual(managed(FakeBrowser(process.pid)).memory_usage_mb(), 0)
+
+    def test_recycles_above_the_memory_limit(self):
+        spawned = []
+        first = FakeBrowser(self.chrome.pid)
+        driver = managed(first, recycle_after_checks=0, recycle_memory_mb=1, memory_check_interval=1)
+        with mock.patch("modules.driver_manager.setup_webdriver",
+                        lambda config, proxy: spawned.append(FakeBrowser(self.chrome.pid)) or spawned[-1]):
+            driver.record_check()
+        self.assertEqual(first.quits, 1)
+        self.assertIs(driver._driver, spawned[0])
@@ -0,0 +1,114 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_http_portals.py
+
+Description:
+Offline tests of the NJ, FL and NC HTTP portal backends. Recorded search and result pages
+from tests/fixtures/portals are served by a local HTTP server, and each portal is checked
+for Available, Not Available and Status Unknown, including changed page layouts.
+"""
+
+import unittest
+from pathlib import Path
+import requests
+from modules.portals.nj_http_portal import NJHttpPortal
+from modules.portals.fl_http_portal import FLHttpPortal
+from modules.portals.nc_http_portal import NCHttpPortal
+from modules.retry_policy import FailureClass, _take_failure
+from tests.local_servers import start_http_server
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "portals"
+PORTALS = {"nj": NJHttpPortal, "fl": FLHttpPortal, "nc": NCHttpPortal}
+COMPANY = "Acme Widgets LLC"
+
+
+def fixture(name: str) -> str:
+    return (FIXTURES / f"{name}.html").read_text(encoding='utf-8')
+
+
+class HttpPortalTest(unittest.TestCase):
+    def check(self, state, result_page=None, search_page=None, status=200):
+        # Serve the search page on GET and the result page on POST, then run one check
+        def respond(method, path, query, body):
+            if status != 200:
+                return status, "text/html", "<h1>Service Unavailable</h1>"
+            page = search_page or f"{state}_search"
+            if method == "POST":
+                page = result_page
+            return 200, "text/html; charset=utf-8", fixture(page)
+
+        server = start_http_server(self, respond)
+        with requests.Session() as session:
+            portal = PORTALS[state](session, url=server.url + "/search", timeout=5)
+            _take_failure()
+            return portal.check_availability(COMPANY), _take_failure(), server
+
+    def test_available(self):
+        for state in PORTALS:
+            with self.subTest(state=state):
+                status, failure, _ = self.check(state, f"{state}_available")
+                self.assertEqual(status, "Available")
+                self.assertIsNone(failure)
+
+    def test_not_available(self):
+        for state in PORTALS:
+            with self.subTest(state=state):
+                status, failure, _ = self.check(state, f"{state}_not_available")
+                self.assertEqual(status, "Not Available")
+                self.assertIsNone(failure)
+
+    def test_server_error_is_transient(self):
+        for state in PORTALS:
+            with self.subTest(state=state):
+                status, failure, _ = self.check(state, status=503)
+                self.assertEqual(status, "Status Unknown")
+                self.assertIs(failure, FailureClass.TRANSIENT)
+
+    def test_changed_result_layout(self):
+        for state in ("nj", "fl"):
+            with self.subTest(state=state):
+                status, failure, _ = self.check(state, f"{state}_changed_layout")
+                self.assertEqual(status, "Status Unknown")
+                self.assertIs(failure, FailureClass.LAYOUT)
+
+    def test_nc_changed_search_form(self):
+        # The search mode select is gone, so the form can't be filled in
+        status, failure, server = self.check("nc", "nc_available", search_page="nc_changed_layout")
+        self.assertEqual(status, "Status Unknown")
+        self.assertIs(failure, FailureClass.LAYOUT)
+        self.assertTrue(all(method == "GET" for method, _ in server.requests))
+
+    def test_changed_search_form(self):
+        # A search page without the expected search input
+        for state in ("nj", "fl"):
+            with self.subTest(state=state):
+                status, failure, server = self.check(state, f"{state}_available", search_page="nc_available")
+                self.assertEqual(status, "Status Unknown")
+                self.assertIs(failure, FailureClass.LAYOUT)
+                self.assertTrue(all(method == "GET" for method, _ in server.requests))
+
+    def test_captcha_page_is_blocked(self):
+        status, failure, _ = self.check("nj", "nj_captcha")
+        self.assertEqual(status, "Status Unknown")
+        self.assertIs(failure, FailureClass.BLOCKED)
+
+    def test_nj_submits_form_fields(self):
+        # The hidden token and the search input are posted back to the form action
+        posted = []
+
+        def respond(method, path, query, body):
+            if method == "POST":
+                posted.append((path, body))
+                return 200, "text/html", fixture("nj_available")
+            return 200, "text/html", fixture("nj_search")
+
+        server = start_http_server(self, respond)
+        with requests.Session() as session:
+            NJHttpPortal(session, url=server.url + "/DOR/BusinessNameSearch/Search/Availability").check_availability(COMPANY)
+        path, body = posted[0]
+        self.assertEqual(path, "/DOR/BusinessNameSearch/Search/Availability")
+        self.assertIn("__RequestVerificationToken=recorded-token-value", body)
+        self.assertIn("BusinessName=Acme+Widgets", body)
@@ -0,0 +1,87 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_name_index.py
+
+Description:
+Tests of the input deduplication of NameIndex.
+"""
+
+import threading
+import unittest
+from unittest import mock
+from modules.name_index import NameIndex
+
+
+class NameIndexTest(unittest.TestCase):
+    def test_canonical_name(self):
+        self.assertEqual(NameIndex.canonical_name("ACME, L.L.C."), "ACME")
+        self.assertEqual(NameIndex.canonical_name("  acme   widgets llc "), "ACME WIDGETS")
+
+    def test_canonical_name_does_not_log(self):
+        with mock.patch("modules.company_name_formatter.logger") as formatter_logger:
+            NameIndex.canonical_name("Acme Inc.")
+        formatter_logger.info.assert_not_called()
+
+    def test_variants_share_one_check(self):
+        index = NameIndex()
+        calls = []
+        for name in ("Acme LLC", "ACME, L.L.C.", "acme inc"):
+            index.add(name)
+            self.assertEqual(index.run_once(index.bns_key("NJ", name), lambda: calls.append(1) or "Available"),
+                             "Available")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((index.rows, index.unique_checks, index.shared_checks), (3, 1, 2))
+
+    def test_rows_waiting_for_a_check_in_flight(self):
+        index = NameIndex()
+        started, release = threading.Event(), threading.Event()
+        results = []
+
+        def slow_check():
+            started.set()
+            release.wait(5)
+            return "Available"
+
+        owner = threading.Thread(target=lambda: results.append(index.run_once("key", slow_check)))
+        owner.start()
+        started.wait(5)
+        waiter = threading.Thread(target=lambda: results.append(index.run_once("key", lambda: "Other")))
+        waiter.start()
+        release.set()
+        owner.join(5)
+        waiter.join(5)
+        self.assertEqual(results, ["Available", "Available"])
+        self.assertEqual(index._futures, {})
+
+    def test_finished_results_are_bounded(self):
+        index = NameIndex(max_results=2)
+        for key in ("a", "b", "c"):
+            index.run_once(key, lambda: "Available")
+        self.assertEqual(list(index._finished), ["b", "c"])
+        self.assertEqual(index._futures, {})
+        calls = []
+        index.run_once("a", lambda: calls.append(1) or "Available")
+        self.assertEqual(calls, [1])
+
+    def test_failed_checks_are_retried(self):
+        index = NameIndex()
+        statuses = iter(["Status Unknown", "Available"])
+        self.assertEqual(index.run_once("key", lambda: next(statuses)), "Status Unknown")
+        self.assertEqual(index.run_once("key", lambda: next(statuses)), "Available")
+
+    def test_disabled_index_keeps_nothing(self):
+        index = NameIndex(enabled=False)
+        calls = []
+        for name in ("Acme LLC", "Acme LLC"):
+            index.add(name)
+            index.run_once(index.bns_key("NJ", name), lambda: calls.append(1) or "Available")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(index.bns_key("NJ", "Acme LLC"), ("bns", "NJ", "Acme LLC"))
+        self.assertEqual((index.rows, index._finished, index._futures), (0, {}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_namecheap_domain_checker.py
+
+Description:
+Tests of reading domain statuses from a loaded Namecheap results page, using fake
+WebDriver elements.
+"""
+
+import unittest
+from types import SimpleNamespace
+from modules.namecheap_domain_checker import DomainAvailabilityChecker, normalize_domain
+
+
+class FakeElement:
+    def __init__(self, classes="", text="", children=None):
+        self.classes = classes
+        self.text = text
+        self.children = children or {}  # CSS selector -> list of elements.
+
+    def get_attribute(self, name):
+        return {"class": self.classes, "textContent": self.text}.get(name)
+
+    def find_elements(self, by, selector):
+        return self.children.get(selector, [])
+
+
+def card(domain, available, price="$9.98/yr"):
+    extension = domain.split('.')[-1]
+    children = {"h2": [FakeElement(text=f"\n  {domain}\n")]}
+    if available:
+        children["div.price strong"] = [FakeElement(text=price)]
+    return FakeElement(f"domain-{extension} {'available' if available else 'unavailable'}",
+                       f"{domain} {price if available else 'Make offer'}", children)
+
+
+class FakeInput:
+    def clear(self):
+        pass
+
+    def send_keys(self, keys):
+        pass
+
+
+class FakeDriver:
+    def __init__(self, articles, shown_after_polls=0):
+        self.articles = articles
+        self.shown_after_polls = shown_after_polls  # Polls before the last card is rendered.
+        self.polls = 0
+        self.timeouts = SimpleNamespace(implicit_wait=5)
+
+    def get(self, url):
+        self.url = url
+
+    def implicitly_wait(self, seconds):
+        self.timeouts.implicit_wait = seconds
+
+    def find_element(self, by, selector):
+        return FakeInput()
+
+    def find_elements(self, by, selector):
+        extension = selector.rsplit('-', 1)[-1]
+        self.polls += 1
+        articles = self.articles if self.polls > self.shown_after_polls else self.articles[:-1]
+        return [article for article in articles if f"domain-{extension}" in article.classes]
+
+
+class ReadListedStatusTest(unittest.TestCase):
+    def test_reads_the_exact_domain_card(self):
+        # Suggestion cards that contain the searched name come first on the page
+        driver = FakeDriver([card("getacme.co", True, "$1.00/yr"), card("acme.co.uk", True, "$2.00/yr"),
+                             card("acme.co", False)])
+        checker = DomainAvailabilityChecker(driver, "http://127.0.0.1/?domain=")
+        self.assertEqual(checker._read_listed_status("acme.co"), "Taken")
+        self.assertEqual(checker._read_listed_status("getacme.co"), "Available at $1.00/yr")
+
+    def test_unlisted_domain_is_not_read_from_a_suggestion(self):
+        driver = FakeDriver([card("getacme.net", True)])
+        checker = DomainAvailabilityChecker(driver, "http://127.0.0.1/?domain=")
+        self.assertIsNone(checker._read_listed_status("acme.net"))
+
+    def test_first_zone_waits_for_the_exact_card(self):
+        # A suggestion in the same zone is shown first; the searched domain's card comes later
+        driver = FakeDriver([card("getacme.com", True, "$1.00/yr"), card("acme.com", False)],
+                            shown_after_polls=3)
+        checker = DomainAvailabilityChecker(driver, "http://127.0.0.1/?domain=")
+        self.assertEqual(checker.check_domain_statuses("acme", [".com"]), {".com": "Taken"})
+        self.assertGreater(driver.polls, 3)
+        self.assertEqual(driver.timeouts.implicit_wait, 5)
+
+    def test_first_zone_reads_the_price_of_its_own_card(self):
+        driver = FakeDriver([card("acme-shop.com", False), card("acme.com", True, "$9.98/yr"),
+                             card("acme.net", False)])
+        checker = DomainAvailabilityChecker(driver, "http://127.0.0.1/?domain=")
+        self.assertEqual(checker.check_domain_statuses("acme", [".com", ".net"]),
+                         {".com": "Available at $9.98/yr", ".net": "Taken"})
+
+    def test_normalize_domain(self):
+        self.assertEqual(normalize_domain(" Acme.COM. \n"), "acme.com")
+        self.assertEqual(normalize_domain(None), "")
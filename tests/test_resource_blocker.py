@@ -0,0 +1,75 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_resource_blocker.py
+
+Description:
+Tests of the blocked URL patterns built by ResourceBlocker, including allowlists of
+hosts and URL patterns, and of applying them to a fake browser tab.
+"""
+
+import unittest
+from modules.resource_blocker import DEFAULT_BLOCKED_HOSTS, ResourceBlocker, patterns_overlap
+
+
+class FakeDriver:
+    session_id = "session"
+    current_window_handle = "tab"
+
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+
+class ResourceBlockerTest(unittest.TestCase):
+    def test_patterns_overlap(self):
+        self.assertTrue(patterns_overlap("*.png", "*://www.gstatic.com/recaptcha/*"))
+        self.assertTrue(patterns_overlap("*://*.doubleclick.net/*", "*://ads.doubleclick.net/*"))
+        self.assertFalse(patterns_overlap("*://hotjar.com/*", "*://www.google.com/recaptcha/*"))
+        self.assertFalse(patterns_overlap("*.png", "*://www.google.com/recaptcha/api.js"))
+        self.assertTrue(patterns_overlap("*", ""))
+        self.assertFalse(patterns_overlap("a*b", "a*c"))
+
+    def test_disabled_by_default(self):
+        driver = FakeDriver()
+        ResourceBlocker({}).apply(driver, "NJ")
+        self.assertEqual(driver.commands, [])
+
+    def test_default_profile_blocks_types_and_hosts(self):
+        patterns = ResourceBlocker({"enabled": True}).patterns_for("NJ")
+        self.assertIn("*.png", patterns)
+        self.assertIn("*.woff2", patterns)
+        self.assertEqual(len(patterns), 8 + 7 + 5 + 2 * len(DEFAULT_BLOCKED_HOSTS))
+
+    def test_allowed_url_keeps_unrelated_patterns(self):
+        # Only the patterns that could match the allowed script are left out
+        blocker = ResourceBlocker({"enabled": True, "block_images": False, "block_media": False,
+                                   "block_fonts": False, "blocked_hosts": ["tracker.test", "cdn.test"],
+                                   "allowed_urls": ["*://cdn.test/widget/*.js"]})
+        self.assertEqual(blocker.patterns_for("NJ"),
+                         ["*://tracker.test/*", "*://*.tracker.test/*", "*://*.cdn.test/*"])
+
+    def test_allowed_host_and_profile_override(self):
+        blocker = ResourceBlocker({"enabled": True, "blocked_hosts": ["doubleclick.net"],
+                                   "profiles": {"SC": {"block_images": False,
+                                                       "allowed_hosts": ["ads.doubleclick.net"]}}})
+        self.assertIn("*://*.doubleclick.net/*", blocker.patterns_for("NJ"))
+        sc_patterns = blocker.patterns_for("SC")
+        # The allowed subdomain still leaves the bare host blocked
+        self.assertNotIn("*://*.doubleclick.net/*", sc_patterns)
+        self.assertIn("*://doubleclick.net/*", sc_patterns)
+        # Media and fonts could be served from the allowed host, so their patterns are left out too
+        self.assertNotIn("*.png", sc_patterns)
+        self.assertNotIn("*.mp4", sc_patterns)
+
+    def test_apply_sets_patterns_once_per_tab(self):
+        driver = FakeDriver()
+        blocker = ResourceBlocker({"enabled": True})
+        blocker.apply(driver, "NJ")
+        blocker.apply(driver, "NJ")
+        self.assertEqual([command for command, _ in driver.commands], ["Network.enable", "Network.setBlockedURLs"])
+        self.assertEqual(driver.commands[1][1]["urls"], blocker.patterns_for("NJ"))
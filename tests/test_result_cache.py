@@ -0,0 +1,49 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_result_cache.py
+
+Description:
+Tests of the persistent result cache in a temporary SQLite file.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from modules.portals.md_portal import MDPortal
+from modules.portals.nj_http_portal import NJHttpPortal
+from modules.rate_limiter import FAILURE_STATUSES
+from modules.result_cache import ResultCache
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "results.sqlite"
+        self.cache = ResultCache(str(self.path))
+        self.addCleanup(self.cache.close)
+
+    def test_off_unless_enabled(self):
+        self.assertIsNone(ResultCache.from_config({}))
+        self.assertIsNone(ResultCache.from_config({"path": str(self.path)}))
+
+    def test_definite_answers_are_reused(self):
+        self.cache.set_bns("nj", "Acme  LLC", "Not Available")
+        self.cache.set_domain("ACME.com", "Available at $9.98/yr")
+        self.assertEqual(self.cache.get_bns("NJ", "acme llc"), "Not Available")
+        self.assertEqual(self.cache.get_domain("acme.com"), "Available at $9.98/yr")
+
+    def test_failures_are_never_cached(self):
+        for status in FAILURE_STATUSES + ("", None):
+            with self.subTest(status=status):
+                self.cache.set_bns("NJ", "Acme LLC", status)
+                self.cache.set_domain("acme.com", status)
+                self.assertIsNone(self.cache.get_bns("NJ", "Acme LLC"))
+                self.assertIsNone(self.cache.get_domain("acme.com"))
+
+    def test_md_answers_opt_out(self):
+        self.assertFalse(MDPortal.cache_results)
+        self.assertTrue(getattr(NJHttpPortal, 'cache_results', True))
@@ -0,0 +1,75 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_startup.py
+
+Description:
+Tests that runs without a browser don't load Selenium: importing the app and the HTTP
+portal and RDAP/WHOIS backends is checked in a fresh interpreter. Also checks that
+Selenium and requests errors are still classified without importing those packages.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+import requests
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from modules.retry_policy import FailureClass, classify_error
+
+ROOT = Path(__file__).resolve().parent.parent
+BROWSER_MODULES = ("selenium", "undetected_chromedriver", "selenium_stealth")
+
+
+def loaded_browser_modules(code: str):
+    # Run code in a fresh interpreter and return the browser modules it has loaded
+    script = f"import sys\n{code}\nprint(','.join(m for m in {BROWSER_MODULES!r} if m in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT)] + sys.path))
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return [name for name in output.strip().split(",") if name]
+
+
+class StartupTest(unittest.TestCase):
+    def test_app_import_does_not_load_selenium(self):
+        self.assertEqual(loaded_browser_modules("import app"), [])
+
+    def test_http_and_domain_backends_do_not_load_selenium(self):
+        code = """
+import app
+from modules.portal_factory import get_portal_class
+from modules.domain_backend_factory import get_domain_backend_class
+for state in ("NJ", "FL", "NC"):
+    assert "Http" in get_portal_class(state, backend="http").__name__
+get_domain_backend_class("rdap")
+get_domain_backend_class("whois")
+"""
+        self.assertEqual(loaded_browser_modules(code), [])
+
+    def test_browser_portal_still_loads_selenium(self):
+        code = "from modules.portal_factory import get_portal_class\nget_portal_class('NJ')"
+        self.assertIn("selenium", loaded_browser_modules(code))
+
+
+class ClassifyErrorTest(unittest.TestCase):
+    def test_classify_error_by_name(self):
+        for error, failure in [
+                (NoSuchElementException("gone"), FailureClass.LAYOUT),
+                (TimeoutException("slow"), FailureClass.TRANSIENT),
+                (WebDriverException("invalid session id"), FailureClass.DRIVER_DEAD),
+                (WebDriverException("net::ERR_CONNECTION_RESET"), FailureClass.TRANSIENT),
+                (requests.ConnectionError("refused"), FailureClass.TRANSIENT),
+                (KeyError("name"), FailureClass.LAYOUT),
+                (ValueError("other"), None)]:
+            with self.subTest(error=repr(error)):
+                self.assertIs(classify_error(error), failure)
+
+    def test_classify_http_status(self):
+        response = requests.Response()
+        response.status_code = 429
+        self.assertIs(classify_error(requests.HTTPError(response=response)), FailureClass.BLOCKED)
+        response.status_code = 502
+        self.assertIs(classify_error(requests.HTTPError(response=response)), FailureClass.TRANSIENT)
@@ -0,0 +1,61 @@
+# MIT License
+# Copyright (c) 2024 skysoulkeeper
+# See LICENSE file for more details.
+
+"""
+Module: tests/test_worker_pool.py
+
+Description:
+Tests of BrowserWorkerPool with fake workers, including workers that fail to start.
+"""
+
+import threading
+import time
+import unittest
+from modules.worker_pool import BrowserWorkerPool
+
+
+class FakeWorker:
+    def close(self):
+        pass
+
+
+def failing_factory(failures: int):
+    # Worker factory whose first calls fail, like a browser that can't be launched
+    calls = {"count": 0}
+    lock = threading.Lock()
+
+    def factory():
+        with lock:
+            calls["count"] += 1
+            failed = calls["count"] <= failures
+        if failed:
+            raise RuntimeError("Chrome failed to start")
+        return FakeWorker()
+    return factory
+
+
+def process(worker, company):
+    time.sleep(0.001)
+    return company.upper()
+
+
+class BrowserWorkerPoolTest(unittest.TestCase):
+    def test_all_companies_processed(self):
+        companies = [f"company {index}" for index in range(50)]
+        results = BrowserWorkerPool(failing_factory(0), 4).map(process, companies)
+        self.assertEqual(results, [company.upper() for company in companies])
+
+    def test_failed_worker_hands_back_its_companies(self):
+        # Two of the four threads can't start a worker; the other two process every company
+        companies = [f"company {index}" for index in range(50)]
+        results = BrowserWorkerPool(failing_factory(2), 4).map(process, companies)
+        self.assertEqual(results, [company.upper() for company in companies])
+
+    def test_no_worker_drops_companies_without_hanging(self):
+        companies = [f"company {index}" for index in range(20)]
+        recorded = []
+        pool = BrowserWorkerPool(failing_factory(100), 3)
+        pool.map(process, companies, on_result=lambda index, company, result: recorded.append((index, result)))
+        self.assertEqual(sorted(index for index, _ in recorded), list(range(20)))
+        self.assertTrue(all(result is None for _, result in recorded))
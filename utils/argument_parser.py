@@ -28,10 +28,10 @@ class ArgumentParser:
         self.parser.add_argument('--config', type=self._valid_path,
                                  default='configs/config.yml',
                                  help='Path to the configuration file')
-        # --input: Path to the input file with company data.
-        self.parser.add_argument('--input', type=self._valid_path,
-                                 default='data/input/company.txt',
-                                 help='Path to the input file with company data')
+        # --input: Path to the input file with company data, or '-' for stdin.
+        self.parser.add_argument('--input', type=self._valid_input,
+                                 help='Path to the input file with company data (txt, csv, jsonl, '
+                                      'optionally .gz), or - to read from stdin')
         # --report-format: The format for reports (csv, xml, json, xls).
         self.parser.add_argument('--report-format', type=str,
                                  choices=['csv', 'xml', 'json', 'xls'], default='xls',
@@ -63,6 +63,9 @@ class ArgumentParser:
         # --check-companies: Flag to enable company checking.
         self.parser.add_argument('--check-companies', action='store_true',
                                  help='Enable company checking')
+        # --resume: Flag to continue an interrupted run from its journal.
+        self.parser.add_argument('--resume', action='store_true',
+                                 help='Resume an interrupted run, skipping companies already in the journal')
         # --unit: Option to run unit tests. 'all' runs all tests.
         self.parser.add_argument('--unit', nargs='?', const='all', default=all,
                                  help='Run unit tests. Use --unit all to run all tests')
@@ -86,6 +89,13 @@ class ArgumentParser:
             raise argparse.ArgumentTypeError(f"The path {path_str} does not exist.")
         return path
 
+    @staticmethod
+    def _valid_input(path_str):
+        # Accepts '-' for standard input, otherwise the path must exist.
+        if path_str == '-':
+            return path_str
+        return ArgumentParser._valid_path(path_str)
+
     @staticmethod
     def _positive_int(value):
         # Validates if the provided value is a positive integer.